@@ -0,0 +1,268 @@
+"""
+Transmissões administrativas do Imperium™ Bot
+Envia avisos para toda a base em páginas, com workers concorrentes e progresso gravado no banco
+"""
+
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError
+
+from config.settings import BROADCAST_PAGE_SIZE, BROADCAST_WORKERS
+from database.models import db_manager
+from utils.logger import logger
+from utils.rate_limiter import BULK, REPORTS, send_lane, set_send_lane
+
+# Públicos disponíveis
+AUDIENCE_ALL = "all"
+AUDIENCE_AFFILIATES = "affiliates"
+
+AUDIENCE_NAMES = {AUDIENCE_ALL: "todos os usuários", AUDIENCE_AFFILIATES: "afiliados"}
+
+class BroadcastEngine:
+    """
+    Executa transmissões em segundo plano
+
+    Os destinatários são lidos por chave (user_id crescente) e distribuídos
+    a BROADCAST_WORKERS envios simultâneos na fila BULK do limitador, que
+    dita o ritmo real. Ao fim de cada página o cursor e os contadores são
+    gravados em broadcasts; depois de um reinício a transmissão continua do
+    último destinatário gravado. Quem bloqueou o bot é marcado em users e
+    fica fora das próximas transmissões.
+    """
+
+    def __init__(self, page_size: int = BROADCAST_PAGE_SIZE, workers: int = BROADCAST_WORKERS):
+        self.page_size = page_size
+        self.workers = max(1, workers)
+        self.bot: Optional[Bot] = None
+        self._tasks: Dict[int, asyncio.Task] = {}
+        self._progress: Dict[int, Dict] = {}
+
+    def setup(self, bot: Bot):
+        """
+        Informa o bot usado nas transmissões
+
+        Args:
+            bot: Bot do Telegram
+        """
+        self.bot = bot
+
+    def _spawn(self, broadcast: Dict):
+        """Inicia a tarefa de envio de uma transmissão"""
+        broadcast_id = broadcast['id']
+        self._progress[broadcast_id] = {
+            "id": broadcast_id,
+            "audience": broadcast['audience'],
+            "status": "running",
+            "sent": broadcast['sent'],
+            "failed": broadcast['failed'],
+            "blocked": broadcast['blocked'],
+            "last_user_id": broadcast['last_user_id'],
+            "started": time.monotonic(),
+            "processed_now": 0
+        }
+        task = asyncio.create_task(self._run(broadcast))
+        self._tasks[broadcast_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(broadcast_id, None))
+
+    async def start(self, audience: str, text: str, created_by: int) -> int:
+        """
+        Cria e inicia uma transmissão
+
+        Args:
+            audience: AUDIENCE_ALL ou AUDIENCE_AFFILIATES
+            text: Mensagem em HTML
+            created_by: Administrador que criou (recebe o resumo no fim)
+
+        Returns:
+            ID da transmissão (0 em caso de erro)
+        """
+        broadcast_id = await db_manager.create_broadcast(audience, text, created_by)
+        if not broadcast_id:
+            return 0
+        self._spawn({
+            "id": broadcast_id, "audience": audience, "text": text, "created_by": created_by,
+            "last_user_id": 0, "sent": 0, "failed": 0, "blocked": 0
+        })
+        logger.info(f"Transmissão {broadcast_id} iniciada para {AUDIENCE_NAMES.get(audience, audience)}")
+        return broadcast_id
+
+    async def resume(self) -> int:
+        """
+        Retoma as transmissões interrompidas por um reinício
+
+        Returns:
+            Quantidade de transmissões retomadas
+        """
+        broadcasts = await db_manager.get_broadcasts(status="running")
+        for broadcast in broadcasts:
+            if broadcast['id'] not in self._tasks:
+                self._spawn(broadcast)
+                logger.info(
+                    f"Transmissão {broadcast['id']} retomada após o usuário {broadcast['last_user_id']}"
+                )
+        return len(broadcasts)
+
+    def cancel(self, broadcast_id: int) -> bool:
+        """
+        Interrompe uma transmissão em andamento
+
+        Args:
+            broadcast_id: ID da transmissão
+
+        Returns:
+            True se a transmissão estava em andamento
+        """
+        progress = self._progress.get(broadcast_id)
+        if not progress or progress["status"] != "running":
+            return False
+        progress["status"] = "cancelled"
+        return True
+
+    def get_progress(self, broadcast_id: int) -> Optional[Dict]:
+        """
+        Progresso de uma transmissão desta execução do bot
+
+        Args:
+            broadcast_id: ID da transmissão
+
+        Returns:
+            Dict com status, contadores e vazão (mensagens/s) ou None
+        """
+        progress = self._progress.get(broadcast_id)
+        if not progress:
+            return None
+        elapsed = time.monotonic() - progress["started"]
+        result = {key: value for key, value in progress.items() if key != "started"}
+        result["elapsed"] = round(elapsed, 1)
+        result["throughput"] = round(progress["processed_now"] / elapsed, 1) if elapsed > 0 else 0.0
+        return result
+
+    async def _deliver(self, user_id: int, text: str) -> str:
+        """Envia a mensagem a um usuário; retorna 'sent', 'blocked' ou 'failed'"""
+        try:
+            await self.bot.send_message(chat_id=user_id, text=text, parse_mode="HTML")
+            return "sent"
+        except TelegramForbiddenError:
+            return "blocked"  # Bloqueou o bot ou apagou a conta
+        except TelegramBadRequest as e:
+            if "chat not found" in e.message.lower():
+                return "blocked"
+            logger.debug(f"Transmissão não entregue a {user_id}: {e.message}")
+            return "failed"
+        except Exception as e:
+            logger.debug(f"Transmissão não entregue a {user_id}: {e}")
+            return "failed"
+
+    async def _send_page(self, progress: Dict, page: List[int], text: str):
+        """
+        Envia uma página com workers concorrentes
+
+        Quem bloqueou o bot é marcado no banco mesmo se a página for interrompida.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        for index, user_id in enumerate(page):
+            queue.put_nowait((index, user_id))
+        done = [False] * len(page)
+        blocked: List[int] = []
+
+        async def worker():
+            set_send_lane(BULK)
+            while progress["status"] == "running":
+                try:
+                    index, user_id = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                outcome = await self._deliver(user_id, text)
+                progress[outcome] += 1
+                progress["processed_now"] += 1
+                if outcome == "blocked":
+                    blocked.append(user_id)
+                done[index] = True
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(self.workers, len(page)))]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+            # Avança o cursor até o último destinatário de um trecho contínuo já atendido
+            for index, finished in enumerate(done):
+                if not finished:
+                    break
+                progress["last_user_id"] = page[index]
+            await db_manager.mark_users_blocked(blocked)
+
+    async def _checkpoint(self, broadcast_id: int, progress: Dict, status: str = None):
+        """Grava cursor e contadores no banco"""
+        await db_manager.save_broadcast_progress(
+            broadcast_id, progress["last_user_id"], progress["sent"],
+            progress["failed"], progress["blocked"], status
+        )
+
+    async def _run(self, broadcast: Dict):
+        """Envia a transmissão página por página até o fim ou o cancelamento"""
+        broadcast_id = broadcast['id']
+        progress = self._progress[broadcast_id]
+        try:
+            while progress["status"] == "running":
+                page = await db_manager.get_broadcast_recipients(
+                    broadcast['audience'], progress["last_user_id"], self.page_size
+                )
+                if not page:
+                    progress["status"] = "done"
+                    break
+
+                await self._send_page(progress, page, broadcast['text'])
+                await self._checkpoint(broadcast_id, progress)
+
+                if len(page) < self.page_size and progress["last_user_id"] == page[-1]:
+                    progress["status"] = "done"
+
+            await self._checkpoint(broadcast_id, progress, progress["status"])
+            logger.info(
+                f"Transmissão {broadcast_id} {'concluída' if progress['status'] == 'done' else 'interrompida'}: "
+                f"{progress['sent']} enviadas, {progress['blocked']} bloqueados, {progress['failed']} falhas "
+                f"({self.get_progress(broadcast_id)['throughput']} mensagens/s)"
+            )
+            await self._notify_creator(broadcast, progress)
+        except asyncio.CancelledError:
+            # Desligamento do bot: grava o trecho já enviado e continua no próximo início
+            await self._checkpoint(broadcast_id, progress)
+            raise
+        except Exception as e:
+            logger.error(f"Erro na transmissão {broadcast_id}: {e}")
+            await self._checkpoint(broadcast_id, progress)
+
+    async def _notify_creator(self, broadcast: Dict, progress: Dict):
+        """Envia o resumo ao administrador que criou a transmissão"""
+        if not broadcast.get('created_by'):
+            return
+        status = "✅ concluída" if progress["status"] == "done" else "⛔ interrompida"
+        try:
+            with send_lane(REPORTS):
+                await self.bot.send_message(
+                    chat_id=broadcast['created_by'],
+                    text=(
+                        f"📢 <b>Transmissão #{broadcast['id']} {status}</b>\n\n"
+                        f"✅ Enviadas: <b>{progress['sent']}</b>\n"
+                        f"🚫 Bloquearam o bot: <b>{progress['blocked']}</b>\n"
+                        f"❌ Falhas: <b>{progress['failed']}</b>"
+                    ),
+                    parse_mode="HTML"
+                )
+        except Exception as e:
+            logger.error(f"Erro ao enviar resumo da transmissão {broadcast['id']}: {e}")
+
+    async def shutdown(self):
+        """Interrompe as transmissões em andamento gravando o progresso"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+# Instância global das transmissões
+broadcast_engine = BroadcastEngine()
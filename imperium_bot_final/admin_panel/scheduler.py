@@ -4,12 +4,22 @@ Agendador de tarefas automáticas para o Imperium™ Bot
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from datetime import datetime
 import asyncio
 
+from config.runtime_config import runtime_config
 from database.models import db_manager
+from database.backup import database_backups
+from payments.reconciliation import payment_reconciler
+from admin_panel.subscription_expiry import subscription_expiry
+from states.sweeper import state_sweeper
 from utils.logger import logger
-from config.settings import DAILY_REPORT_TIME, DATABASE_BACKUP_TIME
+from config.settings import (
+    DAILY_REPORT_TIME, DATABASE_BACKUP_TIME, STATS_RECONCILE_MINUTES, SUBSCRIPTION_CHECK_INTERVAL,
+    PAYMENT_RECONCILE_MINUTES, STATE_SWEEP_SECONDS,
+    AFFILIATE_BALANCE_VERIFY_HOURS, AFFILIATE_BALANCE_AUTO_REPAIR, SYSTEM_CONFIG_RELOAD_MINUTES
+)
 
 # Instância global do scheduler
 scheduler = AsyncIOScheduler()
@@ -23,15 +33,80 @@ async def daily_report():
     except Exception as e:
         logger.error(f"Erro ao enviar relatório diário: {e}")
 
+async def reconcile_statistics():
+    """Recalcula os contadores de estatísticas a partir do banco"""
+    try:
+        if await db_manager.reconcile_statistics():
+            logger.debug("Estatísticas reconciliadas")
+        
+        cache_stats = db_manager.get_cache_stats()
+        logger.debug(
+            "Cache de leituras: " + ", ".join(
+                f"{name} {stats['hits']} hits/{stats['misses']} misses/"
+                f"{stats['coalesced']} coalescidas ({stats['size']} entradas)"
+                for name, stats in cache_stats.items()
+            )
+        )
+    except Exception as e:
+        logger.error(f"Erro ao reconciliar estatísticas: {e}")
+
+async def reconcile_payments():
+    """Confere os pagamentos pendentes com o Mercado Pago"""
+    try:
+        await payment_reconciler.run()
+    except Exception as e:
+        logger.error(f"Erro na conferência de pagamentos: {e}")
+
+async def expire_subscriptions():
+    """Desativa assinaturas vencidas, envia lembretes e remove ex-assinantes do grupo VIP"""
+    try:
+        await subscription_expiry.run()
+    except Exception as e:
+        logger.error(f"Erro na varredura de assinaturas: {e}")
+
+async def sweep_states():
+    """Expira estados temporários e limpa dados de fluxos encerrados"""
+    try:
+        await state_sweeper.sweep()
+    except Exception as e:
+        logger.error(f"Erro na varredura de estados: {e}")
+
+async def verify_affiliate_balances():
+    """Confere os saldos materializados dos afiliados com o histórico"""
+    try:
+        drifts = await db_manager.verify_affiliate_balances(repair=AFFILIATE_BALANCE_AUTO_REPAIR)
+        if drifts is None:
+            return
+        if not drifts:
+            logger.debug("Saldos dos afiliados conferidos: sem divergências")
+            return
+        
+        details = "; ".join(
+            f"{drift['affiliate_id']}: saldo {drift['balance']:.2f}, "
+            f"esperado {drift['expected_commission'] - drift['expected_withdrawn']:.2f}"
+            for drift in drifts[:20]
+        )
+        action = "corrigidos" if AFFILIATE_BALANCE_AUTO_REPAIR else "não corrigidos"
+        logger.warning(f"{len(drifts)} saldo(s) de afiliado divergente(s), {action}: {details}")
+    except Exception as e:
+        logger.error(f"Erro na conferência dos saldos dos afiliados: {e}")
+
+async def reload_system_config():
+    """Relê system_config e avisa os assinantes das chaves alteradas"""
+    try:
+        await runtime_config.load()
+    except Exception as e:
+        logger.error(f"Erro ao recarregar configurações do sistema: {e}")
+
 async def database_backup():
     """Realiza backup do banco de dados"""
     try:
-        import shutil
-        from datetime import datetime
-        
-        backup_name = f"logs/backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
-        shutil.copy2("imperium_bot.db", backup_name)
-        logger.info(f"Backup realizado: {backup_name}")
+        result = await database_backups.run()
+        logger.info(
+            f"Backup realizado: {result['path']} "
+            f"({result['size'] / 1048576:.1f}MB -> {result['compressed_size'] / 1048576:.1f}MB, "
+            f"{result['duration']:.1f}s, {result['removed']} antigo(s) apagado(s))"
+        )
     except Exception as e:
         logger.error(f"Erro no backup: {e}")
 
@@ -57,6 +132,70 @@ def configure_jobs():
         replace_existing=True
     )
     
+    # Reconciliação dos contadores do painel
+    scheduler.add_job(
+        reconcile_statistics,
+        IntervalTrigger(minutes=STATS_RECONCILE_MINUTES),
+        id="reconcile_statistics",
+        replace_existing=True
+    )
+    
+    # Expiração dos estados temporários do FSM
+    scheduler.add_job(
+        sweep_states,
+        IntervalTrigger(seconds=STATE_SWEEP_SECONDS),
+        id="sweep_states",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True
+    )
+    
+    # Conferência dos pagamentos pendentes
+    scheduler.add_job(
+        reconcile_payments,
+        IntervalTrigger(minutes=PAYMENT_RECONCILE_MINUTES),
+        id="reconcile_payments",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True
+    )
+    
+    # Vencimento de assinaturas
+    scheduler.add_job(
+        expire_subscriptions,
+        IntervalTrigger(hours=SUBSCRIPTION_CHECK_INTERVAL),
+        id="expire_subscriptions",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+        # Primeira execução logo ao iniciar: reinícios não adiam a varredura
+        next_run_time=datetime.now(),
+        misfire_grace_time=None
+    )
+    
+    # Conferência dos saldos dos afiliados
+    scheduler.add_job(
+        verify_affiliate_balances,
+        IntervalTrigger(hours=AFFILIATE_BALANCE_VERIFY_HOURS),
+        id="verify_affiliate_balances",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+        # Primeira execução logo ao iniciar: reinícios não adiam a conferência
+        next_run_time=datetime.now(),
+        misfire_grace_time=None
+    )
+    
+    # Releitura das configurações editáveis
+    scheduler.add_job(
+        reload_system_config,
+        IntervalTrigger(minutes=SYSTEM_CONFIG_RELOAD_MINUTES),
+        id="reload_system_config",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True
+    )
+    
     logger.info("Tarefas agendadas configuradas")
 
 # Configurar jobs na inicialização
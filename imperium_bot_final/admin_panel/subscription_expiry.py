@@ -0,0 +1,213 @@
+"""
+Vencimento de assinaturas do Imperium™ Bot
+Desativa assinaturas vencidas em lotes, envia lembretes de renovação e remove ex-assinantes do grupo VIP
+"""
+
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError
+
+from config.runtime_config import runtime_config
+from config.settings import (
+    VIP_GROUP_ID, RENEWAL_REMINDER_MESSAGE, SUBSCRIPTION_EXPIRED_MESSAGE,
+    SUBSCRIPTION_REMINDER_DAYS, SUBSCRIPTION_EXPIRY_BATCH_SIZE, SUBSCRIPTION_EXPIRY_MAX_PER_RUN,
+    SUBSCRIPTION_ACTION_MAX_ATTEMPTS
+)
+from database.models import db_manager
+from keyboards.inline_keyboards import get_main_menu_keyboard
+from utils.helpers import format_date_br
+from utils.logger import logger
+from utils.rate_limiter import REPORTS, set_send_lane
+
+# Ações gravadas em subscription_actions
+REMINDER = "reminder"  # Lembrete de renovação
+EXPIRED = "expired"    # Aviso de vencimento + remoção do grupo VIP
+
+class SubscriptionExpiry:
+    """
+    Varredura periódica das assinaturas
+
+    A parte no banco (desativar e enfileirar) é feita em lotes curtos de
+    escrita; a parte no Telegram consome a fila subscription_actions na
+    fila REPORTS do limitador, que dita o ritmo e repete as chamadas em
+    flood control. Como a fila fica no banco, uma execução interrompida
+    continua de onde parou na próxima.
+    """
+
+    def __init__(self, batch_size: int = SUBSCRIPTION_EXPIRY_BATCH_SIZE,
+                 max_per_run: int = SUBSCRIPTION_EXPIRY_MAX_PER_RUN):
+        self.batch_size = batch_size
+        self.max_per_run = max_per_run
+        self.bot: Optional[Bot] = None
+        self._running = False
+        self.metrics = {
+            "runs": 0,
+            "expired": 0,
+            "reminders_queued": 0,
+            "reminders_sent": 0,
+            "removed": 0,
+            "failed": 0,
+            "last_run": None,
+            "last_duration": 0.0
+        }
+
+    def setup(self, bot: Bot):
+        """
+        Informa o bot usado para avisar e remover assinantes
+
+        Args:
+            bot: Bot do Telegram
+        """
+        self.bot = bot
+
+    def get_metrics(self) -> Dict:
+        """
+        Métricas acumuladas da varredura
+
+        Returns:
+            Dict com totais e a duração da última execução
+        """
+        return dict(self.metrics)
+
+    async def _send(self, user_id: int, text: str):
+        """Envia um aviso; usuários que bloquearam o bot são ignorados"""
+        try:
+            await self.bot.send_message(
+                chat_id=user_id,
+                text=text,
+                reply_markup=get_main_menu_keyboard(),
+                parse_mode="HTML"
+            )
+        except (TelegramForbiddenError, TelegramBadRequest) as e:
+            logger.debug(f"Aviso de assinatura não entregue a {user_id}: {e.message}")
+
+    async def _remove_from_group(self, user_id: int) -> bool:
+        """Remove o usuário do grupo VIP sem bani-lo (pode voltar ao renovar)"""
+        try:
+            await self.bot.ban_chat_member(chat_id=VIP_GROUP_ID, user_id=user_id)
+            await self.bot.unban_chat_member(chat_id=VIP_GROUP_ID, user_id=user_id, only_if_banned=True)
+            return True
+        except TelegramBadRequest as e:
+            # Usuário já saiu do grupo ou nunca entrou
+            logger.debug(f"Remoção de {user_id} do grupo VIP ignorada: {e.message}")
+            return False
+
+    async def _execute(self, action: Dict):
+        """
+        Executa uma ação da fila
+
+        Args:
+            action: Linha de subscription_actions com plano e vencimento
+        """
+        user_id = action['user_id']
+        support_contact = runtime_config.support_contact
+
+        if action['action'] == REMINDER:
+            end_date = action['end_date']
+            if isinstance(end_date, str):
+                end_date = datetime.fromisoformat(end_date)
+            await self._send(user_id, RENEWAL_REMINDER_MESSAGE.format(
+                plan_name=action['plan_name'],
+                end_date=format_date_br(end_date) if end_date else "-",
+                support_contact=support_contact
+            ))
+            self.metrics["reminders_sent"] += 1
+            return
+
+        # Pode ter renovado depois que a ação entrou na fila
+        if await db_manager.get_active_subscription(user_id):
+            return
+        await self._send(user_id, SUBSCRIPTION_EXPIRED_MESSAGE.format(support_contact=support_contact))
+        if VIP_GROUP_ID and await self._remove_from_group(user_id):
+            self.metrics["removed"] += 1
+
+    async def _deactivate(self) -> Dict[str, int]:
+        """Desativa as assinaturas vencidas e enfileira lembretes, em lotes"""
+        expired = reminders = 0
+        while expired < self.max_per_run:
+            count = await db_manager.expire_subscriptions(self.batch_size)
+            expired += count
+            if count < self.batch_size:
+                break
+        while reminders < self.max_per_run:
+            count = await db_manager.queue_renewal_reminders(SUBSCRIPTION_REMINDER_DAYS, self.batch_size)
+            reminders += count
+            if count < self.batch_size:
+                break
+        return {"expired": expired, "reminders_queued": reminders}
+
+    async def _drain(self) -> int:
+        """Consome a fila de ações; retorna quantas foram processadas"""
+        processed = 0
+        after_id = 0
+        while processed < self.max_per_run:
+            actions = await db_manager.get_subscription_actions(after_id, self.batch_size)
+            if not actions:
+                break
+            after_id = actions[-1]['id']
+
+            done: List[int] = []
+            failed: List[int] = []
+            try:
+                for action in actions:
+                    try:
+                        await self._execute(action)
+                        done.append(action['id'])
+                    except Exception as e:
+                        logger.error(f"Erro no aviso de assinatura {action['id']} ({action['action']}): {e}")
+                        failed.append(action['id'])
+            finally:
+                # Grava o progresso mesmo se a execução for cancelada no meio do lote
+                await db_manager.finish_subscription_actions(
+                    done, failed, SUBSCRIPTION_ACTION_MAX_ATTEMPTS
+                )
+            processed += len(done) + len(failed)
+            self.metrics["failed"] += len(failed)
+
+            if len(actions) < self.batch_size:
+                break
+        return processed
+
+    async def run(self) -> Dict:
+        """
+        Executa uma varredura completa
+
+        Returns:
+            Dict com os números desta execução
+        """
+        if self._running:
+            return {}
+        self._running = True
+        set_send_lane(REPORTS)  # Avisos automáticos cedem a vez às respostas interativas
+
+        started = time.monotonic()
+        run_stats = {"expired": 0, "reminders_queued": 0, "processed": 0}
+        try:
+            run_stats.update(await self._deactivate())
+            if self.bot:
+                run_stats["processed"] = await self._drain()
+        except Exception as e:
+            logger.error(f"Erro na varredura de assinaturas: {e}")
+        finally:
+            self._running = False
+
+        duration = time.monotonic() - started
+        self.metrics["runs"] += 1
+        self.metrics["expired"] += run_stats["expired"]
+        self.metrics["reminders_queued"] += run_stats["reminders_queued"]
+        self.metrics["last_run"] = datetime.now()
+        self.metrics["last_duration"] = round(duration, 3)
+
+        if any(run_stats.values()):
+            logger.info(
+                f"Varredura de assinaturas: {run_stats['expired']} vencidas, "
+                f"{run_stats['reminders_queued']} lembretes enfileirados, "
+                f"{run_stats['processed']} avisos processados ({duration:.1f}s)"
+            )
+        return run_stats
+
+# Instância global da varredura de assinaturas
+subscription_expiry = SubscriptionExpiry()
@@ -0,0 +1,83 @@
+"""
+Benchmark da renderização da imagem de pagamento Pix
+Compara o caminho antigo (PNG intermediário + RGB) com a composição direta da matriz
+
+Uso: python benchmarks/bench_qr_render.py [repetições]
+"""
+
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import qrcode
+from PIL import Image, ImageDraw
+
+from payments.qr_render import get_font, render_qr_with_info
+
+# Código Pix copia-e-cola com o tamanho típico devolvido pelo Mercado Pago
+PIX_CODE = (
+    "00020126580014br.gov.bcb.pix0136123e4567-e12b-12d1-a456-426655440000"
+    "52040000530398654057990.005802BR5913IMPERIUM BOT6009SAO PAULO"
+    "62250521mpqrinter1234567890126304ABCD"
+)
+
+def legacy_render(pix_data: str, amount: float, description: str) -> bytes:
+    """Caminho anterior: codifica o QR, decodifica, compõe em RGB e codifica de novo"""
+    qr = qrcode.QRCode(version=1, error_correction=qrcode.constants.ERROR_CORRECT_H,
+                       box_size=10, border=4)
+    qr.add_data(pix_data)
+    qr.make(fit=True)
+    qr_img = qr.make_image(fill_color="black", back_color="white").convert('RGB')
+    buffer = io.BytesIO()
+    qr_img.save(buffer, format='PNG', quality=95)
+
+    qr_image = Image.open(io.BytesIO(buffer.getvalue()))
+    qr_width, qr_height = qr_image.size
+    padding = 100
+    final_width = qr_width + (padding * 2)
+    final_height = qr_height + padding + 150
+    final_image = Image.new('RGB', (final_width, final_height), 'white')
+    final_image.paste(qr_image, (padding, padding))
+
+    draw = ImageDraw.Draw(final_image)
+    texts = (
+        (description, get_font(24), 'black', 20),
+        (f"R$ {amount:.2f}".replace(".", ","), get_font(18), 'green', 50),
+        ("Escaneie com seu app bancário", get_font(14), 'gray', final_height - 40),
+    )
+    for text, font, color, y in texts:
+        bbox = draw.textbbox((0, 0), text, font=font)
+        draw.text(((final_width - (bbox[2] - bbox[0])) // 2, y), text, fill=color, font=font)
+
+    buffer = io.BytesIO()
+    final_image.save(buffer, format='PNG', quality=95)
+    return buffer.getvalue()
+
+def measure(render, rounds: int) -> tuple:
+    """Retorna (ms de CPU por imagem, tamanho em bytes)"""
+    image = render(PIX_CODE, 79.90, "Imperium™ - Plano Mensal")
+    started = time.process_time()
+    for _ in range(rounds):
+        render(PIX_CODE, 79.90, "Imperium™ - Plano Mensal")
+    return (time.process_time() - started) * 1000 / rounds, len(image)
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    results = {
+        "antigo (RGB, PNG intermediário)": measure(legacy_render, rounds),
+        "atual (paleta 2 bits, direto)": measure(render_qr_with_info, rounds),
+    }
+
+    print(f"{'Caminho':<34}{'CPU (ms)':>12}{'tamanho (KB)':>15}")
+    for name, (cpu_ms, size) in results.items():
+        print(f"{name:<34}{cpu_ms:>12.2f}{size / 1024:>15.1f}")
+
+    (old_ms, old_size), (new_ms, new_size) = results.values()
+    print(f"\nCPU: {old_ms / new_ms:.1f}x mais rápido | bytes: {old_size / new_size:.1f}x menor")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Benchmark das consultas quentes do banco com e sem os índices das migrações
+Popula um banco temporário com 1M de assinaturas e mede cada consulta
+
+Uso: python benchmarks/bench_subscription_queries.py [total_assinaturas]
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.migrations import MIGRATIONS
+
+SCHEMA = [
+    """CREATE TABLE subscriptions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER, plan_name TEXT NOT NULL,
+        plan_price REAL NOT NULL, start_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+        end_date DATETIME NOT NULL, is_active INTEGER DEFAULT 1, payment_id TEXT)""",
+    """CREATE TABLE affiliate_sales (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, affiliate_id INTEGER, referred_user_id INTEGER,
+        subscription_id INTEGER, commission_amount REAL NOT NULL,
+        sale_date DATETIME DEFAULT CURRENT_TIMESTAMP, commission_paid INTEGER DEFAULT 0)""",
+    """CREATE TABLE withdrawal_requests (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER, amount REAL NOT NULL,
+        pix_key TEXT NOT NULL, pix_key_type TEXT NOT NULL, status TEXT DEFAULT 'pending',
+        request_date DATETIME DEFAULT CURRENT_TIMESTAMP, processed_date DATETIME,
+        processed_by INTEGER, rejection_reason TEXT)""",
+]
+
+QUERIES = {
+    "get_active_subscription": (
+        """SELECT * FROM subscriptions
+           WHERE user_id = ? AND is_active = 1 AND end_date > CURRENT_TIMESTAMP
+           ORDER BY end_date DESC LIMIT 1""",
+        "user"
+    ),
+    "get_affiliate_balance (vendas)": (
+        """SELECT COALESCE(SUM(commission_amount), 0) FROM affiliate_sales
+           WHERE affiliate_id = ?""",
+        "user"
+    ),
+    "get_affiliate_balance (saques)": (
+        """SELECT COALESCE(SUM(amount), 0) FROM withdrawal_requests
+           WHERE user_id = ? AND status = 'approved'""",
+        "user"
+    ),
+    "get_pending_withdrawals": (
+        """SELECT * FROM withdrawal_requests
+           WHERE status = 'pending' ORDER BY request_date ASC""",
+        None
+    ),
+}
+
+def populate(db: sqlite3.Connection, total_subscriptions: int, total_users: int):
+    """Insere dados sintéticos proporcionais ao volume de assinaturas"""
+    rng = random.Random(42)
+    now = datetime.now()
+
+    def subscriptions():
+        for _ in range(total_subscriptions):
+            start = now - timedelta(days=rng.randint(0, 720))
+            end = start + timedelta(days=rng.choice((30, 90, 180, 365)))
+            yield (rng.randint(1, total_users), "MENSAL", 79.90, start, end,
+                   1 if end > now else rng.randint(0, 1))
+
+    db.executemany(
+        """INSERT INTO subscriptions (user_id, plan_name, plan_price, start_date, end_date, is_active)
+           VALUES (?, ?, ?, ?, ?, ?)""", subscriptions()
+    )
+    db.executemany(
+        """INSERT INTO affiliate_sales (affiliate_id, referred_user_id, subscription_id, commission_amount)
+           VALUES (?, ?, ?, ?)""",
+        ((rng.randint(1, total_users // 10), rng.randint(1, total_users), i, 15.98)
+         for i in range(total_subscriptions // 5))
+    )
+    db.executemany(
+        """INSERT INTO withdrawal_requests (user_id, amount, pix_key, pix_key_type, status, request_date)
+           VALUES (?, ?, ?, ?, ?, ?)""",
+        ((rng.randint(1, total_users // 10), 50.0, "chave", "email",
+          # Fila de pendentes pequena, como em produção (~1%)
+          "pending" if rng.random() < 0.01 else rng.choice(("approved", "rejected")),
+          now - timedelta(minutes=rng.randint(0, 500000)))
+         for _ in range(total_subscriptions // 20))
+    )
+    db.commit()
+
+def measure(db: sqlite3.Connection, total_users: int, rounds: int) -> dict:
+    """Executa cada consulta várias vezes e retorna o tempo médio em ms"""
+    rng = random.Random(7)
+    results = {}
+
+    for name, (sql, param) in QUERIES.items():
+        # Consultas que varrem a tabela rodam menos vezes
+        iterations = rounds if param else max(3, rounds // 20)
+        started = time.perf_counter()
+        for _ in range(iterations):
+            args = (rng.randint(1, total_users // 10),) if param else ()
+            db.execute(sql, args).fetchall()
+        results[name] = (time.perf_counter() - started) * 1000 / iterations
+
+    return results
+
+def main():
+    total_subscriptions = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    total_users = max(100, total_subscriptions // 10)
+    rounds = 200
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = sqlite3.connect(os.path.join(tmp, "bench.db"))
+        db.execute("PRAGMA journal_mode = WAL")
+        for statement in SCHEMA:
+            db.execute(statement)
+
+        print(f"Populando {total_subscriptions:,} assinaturas...")
+        populate(db, total_subscriptions, total_users)
+
+        before = measure(db, total_users, rounds)
+
+        for _version, _description, statements in MIGRATIONS:
+            for statement in statements:
+                try:
+                    db.execute(statement)
+                except sqlite3.OperationalError:
+                    pass  # Migrações que tocam tabelas fora deste benchmark
+        db.execute("ANALYZE")
+        db.commit()
+
+        after = measure(db, total_users, rounds)
+        db.close()
+
+    print(f"\n{'Consulta':<34}{'sem índice (ms)':>18}{'com índice (ms)':>18}{'ganho':>10}")
+    for name in QUERIES:
+        speedup = before[name] / after[name] if after[name] else float("inf")
+        print(f"{name:<34}{before[name]:>18.3f}{after[name]:>18.3f}{speedup:>9.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Micro-benchmark do caminho de boas-vindas (/start, /menu e back_to_main)
+Compara a montagem a cada envio com os templates compilados e teclados pré-montados
+
+Uso: python benchmarks/bench_welcome_path.py [repetições]
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiogram.types import InlineKeyboardButton, User
+from aiogram.utils.keyboard import InlineKeyboardBuilder
+
+from config.settings import EMOJIS, VIP_GROUP_LINK, WELCOME_MESSAGE
+from keyboards.inline_keyboards import get_admin_main_menu_keyboard, rebuild_static_keyboards
+from utils.helpers import format_date_br, get_greeting, get_user_display_name
+from utils.templates import render_welcome_message
+
+USER = User(id=123456789, is_bot=False, first_name="Maria", last_name="Silva", username="maria")
+SUBSCRIPTION = {
+    "plan_name": "TRIMESTRAL",
+    "end_date": (datetime.now() + timedelta(days=60)).isoformat(),
+}
+
+def legacy_welcome(user, subscription):
+    """Caminho anterior: format do WELCOME_MESSAGE e teclado montado a cada chamada"""
+    base_message = f"{get_greeting()}!\n\n{WELCOME_MESSAGE.format(name=get_user_display_name(user.__dict__))}"
+    if subscription:
+        end_date = datetime.fromisoformat(subscription['end_date'])
+        base_message += f"""
+
+✅ <b>SUA ASSINATURA ESTÁ ATIVA!</b>
+💎 Plano: {subscription['plan_name']}
+📅 Válida até: {format_date_br(end_date)}
+
+🤖 <b>Acesso liberado ao grupo VIP:</b>
+{VIP_GROUP_LINK}
+"""
+
+    builder = InlineKeyboardBuilder()
+    builder.row(InlineKeyboardButton(text=f"{EMOJIS['cart']} QUERO ADQUIRIR O IMPERIUM™",
+                                     callback_data="buy_plans"))
+    builder.row(InlineKeyboardButton(text=f"{EMOJIS['users']} SISTEMA DE AFILIADOS",
+                                     callback_data="affiliate_menu"))
+    builder.row(InlineKeyboardButton(text=f"{EMOJIS['gear']} PAINEL ADMINISTRATIVO",
+                                     callback_data="admin_menu"))
+    builder.row(
+        InlineKeyboardButton(text=f"{EMOJIS['info']} SUPORTE", url="https://t.me/seu_suporte"),
+        InlineKeyboardButton(text=f"{EMOJIS['rocket']} CANAL", url="https://t.me/seu_canal"),
+    )
+    return base_message, builder.as_markup()
+
+def cached_welcome(user, subscription):
+    """Caminho atual: template compilado e teclado pré-montado"""
+    return render_welcome_message(user, subscription), get_admin_main_menu_keyboard()
+
+def measure(path, rounds: int) -> float:
+    """Retorna o tempo médio por chamada em microssegundos"""
+    started = time.perf_counter()
+    for index in range(rounds):
+        path(USER, SUBSCRIPTION if index % 2 else None)
+    return (time.perf_counter() - started) * 1_000_000 / rounds
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    rebuild_static_keyboards()
+
+    # Os dois caminhos precisam produzir exatamente a mesma mensagem e o mesmo teclado
+    for subscription in (None, SUBSCRIPTION):
+        assert legacy_welcome(USER, subscription) == cached_welcome(USER, subscription)
+
+    legacy = measure(legacy_welcome, rounds)
+    cached = measure(cached_welcome, rounds)
+
+    print(f"{'Caminho':<36}{'µs por envio':>14}")
+    print(f"{'antigo (format + builder)':<36}{legacy:>14.1f}")
+    print(f"{'atual (template + teclado pronto)':<36}{cached:>14.1f}")
+    print(f"\nGanho: {legacy / cached:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Configurações do sistema editáveis em tempo de execução para o Imperium™ Bot
+Carrega a tabela system_config em memória e avisa quem depende de um valor quando ele muda
+"""
+
+import inspect
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from config.settings import COMMISSION_RATE, MIN_WITHDRAWAL_AMOUNT, VIP_GROUP_LINK, SUPPORT_CONTACT
+from database.models import db_manager
+from utils.logger import logger
+
+# chave -> (conversão do texto gravado, valor padrão de config/settings.py)
+CONFIG_SCHEMA: Dict[str, Tuple[Callable[[str], Any], Any]] = {
+    "commission_rate": (float, COMMISSION_RATE),
+    "min_withdrawal": (float, MIN_WITHDRAWAL_AMOUNT),
+    "payment_expiration_hours": (int, 24),
+    "vip_group_link": (str, VIP_GROUP_LINK),
+    "support_contact": (str, SUPPORT_CONTACT),
+}
+
+# Recebe {chave: novo valor} apenas com as chaves que mudaram
+ConfigListener = Callable[[Dict[str, Any]], Union[None, Awaitable[None]]]
+
+class ConfigService:
+    """
+    Cópia em memória da tabela system_config
+
+    Leituras não fazem I/O. Alterações feitas pelo bot passam por set(),
+    que grava na tabela e só então publica; alterações feitas direto na
+    tabela são captadas pelo load() periódico do agendador
+    (SYSTEM_CONFIG_RELOAD_MINUTES). Em ambos os casos os assinantes são
+    chamados apenas quando algum valor realmente muda.
+    """
+
+    def __init__(self):
+        self._values: Dict[str, Any] = {key: default for key, (_, default) in CONFIG_SCHEMA.items()}
+        self._listeners: List[Tuple[ConfigListener, Optional[frozenset]]] = []
+        self.loaded = False
+
+    def _parse(self, key: str, raw: str) -> Any:
+        """Converte o texto gravado no tipo da chave (chaves desconhecidas ficam como texto)"""
+        parser, default = CONFIG_SCHEMA.get(key, (str, None))
+        try:
+            return parser(raw)
+        except (TypeError, ValueError):
+            logger.warning(f"Valor inválido para {key} em system_config: {raw!r}; usando {default!r}")
+            return default
+
+    def subscribe(self, listener: ConfigListener, keys: Iterable[str] = None):
+        """
+        Registra uma função chamada quando configurações mudam
+
+        Args:
+            listener: Função (síncrona ou assíncrona) que recebe as alterações
+            keys: Chaves de interesse (None = todas)
+        """
+        self._listeners.append((listener, frozenset(keys) if keys is not None else None))
+
+    async def _notify(self, changes: Dict[str, Any]):
+        """Chama os assinantes interessados em alguma das chaves alteradas"""
+        for listener, keys in self._listeners:
+            relevant = changes if keys is None else {
+                key: value for key, value in changes.items() if key in keys
+            }
+            if not relevant:
+                continue
+            try:
+                result = listener(relevant)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Erro ao aplicar alteração de configuração ({', '.join(relevant)}): {e}")
+
+    async def load(self) -> Dict[str, Any]:
+        """
+        Lê a tabela inteira e substitui os valores em memória
+
+        Pode ser chamado de novo para captar alterações feitas fora do bot.
+
+        Returns:
+            Dict com as chaves que mudaram
+        """
+        rows = await db_manager.get_all_system_config()
+        if rows is None:
+            return {}
+
+        changes = {}
+        for key, raw in rows.items():
+            value = self._parse(key, raw)
+            if self._values.get(key) != value:
+                changes[key] = value
+            self._values[key] = value
+
+        if self.loaded and changes:
+            logger.info(f"Configurações recarregadas: {', '.join(changes)}")
+            await self._notify(changes)
+        self.loaded = True
+        return changes
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Retorna o valor atual de uma configuração (sem acessar o banco)
+
+        Args:
+            key: Chave da configuração
+            default: Valor se a chave não existir
+
+        Returns:
+            Valor já convertido para o tipo da chave
+        """
+        return self._values.get(key, default)
+
+    async def set(self, key: str, value: Any) -> bool:
+        """
+        Altera uma configuração gravando na tabela e avisando os assinantes
+
+        Args:
+            key: Chave da configuração
+            value: Novo valor
+
+        Returns:
+            True se gravou (inclusive quando o valor não mudou)
+
+        Raises:
+            ValueError: se o valor não puder ser convertido para o tipo da chave
+        """
+        parser, _ = CONFIG_SCHEMA.get(key, (str, None))
+        value = parser(value)  # ValueError para valores inválidos
+        if self._values.get(key) == value:
+            return True
+
+        if not await db_manager.set_system_config(key, str(value)):
+            return False
+
+        self._values[key] = value
+        logger.info(f"Configuração alterada: {key} = {value}")
+        await self._notify({key: value})
+        return True
+
+    @property
+    def commission_rate(self) -> float:
+        return self._values["commission_rate"]
+
+    @property
+    def min_withdrawal(self) -> float:
+        return self._values["min_withdrawal"]
+
+    @property
+    def payment_expiration_hours(self) -> int:
+        return self._values["payment_expiration_hours"]
+
+    @property
+    def vip_group_link(self) -> str:
+        return self._values["vip_group_link"]
+
+    @property
+    def support_contact(self) -> str:
+        return self._values["support_contact"]
+
+# Instância global das configurações do sistema
+runtime_config = ConfigService()
@@ -17,6 +17,36 @@ TOPICO_GERAL_AVISOS = os.getenv("TOPICO_GERAL_AVISOS")
 # ===== CONFIGURAÇÕES DO MERCADO PAGO =====
 MP_PUBLIC_KEY = os.getenv("MP_PUBLIC_KEY")
 MP_ACCESS_TOKEN = os.getenv("MP_ACCESS_TOKEN")
+MP_API_BASE_URL = os.getenv("MP_API_BASE_URL", "https://api.mercadopago.com")  # Aponte para o servidor local de testes se necessário
+MP_HTTP_TIMEOUT = 15  # Tempo máximo (s) de cada requisição à API
+MP_CONNECT_TIMEOUT = 5  # Tempo máximo (s) para abrir a conexão
+MP_MAX_CONNECTIONS = 20  # Conexões keep-alive simultâneas com a API
+MP_KEEPALIVE_TIMEOUT = 30  # Segundos que uma conexão ociosa fica aberta para reuso
+MP_MAX_RETRIES = 3  # Novas tentativas em falhas de rede, 429 e 5xx
+MP_RETRY_BASE_DELAY = 0.5  # Base (s) do backoff exponencial com jitter
+MP_RETRY_MAX_DELAY = 5.0  # Teto (s) de espera entre tentativas
+MP_STATUS_CACHE_TTL = 5  # Segundos que o status de um pagamento é reaproveitado entre verificações
+
+# ===== WEBHOOK DO MERCADO PAGO =====
+MP_NOTIFICATION_URL = os.getenv("MP_NOTIFICATION_URL")  # URL pública que o Mercado Pago chama (ex: https://seu.dominio/webhooks/mercadopago)
+MP_WEBHOOK_SECRET = os.getenv("MP_WEBHOOK_SECRET")  # Assinatura secreta do painel de webhooks do Mercado Pago
+MP_WEBHOOK_PATH = "/webhooks/mercadopago"  # Rota local do receptor
+MP_WEBHOOK_TOLERANCE = 300  # Idade máxima (s) aceita para o carimbo de tempo da assinatura
+MP_WEBHOOK_DEDUP_TTL = 600  # Segundos que um pagamento já tratado é ignorado em novas notificações
+
+# ===== SERVIDOR HTTP INTERNO =====
+WEB_SERVER_HOST = os.getenv("WEB_SERVER_HOST", "0.0.0.0")
+WEB_SERVER_PORT = int(os.getenv("WEB_SERVER_PORT", "8080"))
+
+# ===== MODO DE EXECUÇÃO DO BOT =====
+BOT_RUN_MODE = os.getenv("BOT_RUN_MODE", "polling").lower()  # "polling" ou "webhook"
+WEBHOOK_BASE_URL = os.getenv("WEBHOOK_BASE_URL")  # URL pública do proxy reverso (ex: https://seu.dominio)
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET")  # Enviado pelo Telegram no cabeçalho X-Telegram-Bot-Api-Secret-Token
+WEBHOOK_PATH = "/webhooks/telegram"  # Rota local que recebe as atualizações
+WEBHOOK_MAX_CONCURRENCY = int(os.getenv("WEBHOOK_MAX_CONCURRENCY", "50"))  # Atualizações processadas ao mesmo tempo
+WEBHOOK_MAX_PENDING = 1000  # Acima disso o Telegram recebe 503 e reenvia depois
+WEBHOOK_MAX_CONNECTIONS = 40  # Conexões simultâneas que o Telegram abre (1 a 100)
+WEBHOOK_DRAIN_TIMEOUT = 20  # Segundos para concluir as atualizações em andamento ao desligar
 
 # ===== IDS DOS ADMINISTRADORES =====
 # Adicione aqui os IDs dos usuários que terão acesso ao painel administrativo
@@ -65,6 +95,7 @@ MIN_WITHDRAWAL_AMOUNT = 50.00  # Valor mínimo para saque R$ 50,00
 VIP_GROUP_LINK = "https://t.me/seu_grupo_vip"  # Link do grupo VIP
 SUPPORT_CONTACT = "@seu_suporte"  # Contato de suporte
 CHANNEL_LINK = "https://t.me/seu_canal"  # Link do canal principal
+VIP_GROUP_ID = int(os.getenv("VIP_GROUP_ID", "0"))  # Chat do grupo VIP (0 = não remove assinantes vencidos)
 
 # ===== MENSAGENS PADRÃO =====
 WELCOME_MESSAGE = """
@@ -179,7 +210,7 @@ PAYMENT_INSTRUCTIONS = """
    • Confirme o pagamento
 
 ⏰ <b>Importante:</b>
-• Pagamento expira em 24 horas
+• Pagamento expira em {expiration_hours} horas
 • Após pagar, clique em "✅ VERIFICAR PAGAMENTO"
 • Acesso liberado automaticamente
 • Em caso de dúvidas: {support_contact}
@@ -253,14 +284,107 @@ PAYMENT_EXPIRED_MESSAGE = """
 🆘 <b>Precisa de ajuda?</b> Contate: {support_contact}
 """
 
+RENEWAL_REMINDER_MESSAGE = """
+⏰ <b>SUA ASSINATURA ESTÁ ACABANDO</b>
+
+💎 Plano: {plan_name}
+📅 Válida até: {end_date}
+
+🔄 Renove agora para não perder o acesso ao grupo VIP.
+Clique em "🛒 QUERO ADQUIRIR O IMPERIUM™" e escolha seu plano.
+
+🆘 <b>Dúvidas?</b> Contate: {support_contact}
+"""
+
+SUBSCRIPTION_EXPIRED_MESSAGE = """
+⌛ <b>SUA ASSINATURA VENCEU</b>
+
+❌ O acesso ao grupo VIP foi encerrado.
+
+🔄 <b>Para voltar:</b>
+• Clique em "🛒 QUERO ADQUIRIR O IMPERIUM™"
+• Escolha seu plano e pague o Pix
+• O acesso é liberado na hora
+
+🆘 <b>Precisa de ajuda?</b> Contate: {support_contact}
+"""
+
+# ===== RENDERIZAÇÃO DE QR CODE =====
+QR_RENDER_EXECUTOR = os.getenv("QR_RENDER_EXECUTOR", "thread")  # "thread" ou "process" (usa todos os núcleos)
+QR_RENDER_WORKERS = 0  # Workers do pool (0 = número de CPUs)
+QR_RENDER_MAX_PENDING = 32  # Renderizações simultâneas no pool; as demais aguardam vaga
+QR_RENDER_QUEUE_TIMEOUT = 10  # Segundos aguardando vaga antes de enviar só o código Pix
+QR_TEMPLATE_CACHE_SIZE = 64  # Títulos e valores de cartão pré-renderizados mantidos por processo
+
 # ===== CONFIGURAÇÕES DE LOGS =====
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 LOG_FILE = "logs/imperium_bot.log"
+LOG_JSON_FILE = os.getenv("LOG_JSON_FILE")  # Saída estruturada opcional (ex: logs/imperium_bot.jsonl)
+LOG_BATCH_SIZE = 256  # Registros gravados por flush na thread de logs
+LOG_SAMPLE_RATES = {"DEBUG": 1.0, "INFO": 1.0}  # Fração mantida de eventos de alto volume (1.0 = todos)
+TELEGRAM_LOG_MAX_QUEUE = 500  # Registros aguardando envio ao canal (excedentes de menor nível são descartados)
+TELEGRAM_LOG_BATCH_DELAY = 2.0  # Segundos de espera para juntar registros em uma mensagem
+TELEGRAM_LOG_MIN_INTERVAL = 3.0  # Intervalo mínimo (s) entre mensagens no canal de logs
+TELEGRAM_LOG_MESSAGE_LIMIT = 4096  # Limite de caracteres de uma mensagem do Telegram
+
+# ===== LIMITE DE CHAMADAS AO TELEGRAM =====
+TELEGRAM_GLOBAL_RATE = 28  # Chamadas por segundo do bot (o Telegram limita em ~30)
+TELEGRAM_GLOBAL_BURST = 30  # Rajada máxima acima do ritmo global
+TELEGRAM_CHAT_RATE = 1.0  # Mensagens por segundo em uma conversa privada
+TELEGRAM_CHAT_BURST = 3  # Rajada máxima em uma conversa privada
+TELEGRAM_GROUP_RATE = 20 / 60  # Mensagens por segundo em grupos e canais (20 por minuto)
+TELEGRAM_GROUP_BURST = 3  # Rajada máxima em grupos e canais
+TELEGRAM_MAX_RETRIES = 3  # Novas tentativas automáticas após retry_after
+TELEGRAM_MAX_CHAT_BUCKETS = 50000  # Conversas acompanhadas antes de descartar as inativas
 
 # ===== CONFIGURAÇÕES DE AGENDAMENTO =====
 DAILY_REPORT_TIME = "09:00"  # Horário do relatório diário
 SUBSCRIPTION_CHECK_INTERVAL = 6  # Verificação de assinaturas a cada 6 horas
 DATABASE_BACKUP_TIME = "03:00"  # Backup do banco às 3h da manhã
+STATS_RECONCILE_MINUTES = 15  # Recontagem dos contadores do painel a cada 15 minutos
+STATE_SWEEP_SECONDS = 60  # Expiração de estados temporários verificada a cada minuto
+PAYMENT_RECONCILE_MINUTES = 5  # Conferência dos pagamentos pendentes a cada 5 minutos
+PAYMENT_RECONCILE_MIN_AGE = 120  # Segundos antes de um pagamento novo entrar na conferência
+PAYMENT_RECONCILE_PAGE_SIZE = 200  # Pagamentos por página da varredura
+PAYMENT_RECONCILE_CONCURRENCY = 8  # Consultas simultâneas ao Mercado Pago
+PAYMENT_RECONCILE_MAX_PER_RUN = 5000  # Limite de pagamentos conferidos por execução
+AFFILIATE_BALANCE_VERIFY_HOURS = 6  # Conferência dos saldos materializados dos afiliados
+AFFILIATE_BALANCE_AUTO_REPAIR = False  # Corrigir automaticamente divergências encontradas
+SYSTEM_CONFIG_RELOAD_MINUTES = 5  # Releitura de system_config (alterações feitas direto na tabela)
+SUBSCRIPTION_REMINDER_DAYS = 3  # Dias de antecedência do lembrete de renovação
+SUBSCRIPTION_EXPIRY_BATCH_SIZE = 500  # Assinaturas desativadas/avisos enviados por lote
+SUBSCRIPTION_EXPIRY_MAX_PER_RUN = 100000  # Limite de assinaturas tratadas por execução
+SUBSCRIPTION_ACTION_MAX_ATTEMPTS = 5  # Tentativas de um aviso antes de descartá-lo
+
+# ===== TRANSMISSÕES ADMINISTRATIVAS =====
+BROADCAST_PAGE_SIZE = 500  # Destinatários lidos por página (o progresso é gravado a cada página)
+BROADCAST_WORKERS = 32  # Envios simultâneos (o ritmo real vem do limitador do Telegram)
+BROADCAST_MAX_LENGTH = 4096  # Limite de caracteres de uma mensagem do Telegram
+
+# ===== CONFIGURAÇÕES DO BANCO DE DADOS =====
+DB_READER_CONNECTIONS = 4  # Conexões de leitura mantidas abertas no pool
+DB_BUSY_TIMEOUT = 5.0  # Segundos de espera quando o banco está bloqueado
+DB_STATEMENT_CACHE_SIZE = 256  # Statements preparados reaproveitados por conexão
+DB_SYNCHRONOUS = "NORMAL"  # Seguro com WAL e bem mais rápido que FULL
+DB_CACHE_SIZE_KB = 20000  # Cache de páginas por conexão (~20MB)
+DB_MMAP_SIZE = 256 * 1024 * 1024  # Leitura via mmap de até 256MB do arquivo
+USER_CACHE_TTL = 60  # Segundos que usuário e assinatura ativa ficam em cache (invalidados nas escritas)
+USER_CACHE_SIZE = 50000  # Usuários mantidos em cache (os menos usados saem primeiro)
+
+# ===== BACKUP DO BANCO DE DADOS =====
+BACKUP_DIR = os.getenv("BACKUP_DIR", "backups")  # Pasta dos backups compactados
+BACKUP_PAGES_PER_STEP = 256  # Páginas copiadas por etapa da API de backup do SQLite
+BACKUP_STEP_SLEEP = 0.005  # Pausa entre etapas (s) para espalhar a leitura do disco
+BACKUP_COMPRESS_LEVEL = 6  # Nível do gzip (1 = mais rápido, 9 = menor)
+BACKUP_RETENTION = 14  # Backups mantidos (os mais antigos são apagados)
+
+# ===== ARMAZENAMENTO DOS ESTADOS (FSM) =====
+FSM_STORAGE = os.getenv("FSM_STORAGE", "sqlite").lower()  # "sqlite", "redis" ou "memory"
+FSM_REDIS_URL = os.getenv("FSM_REDIS_URL") or "redis://localhost:6379/0"  # Usado quando FSM_STORAGE=redis
+FSM_FLUSH_INTERVAL = 0.5  # Segundos entre gravações em lote dos estados no SQLite
+FSM_FLUSH_MAX_PENDING = 200  # Grava antes do intervalo se houver tantas chaves alteradas
+FSM_PURGE_INTERVAL = 600  # Segundos entre remoções de estados expirados no SQLite
+FSM_CLEANUP_GRACE = 300  # Segundos que os dados ficam disponíveis após um estado de CLEANUP_STATES
 
 # ===== MENSAGENS DE ERRO =====
 ERROR_MESSAGES = {
@@ -289,6 +413,13 @@ def validate_config():
         if not var_value or var_value.startswith("SEU_"):
             missing_vars.append(var_name)
     
+    if BOT_RUN_MODE == "webhook":
+        for var_name, var_value in [("WEBHOOK_BASE_URL", WEBHOOK_BASE_URL), ("WEBHOOK_SECRET", WEBHOOK_SECRET)]:
+            if not var_value:
+                missing_vars.append(var_name)
+    elif BOT_RUN_MODE != "polling":
+        raise ValueError(f"BOT_RUN_MODE inválido: {BOT_RUN_MODE} (use 'polling' ou 'webhook')")
+    
     if missing_vars:
         raise ValueError(f"Variáveis de ambiente obrigatórias não configuradas: {', '.join(missing_vars)}")
     
@@ -0,0 +1,86 @@
+"""
+Livro-razão de comissões e saques dos afiliados do Imperium™ Bot
+Cada movimentação gera um lançamento e atualiza o saldo materializado na mesma transação
+"""
+
+from typing import Optional
+
+# Tipos de lançamento (o sinal do valor indica o efeito no saldo)
+COMMISSION = "commission"                        # + comissão de venda
+WITHDRAWAL = "withdrawal"                        # - saque aprovado
+WITHDRAWAL_REVERSAL = "withdrawal_reversal"      # + saque aprovado que deixou de ser aprovado
+COMMISSION_ADJUSTMENT = "commission_adjustment"  # ± correção apontada pela verificação
+WITHDRAWAL_ADJUSTMENT = "withdrawal_adjustment"  # ± correção apontada pela verificação
+
+COMMISSION_ENTRIES = (COMMISSION, COMMISSION_ADJUSTMENT)
+
+# Diferença tolerada entre saldo materializado e histórico (arredondamento de REAL)
+DRIFT_TOLERANCE = 0.005
+
+# Recalcula os totais a partir das tabelas de origem e lista os afiliados divergentes
+BALANCE_DRIFT_QUERY = """
+    WITH raw AS (
+        SELECT affiliate_id,
+               SUM(commission) AS total_commission,
+               SUM(withdrawn) AS total_withdrawn
+        FROM (
+            SELECT affiliate_id, commission_amount AS commission, 0 AS withdrawn
+            FROM affiliate_sales
+            UNION ALL
+            SELECT user_id, 0, amount
+            FROM withdrawal_requests WHERE status = 'approved'
+        )
+        GROUP BY affiliate_id
+    ),
+    compared AS (
+        SELECT raw.affiliate_id,
+               raw.total_commission AS expected_commission,
+               raw.total_withdrawn AS expected_withdrawn,
+               COALESCE(b.total_commission, 0) AS total_commission,
+               COALESCE(b.total_withdrawn, 0) AS total_withdrawn,
+               COALESCE(b.balance, 0) AS balance
+        FROM raw LEFT JOIN affiliate_balances b ON b.affiliate_id = raw.affiliate_id
+        UNION ALL
+        SELECT b.affiliate_id, 0, 0, b.total_commission, b.total_withdrawn, b.balance
+        FROM affiliate_balances b
+        WHERE NOT EXISTS (SELECT 1 FROM raw WHERE raw.affiliate_id = b.affiliate_id)
+    )
+    SELECT * FROM compared
+    WHERE ABS(expected_commission - total_commission) > :tolerance
+       OR ABS(expected_withdrawn - total_withdrawn) > :tolerance
+       OR ABS(total_commission - total_withdrawn - balance) > :tolerance
+    ORDER BY affiliate_id
+"""
+
+async def post_entry(db, affiliate_id: int, entry_type: str, amount: float,
+                     reference_id: Optional[int] = None):
+    """
+    Insere um lançamento e aplica o valor ao saldo do afiliado
+
+    Deve ser chamada dentro da transação de escrita que fez a movimentação,
+    para que o saldo nunca fique diferente do histórico.
+
+    Args:
+        db: Conexão aiosqlite de escrita
+        affiliate_id: ID do afiliado
+        entry_type: Tipo do lançamento (constantes deste módulo)
+        amount: Valor com sinal (positivo aumenta o saldo)
+        reference_id: ID da venda ou do saque de origem
+    """
+    await db.execute("""
+        INSERT INTO affiliate_ledger (affiliate_id, entry_type, amount, reference_id)
+        VALUES (?, ?, ?, ?)
+    """, (affiliate_id, entry_type, amount, reference_id))
+
+    commission = amount if entry_type in COMMISSION_ENTRIES else 0.0
+    withdrawn = 0.0 if entry_type in COMMISSION_ENTRIES else -amount
+
+    await db.execute("""
+        INSERT INTO affiliate_balances (affiliate_id, total_commission, total_withdrawn, balance)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(affiliate_id) DO UPDATE SET
+            total_commission = total_commission + excluded.total_commission,
+            total_withdrawn = total_withdrawn + excluded.total_withdrawn,
+            balance = balance + excluded.balance,
+            updated_at = CURRENT_TIMESTAMP
+    """, (affiliate_id, commission, withdrawn, amount))
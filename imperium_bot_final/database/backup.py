@@ -0,0 +1,144 @@
+"""
+Backup do banco de dados SQLite do Imperium™ Bot
+Usa a API de backup online do SQLite: a cópia é consistente mesmo com o bot gravando
+"""
+
+import asyncio
+import gzip
+import os
+import shutil
+import sqlite3
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from config.settings import (
+    BACKUP_DIR, BACKUP_PAGES_PER_STEP, BACKUP_STEP_SLEEP,
+    BACKUP_COMPRESS_LEVEL, BACKUP_RETENTION
+)
+from database.models import db_manager
+from utils.logger import logger
+
+BACKUP_PREFIX = "imperium_bot_"
+BACKUP_SUFFIX = ".db.gz"
+
+class BackupError(Exception):
+    """Falha ao gerar ou verificar um backup"""
+
+class DatabaseBackup:
+    """
+    Gera backups compactados e verificados do banco
+
+    A cópia é feita em etapas de BACKUP_PAGES_PER_STEP páginas, com uma
+    pausa de BACKUP_STEP_SLEEP entre elas para espalhar a leitura do disco
+    (em WAL a cópia não bloqueia o escritor do bot). A cópia passa por
+    PRAGMA integrity_check antes de ser compactada, e só backups íntegros
+    contam para a retenção.
+    """
+
+    def __init__(self, backup_dir: str = BACKUP_DIR, retention: int = BACKUP_RETENTION):
+        self.backup_dir = backup_dir
+        self.retention = max(1, retention)
+        self._lock = asyncio.Lock()
+
+    def list_backups(self) -> List[str]:
+        """
+        Lista os backups existentes, do mais antigo ao mais recente
+
+        Returns:
+            Caminhos dos arquivos de backup
+        """
+        if not os.path.isdir(self.backup_dir):
+            return []
+        names = sorted(
+            name for name in os.listdir(self.backup_dir)
+            if name.startswith(BACKUP_PREFIX) and name.endswith(BACKUP_SUFFIX)
+        )
+        return [os.path.join(self.backup_dir, name) for name in names]
+
+    def _copy(self, source_path: str, target_path: str) -> int:
+        """Copia o banco com a API de backup e verifica a cópia; retorna o número de páginas"""
+        source = sqlite3.connect(source_path)
+        try:
+            target = sqlite3.connect(target_path)
+            try:
+                # O sleep da API só vale após SQLITE_BUSY/LOCKED; a pausa entre etapas é feita aqui
+                source.backup(
+                    target, pages=BACKUP_PAGES_PER_STEP, sleep=BACKUP_STEP_SLEEP,
+                    progress=lambda status, remaining, total: time.sleep(BACKUP_STEP_SLEEP)
+                )
+                result = target.execute("PRAGMA integrity_check").fetchall()
+                if result != [("ok",)]:
+                    problems = "; ".join(row[0] for row in result[:5])
+                    raise BackupError(f"integrity_check falhou na cópia: {problems}")
+                return target.execute("PRAGMA page_count").fetchone()[0]
+            finally:
+                target.close()
+        finally:
+            source.close()
+
+    @staticmethod
+    def _compress(source_path: str, target_path: str):
+        """Compacta a cópia em blocos, sem carregá-la inteira na memória"""
+        with open(source_path, "rb") as source, \
+                gzip.open(target_path, "wb", compresslevel=BACKUP_COMPRESS_LEVEL) as target:
+            shutil.copyfileobj(source, target, 1024 * 1024)
+
+    def _apply_retention(self) -> int:
+        """Apaga os backups além da retenção; retorna quantos foram apagados"""
+        backups = self.list_backups()
+        removed = 0
+        for path in backups[:-self.retention]:
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError as e:
+                logger.warning(f"Não foi possível apagar o backup antigo {path}: {e}")
+        return removed
+
+    def _run(self, source_path: str) -> Dict:
+        """Executa o backup completo (chamado em thread)"""
+        os.makedirs(self.backup_dir, exist_ok=True)
+        name = f"{BACKUP_PREFIX}{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        final_path = os.path.join(self.backup_dir, name + BACKUP_SUFFIX)
+        copy_path = os.path.join(self.backup_dir, name + ".db.tmp")
+        compressed_path = final_path + ".tmp"
+
+        started = time.monotonic()
+        try:
+            pages = self._copy(source_path, copy_path)
+            copy_size = os.path.getsize(copy_path)
+            self._compress(copy_path, compressed_path)
+            os.replace(compressed_path, final_path)
+        finally:
+            for path in (copy_path, compressed_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+        return {
+            "path": final_path,
+            "pages": pages,
+            "size": copy_size,
+            "compressed_size": os.path.getsize(final_path),
+            "duration": round(time.monotonic() - started, 3),
+            "removed": self._apply_retention()
+        }
+
+    async def run(self, source_path: Optional[str] = None) -> Dict:
+        """
+        Gera um backup do banco
+
+        Args:
+            source_path: Banco de origem (padrão: o banco do bot)
+
+        Returns:
+            Dict com caminho, páginas, tamanhos, duração e backups antigos apagados
+
+        Raises:
+            BackupError: se a cópia não passar na verificação de integridade
+        """
+        async with self._lock:
+            return await asyncio.to_thread(self._run, source_path or db_manager.db_path)
+
+# Instância global de backups
+database_backups = DatabaseBackup()
@@ -0,0 +1,213 @@
+"""
+Migrações versionadas do banco de dados do Imperium™ Bot
+A versão aplicada fica registrada em PRAGMA user_version
+"""
+
+from typing import List, Tuple
+
+# (versão, descrição, comandos SQL)
+MIGRATIONS: List[Tuple[int, str, List[str]]] = [
+    (1, "Índices para assinaturas ativas, saldo de afiliados e saques pendentes", [
+        # get_active_subscription: user_id + is_active + end_date (ORDER BY end_date)
+        """CREATE INDEX IF NOT EXISTS idx_subscriptions_user_active
+           ON subscriptions (user_id, is_active, end_date)""",
+        # get_affiliate_balance: SUM(commission_amount) por affiliate_id (índice cobre a consulta)
+        """CREATE INDEX IF NOT EXISTS idx_affiliate_sales_affiliate
+           ON affiliate_sales (affiliate_id, commission_amount)""",
+        # get_affiliate_balance: SUM(amount) por user_id + status (índice cobre a consulta)
+        """CREATE INDEX IF NOT EXISTS idx_withdrawals_user_status
+           ON withdrawal_requests (user_id, status, amount)""",
+        # get_pending_withdrawals: status = 'pending' ORDER BY request_date
+        """CREATE INDEX IF NOT EXISTS idx_withdrawals_status_date
+           ON withdrawal_requests (status, request_date)""",
+    ]),
+    (2, "Índices para a reconciliação das estatísticas do painel", [
+        # Novos usuários do dia: registration_date >= DATE('now')
+        """CREATE INDEX IF NOT EXISTS idx_users_registration_date
+           ON users (registration_date)""",
+        # Assinaturas ativas: is_active = 1 AND end_date > CURRENT_TIMESTAMP
+        """CREATE INDEX IF NOT EXISTS idx_subscriptions_active_end
+           ON subscriptions (is_active, end_date)""",
+        # Faturamento do dia: start_date >= DATE('now') somando plan_price (índice cobre a consulta)
+        """CREATE INDEX IF NOT EXISTS idx_subscriptions_start_price
+           ON subscriptions (start_date, plan_price)""",
+    ]),
+    (3, "Índice para localizar a assinatura de um pagamento", [
+        # get_subscription_by_payment: usado para não liberar o mesmo pagamento duas vezes
+        """CREATE INDEX IF NOT EXISTS idx_subscriptions_payment
+           ON subscriptions (payment_id)""",
+    ]),
+    (4, "Índice para a varredura de pagamentos pendentes", [
+        # get_pending_payments_page: status IN (...) paginado por (creation_date, id)
+        """CREATE INDEX IF NOT EXISTS idx_payments_status_created
+           ON payments (status, creation_date, id)""",
+    ]),
+    (5, "Tabela de estados do FSM", [
+        """CREATE TABLE IF NOT EXISTS fsm_storage (
+               key TEXT PRIMARY KEY,
+               state TEXT,
+               data TEXT,
+               expires_at REAL
+           )""",
+        # Remoção periódica dos estados temporários vencidos
+        """CREATE INDEX IF NOT EXISTS idx_fsm_storage_expires
+           ON fsm_storage (expires_at) WHERE expires_at IS NOT NULL""",
+    ]),
+    (6, "Registro de file_id das mídias enviadas ao Telegram", [
+        # Um file_id por arquivo; content_hash detecta quando o arquivo mudou
+        """CREATE TABLE IF NOT EXISTS media_files (
+               path TEXT PRIMARY KEY,
+               content_hash TEXT NOT NULL,
+               file_id TEXT NOT NULL,
+               media_type TEXT NOT NULL,
+               updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+           )""",
+    ]),
+    (7, "Livro-razão e saldo materializado dos afiliados", [
+        # Lançamentos só são inseridos: comissão (+), saque aprovado (-), estorno de saque (+), ajuste
+        """CREATE TABLE IF NOT EXISTS affiliate_ledger (
+               id INTEGER PRIMARY KEY AUTOINCREMENT,
+               affiliate_id INTEGER NOT NULL,
+               entry_type TEXT NOT NULL,
+               amount REAL NOT NULL,
+               reference_id INTEGER,
+               created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+           )""",
+        """CREATE INDEX IF NOT EXISTS idx_affiliate_ledger_affiliate
+           ON affiliate_ledger (affiliate_id, id)""",
+        # get_affiliate_balance: leitura O(1) por affiliate_id
+        """CREATE TABLE IF NOT EXISTS affiliate_balances (
+               affiliate_id INTEGER PRIMARY KEY,
+               total_commission REAL NOT NULL DEFAULT 0,
+               total_withdrawn REAL NOT NULL DEFAULT 0,
+               balance REAL NOT NULL DEFAULT 0,
+               updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+           )""",
+        # Carga inicial a partir do histórico existente
+        """INSERT INTO affiliate_ledger (affiliate_id, entry_type, amount, reference_id, created_at)
+           SELECT affiliate_id, 'commission', commission_amount, id, sale_date
+           FROM affiliate_sales ORDER BY id""",
+        """INSERT INTO affiliate_ledger (affiliate_id, entry_type, amount, reference_id, created_at)
+           SELECT user_id, 'withdrawal', -amount, id, COALESCE(processed_date, request_date)
+           FROM withdrawal_requests WHERE status = 'approved' ORDER BY id""",
+        """INSERT INTO affiliate_balances (affiliate_id, total_commission, total_withdrawn, balance)
+           SELECT affiliate_id,
+                  SUM(CASE WHEN entry_type = 'commission' THEN amount ELSE 0 END),
+                  -SUM(CASE WHEN entry_type = 'commission' THEN 0 ELSE amount END),
+                  SUM(amount)
+           FROM affiliate_ledger GROUP BY affiliate_id""",
+    ]),
+    (8, "Uma assinatura por pagamento", [
+        # Assinaturas repetidas do mesmo pagamento (mantém a primeira)
+        """CREATE TEMP TABLE duplicate_subscriptions AS
+           SELECT id FROM subscriptions
+           WHERE payment_id IS NOT NULL AND id NOT IN (
+               SELECT MIN(id) FROM subscriptions
+               WHERE payment_id IS NOT NULL GROUP BY payment_id
+           )""",
+        # Estorna no livro-razão as comissões geradas pelas repetições
+        """INSERT INTO affiliate_ledger (affiliate_id, entry_type, amount, reference_id)
+           SELECT affiliate_id, 'commission_adjustment', -commission_amount, id
+           FROM affiliate_sales
+           WHERE subscription_id IN (SELECT id FROM duplicate_subscriptions)""",
+        """UPDATE affiliate_balances SET
+               total_commission = total_commission - (
+                   SELECT SUM(commission_amount) FROM affiliate_sales
+                   WHERE affiliate_sales.affiliate_id = affiliate_balances.affiliate_id
+                   AND subscription_id IN (SELECT id FROM duplicate_subscriptions)
+               ),
+               balance = balance - (
+                   SELECT SUM(commission_amount) FROM affiliate_sales
+                   WHERE affiliate_sales.affiliate_id = affiliate_balances.affiliate_id
+                   AND subscription_id IN (SELECT id FROM duplicate_subscriptions)
+               ),
+               updated_at = CURRENT_TIMESTAMP
+           WHERE affiliate_id IN (
+               SELECT affiliate_id FROM affiliate_sales
+               WHERE subscription_id IN (SELECT id FROM duplicate_subscriptions)
+           )""",
+        """DELETE FROM affiliate_sales
+           WHERE subscription_id IN (SELECT id FROM duplicate_subscriptions)""",
+        """DELETE FROM subscriptions WHERE id IN (SELECT id FROM duplicate_subscriptions)""",
+        "DROP TABLE duplicate_subscriptions",
+        # approve_payment: ON CONFLICT(payment_id) impede uma segunda assinatura
+        "DROP INDEX IF EXISTS idx_subscriptions_payment",
+        """CREATE UNIQUE INDEX IF NOT EXISTS idx_subscriptions_payment_unique
+           ON subscriptions (payment_id)""",
+    ]),
+    (9, "Vencimento de assinaturas e fila de avisos", [
+        # Lembrete de renovação enviado uma única vez por assinatura
+        """ALTER TABLE subscriptions ADD COLUMN reminder_sent INTEGER NOT NULL DEFAULT 0""",
+        # Avisos e remoções do grupo VIP pendentes (apagados depois de executados)
+        """CREATE TABLE IF NOT EXISTS subscription_actions (
+               id INTEGER PRIMARY KEY AUTOINCREMENT,
+               subscription_id INTEGER,
+               user_id INTEGER NOT NULL,
+               action TEXT NOT NULL,
+               attempts INTEGER NOT NULL DEFAULT 0,
+               created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+           )""",
+    ]),
+    (10, "Transmissões administrativas e usuários que bloquearam o bot", [
+        # Preenchido quando o Telegram recusa a entrega; limpo quando o usuário volta
+        """ALTER TABLE users ADD COLUMN blocked_at DATETIME""",
+        # Progresso de cada transmissão: last_user_id é o cursor para retomar
+        """CREATE TABLE IF NOT EXISTS broadcasts (
+               id INTEGER PRIMARY KEY AUTOINCREMENT,
+               audience TEXT NOT NULL,
+               text TEXT NOT NULL,
+               created_by INTEGER,
+               status TEXT NOT NULL DEFAULT 'running',
+               last_user_id INTEGER NOT NULL DEFAULT 0,
+               sent INTEGER NOT NULL DEFAULT 0,
+               failed INTEGER NOT NULL DEFAULT 0,
+               blocked INTEGER NOT NULL DEFAULT 0,
+               created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+               finished_at DATETIME
+           )""",
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+async def get_schema_version(db) -> int:
+    """
+    Lê a versão atual do esquema
+
+    Args:
+        db: Conexão aiosqlite
+
+    Returns:
+        Versão registrada em PRAGMA user_version
+    """
+    cursor = await db.execute("PRAGMA user_version")
+    row = await cursor.fetchone()
+    return row[0] if row else 0
+
+async def apply_migrations(db) -> int:
+    """
+    Aplica em ordem as migrações ainda não executadas
+
+    Deve ser chamada dentro de uma transação de escrita; o commit fica
+    a cargo de quem chamou.
+
+    Args:
+        db: Conexão aiosqlite de escrita
+
+    Returns:
+        Versão do esquema após as migrações
+    """
+    current_version = await get_schema_version(db)
+
+    for version, _description, statements in MIGRATIONS:
+        if version <= current_version:
+            continue
+
+        for statement in statements:
+            await db.execute(statement)
+
+        # PRAGMA não aceita parâmetros; a versão é sempre um inteiro da lista acima
+        await db.execute(f"PRAGMA user_version = {int(version)}")
+        current_version = version
+
+    return current_version
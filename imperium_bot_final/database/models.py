@@ -3,21 +3,34 @@ Modelo do banco de dados SQLite para o Imperium™ Bot
 Contém todas as tabelas necessárias para operação completa do sistema
 """
 
-import aiosqlite
 import asyncio
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
 import os
 
+from config.settings import USER_CACHE_TTL, USER_CACHE_SIZE
+from database.pool import ConnectionPool
+from database.migrations import apply_migrations
+from database.statistics import StatisticsCounters, RECONCILE_QUERY
+from database import affiliate_ledger as ledger
+from utils.cache import AsyncTTLCache
+
 DATABASE_PATH = "imperium_bot.db"
 
 class DatabaseManager:
     def __init__(self, db_path: str = DATABASE_PATH):
         self.db_path = db_path
+        self.pool = ConnectionPool(db_path)
+        self.stats = StatisticsCounters()
+        # Leituras por usuário feitas em quase toda interação; None também fica em cache
+        self.user_cache = AsyncTTLCache(ttl=USER_CACHE_TTL, maxsize=USER_CACHE_SIZE, cache_none=True)
+        self.subscription_cache = AsyncTTLCache(ttl=USER_CACHE_TTL, maxsize=USER_CACHE_SIZE, cache_none=True)
     
     async def init_database(self):
         """Inicializa o banco de dados criando todas as tabelas necessárias"""
-        async with aiosqlite.connect(self.db_path) as db:
+        await self.pool.open()
+        
+        async with self.pool.writer() as db:
             # Tabela de usuários
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS users (
@@ -126,34 +139,48 @@ class DatabaseManager:
                     VALUES (?, ?, ?)
                 """, (key, value, description))
             
-            await db.commit()
+            # Índices e ajustes de esquema versionados
+            await apply_migrations(db)
+        
+        await self.reconcile_statistics()
+    
+    async def close(self):
+        """Fecha as conexões persistentes do banco de dados"""
+        await self.pool.close()
     
     async def add_user(self, user_id: int, username: str = None, first_name: str = None, 
                       last_name: str = None, referrer_id: int = None) -> bool:
         """Adiciona um novo usuário ao banco de dados"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute("""
+            async with self.pool.writer() as db:
+                cursor = await db.execute("""
                     INSERT OR IGNORE INTO users 
                     (user_id, username, first_name, last_name, referrer_id)
                     VALUES (?, ?, ?, ?, ?)
                 """, (user_id, username, first_name, last_name, referrer_id))
-                await db.commit()
-                return True
+                added = cursor.rowcount == 1
+            # Contadores só depois do commit
+            if added:
+                self.stats.user_added()
+            self.user_cache.invalidate(user_id)
+            return True
         except Exception as e:
             print(f"Erro ao adicionar usuário: {e}")
             return False
     
+    async def _load_user(self, user_id: int) -> Optional[Dict]:
+        async with self.pool.reader() as db:
+            cursor = await db.execute("""
+                SELECT * FROM users WHERE user_id = ?
+            """, (user_id,))
+            row = await cursor.fetchone()
+            return dict(row) if row else None
+    
     async def get_user(self, user_id: int) -> Optional[Dict]:
-        """Busca um usuário pelo ID"""
+        """Busca um usuário pelo ID (via cache)"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                db.row_factory = aiosqlite.Row
-                cursor = await db.execute("""
-                    SELECT * FROM users WHERE user_id = ?
-                """, (user_id,))
-                row = await cursor.fetchone()
-                return dict(row) if row else None
+            user = await self.user_cache.get_or_load(user_id, lambda: self._load_user(user_id))
+            return dict(user) if user else None
         except Exception as e:
             print(f"Erro ao buscar usuário: {e}")
             return None
@@ -161,12 +188,12 @@ class DatabaseManager:
     async def update_user_phone(self, user_id: int, phone: str) -> bool:
         """Atualiza o telefone do usuário"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.pool.writer() as db:
                 await db.execute("""
                     UPDATE users SET phone = ? WHERE user_id = ?
                 """, (phone, user_id))
-                await db.commit()
-                return True
+            self.user_cache.invalidate(user_id)
+            return True
         except Exception as e:
             print(f"Erro ao atualizar telefone: {e}")
             return False
@@ -175,41 +202,233 @@ class DatabaseManager:
                                 duration_days: int, payment_id: str = None) -> int:
         """Cria uma nova assinatura"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.pool.writer() as db:
                 end_date = datetime.now() + timedelta(days=duration_days)
                 cursor = await db.execute("""
                     INSERT INTO subscriptions 
                     (user_id, plan_name, plan_price, end_date, payment_id)
                     VALUES (?, ?, ?, ?, ?)
                 """, (user_id, plan_name, plan_price, end_date, payment_id))
-                await db.commit()
-                return cursor.lastrowid
+            self.stats.subscription_created(plan_price)
+            self.subscription_cache.invalidate(user_id)
+            return cursor.lastrowid
         except Exception as e:
             print(f"Erro ao criar assinatura: {e}")
             return 0
     
+    async def _load_active_subscription(self, user_id: int) -> Optional[Dict]:
+        async with self.pool.reader() as db:
+            cursor = await db.execute("""
+                SELECT * FROM subscriptions 
+                WHERE user_id = ? AND is_active = 1 AND end_date > CURRENT_TIMESTAMP
+                ORDER BY end_date DESC LIMIT 1
+            """, (user_id,))
+            row = await cursor.fetchone()
+            return dict(row) if row else None
+    
     async def get_active_subscription(self, user_id: int) -> Optional[Dict]:
-        """Busca assinatura ativa do usuário"""
+        """Busca assinatura ativa do usuário (via cache)"""
+        try:
+            subscription = await self.subscription_cache.get_or_load(
+                user_id, lambda: self._load_active_subscription(user_id)
+            )
+            if not subscription:
+                return None
+            
+            # A assinatura pode vencer enquanto está em cache (mesma comparação do SQL)
+            now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+            if str(subscription['end_date']) <= now:
+                # A consulta ordena por end_date: se a mais longa venceu, não há outra ativa
+                self.subscription_cache.invalidate(user_id)
+                return None
+            return dict(subscription)
+        except Exception as e:
+            print(f"Erro ao buscar assinatura: {e}")
+            return None
+    
+    def invalidate_user_cache(self, user_id: int):
+        """Descarta usuário e assinatura em cache após alterações feitas fora destes métodos"""
+        self.user_cache.invalidate(user_id)
+        self.subscription_cache.invalidate(user_id)
+    
+    def get_cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Contadores dos caches de leitura por usuário
+        
+        Returns:
+            Dict com hits, misses, cargas coalescidas e tamanho de cada cache
+        """
+        return {
+            "users": self.user_cache.stats(),
+            "subscriptions": self.subscription_cache.stats()
+        }
+    
+    async def get_subscription_by_payment(self, payment_id: str) -> Optional[Dict]:
+        """Busca a assinatura criada para um pagamento"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                db.row_factory = aiosqlite.Row
+            async with self.pool.reader() as db:
                 cursor = await db.execute("""
-                    SELECT * FROM subscriptions 
-                    WHERE user_id = ? AND is_active = 1 AND end_date > CURRENT_TIMESTAMP
-                    ORDER BY end_date DESC LIMIT 1
-                """, (user_id,))
+                    SELECT * FROM subscriptions WHERE payment_id = ?
+                    ORDER BY id LIMIT 1
+                """, (payment_id,))
                 row = await cursor.fetchone()
                 return dict(row) if row else None
         except Exception as e:
-            print(f"Erro ao buscar assinatura: {e}")
+            print(f"Erro ao buscar assinatura do pagamento: {e}")
             return None
     
+    async def expire_subscriptions(self, limit: int) -> int:
+        """
+        Desativa um lote de assinaturas vencidas e enfileira os avisos
+        
+        Usuários que ainda têm outra assinatura ativa (renovaram antes do
+        vencimento) não recebem aviso nem são removidos do grupo.
+        
+        Args:
+            limit: Tamanho do lote
+        
+        Returns:
+            Quantidade de assinaturas desativadas
+        """
+        try:
+            async with self.pool.writer() as db:
+                cursor = await db.execute("""
+                    SELECT id, user_id FROM subscriptions
+                    WHERE is_active = 1 AND end_date <= CURRENT_TIMESTAMP
+                    ORDER BY end_date LIMIT ?
+                """, (limit,))
+                rows = await cursor.fetchall()
+                if not rows:
+                    return 0
+                
+                await db.executemany("""
+                    UPDATE subscriptions SET is_active = 0 WHERE id = ?
+                """, [(row['id'],) for row in rows])
+                
+                # Um aviso por usuário, mesmo com várias assinaturas vencidas no lote
+                latest = {row['user_id']: row['id'] for row in rows}
+                await db.executemany("""
+                    INSERT INTO subscription_actions (subscription_id, user_id, action)
+                    SELECT ?, ?, 'expired'
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM subscriptions
+                        WHERE user_id = ? AND is_active = 1 AND end_date > CURRENT_TIMESTAMP
+                    )
+                """, [(subscription_id, user_id, user_id) for user_id, subscription_id in latest.items()])
+            
+            self.stats.subscriptions_expired(len(rows))
+            for user_id in latest:
+                self.subscription_cache.invalidate(user_id)
+            return len(rows)
+        except Exception as e:
+            print(f"Erro ao desativar assinaturas vencidas: {e}")
+            return 0
+    
+    async def queue_renewal_reminders(self, days_before: int, limit: int) -> int:
+        """
+        Enfileira lembretes de renovação para assinaturas perto do vencimento
+        
+        Args:
+            days_before: Antecedência do lembrete em dias
+            limit: Tamanho do lote
+        
+        Returns:
+            Quantidade de assinaturas marcadas neste lote
+        """
+        try:
+            window = f"+{int(days_before)} days"
+            async with self.pool.writer() as db:
+                cursor = await db.execute("""
+                    SELECT s.id, s.user_id, EXISTS (
+                        SELECT 1 FROM subscriptions later
+                        WHERE later.user_id = s.user_id AND later.is_active = 1
+                        AND later.end_date > DATETIME('now', ?)
+                    ) AS renewed
+                    FROM subscriptions s
+                    WHERE s.is_active = 1 AND s.reminder_sent = 0
+                    AND s.end_date > CURRENT_TIMESTAMP AND s.end_date <= DATETIME('now', ?)
+                    ORDER BY s.end_date LIMIT ?
+                """, (window, window, limit))
+                rows = await cursor.fetchall()
+                if not rows:
+                    return 0
+                
+                await db.executemany("""
+                    UPDATE subscriptions SET reminder_sent = 1 WHERE id = ?
+                """, [(row['id'],) for row in rows])
+                await db.executemany("""
+                    INSERT INTO subscription_actions (subscription_id, user_id, action)
+                    VALUES (?, ?, 'reminder')
+                """, [(row['id'], row['user_id']) for row in rows if not row['renewed']])
+                return len(rows)
+        except Exception as e:
+            print(f"Erro ao enfileirar lembretes de renovação: {e}")
+            return 0
+    
+    async def get_subscription_actions(self, after_id: int, limit: int) -> List[Dict]:
+        """
+        Lista uma página da fila de avisos de assinatura
+        
+        Args:
+            after_id: Último id já processado nesta execução
+            limit: Tamanho da página
+        
+        Returns:
+            Ações em ordem de criação, com plano e vencimento da assinatura
+        """
+        try:
+            async with self.pool.reader() as db:
+                cursor = await db.execute("""
+                    SELECT a.id, a.user_id, a.action, a.attempts, s.plan_name, s.end_date
+                    FROM subscription_actions a
+                    LEFT JOIN subscriptions s ON s.id = a.subscription_id
+                    WHERE a.id > ?
+                    ORDER BY a.id LIMIT ?
+                """, (after_id, limit))
+                rows = await cursor.fetchall()
+                return [dict(row) for row in rows]
+        except Exception as e:
+            print(f"Erro ao listar avisos de assinatura: {e}")
+            return []
+    
+    async def finish_subscription_actions(self, done_ids: List[int], failed_ids: List[int],
+                                          max_attempts: int) -> bool:
+        """
+        Remove da fila as ações concluídas e conta uma tentativa nas que falharam
+        
+        Args:
+            done_ids: Ações executadas
+            failed_ids: Ações que falharam nesta execução
+            max_attempts: Tentativas antes de descartar a ação
+        
+        Returns:
+            True se atualizou com sucesso
+        """
+        try:
+            async with self.pool.writer() as db:
+                if done_ids:
+                    await db.executemany("""
+                        DELETE FROM subscription_actions WHERE id = ?
+                    """, [(action_id,) for action_id in done_ids])
+                if failed_ids:
+                    await db.executemany("""
+                        UPDATE subscription_actions SET attempts = attempts + 1 WHERE id = ?
+                    """, [(action_id,) for action_id in failed_ids])
+                    await db.execute("""
+                        DELETE FROM subscription_actions WHERE attempts >= ?
+                    """, (max_attempts,))
+                return True
+        except Exception as e:
+            print(f"Erro ao atualizar fila de avisos de assinatura: {e}")
+            return False
+    
     async def create_payment(self, user_id: int, mp_payment_id: str, amount: float, 
-                           plan_name: str, qr_code_data: str, qr_code_base64: str) -> bool:
+                           plan_name: str, qr_code_data: str, qr_code_base64: str,
+                           expiration_hours: int = 24) -> bool:
         """Cria um registro de pagamento"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                expiration_date = datetime.now() + timedelta(hours=24)
+            async with self.pool.writer() as db:
+                expiration_date = datetime.now() + timedelta(hours=expiration_hours)
                 await db.execute("""
                     INSERT INTO payments 
                     (user_id, mp_payment_id, amount, plan_name, qr_code_data, 
@@ -217,7 +436,6 @@ class DatabaseManager:
                     VALUES (?, ?, ?, ?, ?, ?, ?)
                 """, (user_id, mp_payment_id, amount, plan_name, qr_code_data, 
                       qr_code_base64, expiration_date))
-                await db.commit()
                 return True
         except Exception as e:
             print(f"Erro ao criar pagamento: {e}")
@@ -226,8 +444,7 @@ class DatabaseManager:
     async def get_payment(self, mp_payment_id: str) -> Optional[Dict]:
         """Busca um pagamento pelo ID do Mercado Pago"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                db.row_factory = aiosqlite.Row
+            async with self.pool.reader() as db:
                 cursor = await db.execute("""
                     SELECT * FROM payments WHERE mp_payment_id = ?
                 """, (mp_payment_id,))
@@ -240,71 +457,273 @@ class DatabaseManager:
     async def update_payment_status(self, mp_payment_id: str, status: str) -> bool:
         """Atualiza o status de um pagamento"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.pool.writer() as db:
                 approval_date = datetime.now() if status == 'approved' else None
                 await db.execute("""
                     UPDATE payments 
                     SET status = ?, approval_date = ?
                     WHERE mp_payment_id = ?
                 """, (status, approval_date, mp_payment_id))
-                await db.commit()
                 return True
         except Exception as e:
             print(f"Erro ao atualizar status do pagamento: {e}")
             return False
     
+    async def approve_payment(self, mp_payment_id: str,
+                              resolve_plan: Callable[[str], Optional[Dict]],
+                              commission_rate: float, user_id: int = None,
+                              plan_key: str = None) -> Optional[Dict]:
+        """
+        Libera um pagamento aprovado em uma única transação
+        
+        O status do pagamento passa para 'approved' por compare-and-set e a
+        assinatura é inserida com ON CONFLICT(payment_id): verificações,
+        webhooks e conferências simultâneas do mesmo pagamento resultam em
+        uma só assinatura e uma só comissão.
+        
+        Args:
+            mp_payment_id: ID do pagamento no Mercado Pago
+            resolve_plan: Função que localiza o plano pelo nome gravado
+            commission_rate: Taxa de comissão do afiliado
+            user_id: Usuário, caso o pagamento não esteja no banco (opcional)
+            plan_key: Plano, caso o pagamento não esteja no banco (opcional)
+        
+        Returns:
+            Dict com user_id, plan, subscription_id, end_date, already_processed,
+            referrer_id e commission, ou None se não foi possível liberar
+        """
+        try:
+            async with self.pool.writer() as db:
+                cursor = await db.execute("""
+                    SELECT user_id, plan_name FROM payments WHERE mp_payment_id = ?
+                """, (mp_payment_id,))
+                payment = await cursor.fetchone()
+                if payment:
+                    user_id = payment['user_id']
+                    plan = resolve_plan(payment['plan_name'])
+                else:
+                    plan = resolve_plan(plan_key) if plan_key else None
+                
+                if not user_id or not plan:
+                    print(f"Pagamento {mp_payment_id} aprovado sem usuário ou plano identificável")
+                    return None
+                
+                result = {
+                    "user_id": user_id,
+                    "plan": plan,
+                    "already_processed": True,
+                    "referrer_id": None,
+                    "commission": 0.0
+                }
+                
+                now = datetime.now()
+                cursor = await db.execute("""
+                    UPDATE payments SET status = 'approved', approval_date = ?
+                    WHERE mp_payment_id = ? AND status != 'approved'
+                """, (now, mp_payment_id))
+                claimed = cursor.rowcount == 1
+                
+                if not claimed:
+                    # Já aprovado por outra verificação; a assinatura existe, salvo
+                    # em registros antigos aprovados sem assinatura
+                    cursor = await db.execute("""
+                        SELECT id, end_date FROM subscriptions WHERE payment_id = ?
+                    """, (mp_payment_id,))
+                    existing = await cursor.fetchone()
+                    if existing:
+                        result.update(subscription_id=existing['id'], end_date=existing['end_date'])
+                        return result
+                
+                end_date = now + timedelta(days=plan['duration_days'])
+                cursor = await db.execute("""
+                    INSERT INTO subscriptions 
+                    (user_id, plan_name, plan_price, end_date, payment_id)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(payment_id) DO NOTHING
+                """, (user_id, plan['name'], plan['price'], end_date, mp_payment_id))
+                if cursor.rowcount == 0:
+                    cursor = await db.execute("""
+                        SELECT id, end_date FROM subscriptions WHERE payment_id = ?
+                    """, (mp_payment_id,))
+                    existing = await cursor.fetchone()
+                    result.update(subscription_id=existing['id'], end_date=existing['end_date'])
+                    return result
+                
+                subscription_id = cursor.lastrowid
+                result.update(subscription_id=subscription_id, end_date=end_date,
+                              already_processed=False)
+                
+                cursor = await db.execute("""
+                    SELECT referrer_id FROM users WHERE user_id = ?
+                """, (user_id,))
+                user = await cursor.fetchone()
+                if user and user['referrer_id']:
+                    commission = round(plan['price'] * commission_rate, 2)
+                    await self._insert_affiliate_sale(db, user['referrer_id'], user_id,
+                                                      subscription_id, commission)
+                    result.update(referrer_id=user['referrer_id'], commission=commission)
+            
+            self.stats.subscription_created(plan['price'])
+            self.subscription_cache.invalidate(user_id)
+            return result
+        except Exception as e:
+            print(f"Erro ao aprovar pagamento {mp_payment_id}: {e}")
+            return None
+    
+    async def get_pending_payments_page(self, min_age_seconds: int, limit: int,
+                                        after: Optional[Tuple[str, int]] = None) -> List[Dict]:
+        """
+        Lista uma página de pagamentos ainda não finalizados
+        
+        A paginação é por chave (creation_date, id), então linhas atualizadas
+        entre uma página e outra não fazem a varredura pular registros.
+        
+        Args:
+            min_age_seconds: Ignora pagamentos criados há menos tempo que isso
+            limit: Tamanho da página
+            after: (creation_date, id) do último registro da página anterior
+        
+        Returns:
+            Lista de pagamentos pendentes em ordem de criação
+        """
+        try:
+            async with self.pool.reader() as db:
+                query = """
+                    SELECT id, user_id, mp_payment_id, status, creation_date, expiration_date
+                    FROM payments
+                    WHERE status IN ('pending', 'in_process', 'authorized')
+                    AND creation_date <= DATETIME('now', ?)
+                """
+                params = [f"-{int(min_age_seconds)} seconds"]
+                if after:
+                    query += " AND (creation_date, id) > (?, ?)"
+                    params.extend(after)
+                query += " ORDER BY creation_date, id LIMIT ?"
+                params.append(limit)
+                
+                cursor = await db.execute(query, params)
+                rows = await cursor.fetchall()
+                return [dict(row) for row in rows]
+        except Exception as e:
+            print(f"Erro ao listar pagamentos pendentes: {e}")
+            return []
+    
+    async def update_payment_statuses(self, updates: List[Tuple[str, str]]) -> int:
+        """
+        Atualiza o status de vários pagamentos em uma única transação
+        
+        Args:
+            updates: Lista de (mp_payment_id, novo status)
+        
+        Returns:
+            Quantidade de pagamentos que realmente mudaram de status
+        """
+        if not updates:
+            return 0
+        try:
+            async with self.pool.writer() as db:
+                now = datetime.now()
+                cursor = await db.executemany("""
+                    UPDATE payments 
+                    SET status = ?, approval_date = COALESCE(?, approval_date)
+                    WHERE mp_payment_id = ? AND status != ?
+                """, [
+                    (status, now if status == 'approved' else None, mp_payment_id, status)
+                    for mp_payment_id, status in updates
+                ])
+                return cursor.rowcount
+        except Exception as e:
+            print(f"Erro ao atualizar status dos pagamentos em lote: {e}")
+            return 0
+    
     async def create_affiliate_sale(self, affiliate_id: int, referred_user_id: int, 
                                   subscription_id: int, commission_amount: float) -> bool:
         """Registra uma venda de afiliado"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute("""
-                    INSERT INTO affiliate_sales 
-                    (affiliate_id, referred_user_id, subscription_id, commission_amount)
-                    VALUES (?, ?, ?, ?)
-                """, (affiliate_id, referred_user_id, subscription_id, commission_amount))
-                await db.commit()
+            async with self.pool.writer() as db:
+                await self._insert_affiliate_sale(db, affiliate_id, referred_user_id,
+                                                  subscription_id, commission_amount)
                 return True
         except Exception as e:
             print(f"Erro ao registrar venda de afiliado: {e}")
             return False
     
+    async def _insert_affiliate_sale(self, db, affiliate_id: int, referred_user_id: int,
+                                     subscription_id: int, commission_amount: float):
+        """Grava a venda e o lançamento da comissão na transação de escrita recebida"""
+        cursor = await db.execute("""
+            INSERT INTO affiliate_sales 
+            (affiliate_id, referred_user_id, subscription_id, commission_amount)
+            VALUES (?, ?, ?, ?)
+        """, (affiliate_id, referred_user_id, subscription_id, commission_amount))
+        await ledger.post_entry(db, affiliate_id, ledger.COMMISSION,
+                                commission_amount, cursor.lastrowid)
+    
     async def get_affiliate_balance(self, user_id: int) -> float:
-        """Calcula o saldo disponível do afiliado"""
+        """Retorna o saldo disponível do afiliado (mantido em affiliate_balances)"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                # Saldo total de comissões
-                cursor = await db.execute("""
-                    SELECT COALESCE(SUM(commission_amount), 0) as total_commission
-                    FROM affiliate_sales WHERE affiliate_id = ?
-                """, (user_id,))
-                total_commission = (await cursor.fetchone())[0]
-                
-                # Saques aprovados
+            async with self.pool.reader() as db:
                 cursor = await db.execute("""
-                    SELECT COALESCE(SUM(amount), 0) as total_withdrawn
-                    FROM withdrawal_requests 
-                    WHERE user_id = ? AND status = 'approved'
+                    SELECT balance FROM affiliate_balances WHERE affiliate_id = ?
                 """, (user_id,))
-                total_withdrawn = (await cursor.fetchone())[0]
-                
-                return total_commission - total_withdrawn
+                row = await cursor.fetchone()
+                return round(row[0], 2) if row else 0.0
         except Exception as e:
             print(f"Erro ao calcular saldo do afiliado: {e}")
             return 0.0
     
+    async def verify_affiliate_balances(self, repair: bool = False) -> Optional[List[Dict]]:
+        """
+        Recalcula os saldos a partir de affiliate_sales e withdrawal_requests
+        e compara com os saldos materializados
+        
+        Args:
+            repair: Se True, lança ajustes para igualar os saldos ao histórico
+        
+        Returns:
+            Lista de afiliados divergentes (vazia se tudo confere) ou None em caso de erro
+        """
+        try:
+            async with self.pool.reader() as db:
+                cursor = await db.execute(ledger.BALANCE_DRIFT_QUERY,
+                                          {"tolerance": ledger.DRIFT_TOLERANCE})
+                drifts = [dict(row) for row in await cursor.fetchall()]
+            
+            if repair and drifts:
+                async with self.pool.writer() as db:
+                    for drift in drifts:
+                        affiliate_id = drift['affiliate_id']
+                        commission_delta = drift['expected_commission'] - drift['total_commission']
+                        withdrawn_delta = drift['expected_withdrawn'] - drift['total_withdrawn']
+                        if abs(commission_delta) > ledger.DRIFT_TOLERANCE:
+                            await ledger.post_entry(db, affiliate_id, ledger.COMMISSION_ADJUSTMENT,
+                                                    commission_delta)
+                        if abs(withdrawn_delta) > ledger.DRIFT_TOLERANCE:
+                            await ledger.post_entry(db, affiliate_id, ledger.WITHDRAWAL_ADJUSTMENT,
+                                                    -withdrawn_delta)
+                        # Saldo alterado fora do livro-razão: volta a refletir os totais
+                        await db.execute("""
+                            UPDATE affiliate_balances
+                            SET balance = total_commission - total_withdrawn
+                            WHERE affiliate_id = ?
+                        """, (affiliate_id,))
+            return drifts
+        except Exception as e:
+            print(f"Erro ao verificar saldos dos afiliados: {e}")
+            return None
+    
     async def create_withdrawal_request(self, user_id: int, amount: float, 
                                       pix_key: str, pix_key_type: str) -> bool:
         """Cria uma solicitação de saque"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.pool.writer() as db:
                 await db.execute("""
                     INSERT INTO withdrawal_requests 
                     (user_id, amount, pix_key, pix_key_type)
                     VALUES (?, ?, ?, ?)
                 """, (user_id, amount, pix_key, pix_key_type))
-                await db.commit()
-                return True
+            self.stats.withdrawal_requested()
+            return True
         except Exception as e:
             print(f"Erro ao criar solicitação de saque: {e}")
             return False
@@ -312,8 +731,7 @@ class DatabaseManager:
     async def get_pending_withdrawals(self) -> List[Dict]:
         """Busca todas as solicitações de saque pendentes"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                db.row_factory = aiosqlite.Row
+            async with self.pool.reader() as db:
                 cursor = await db.execute("""
                     SELECT wr.*, u.first_name, u.username
                     FROM withdrawal_requests wr
@@ -331,15 +749,30 @@ class DatabaseManager:
                                processed_by: int, rejection_reason: str = None) -> bool:
         """Processa uma solicitação de saque"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.pool.writer() as db:
+                cursor = await db.execute("""
+                    SELECT status, user_id, amount FROM withdrawal_requests WHERE id = ?
+                """, (withdrawal_id,))
+                row = await cursor.fetchone()
+                previous_status = row[0] if row else None
+                
                 await db.execute("""
                     UPDATE withdrawal_requests 
                     SET status = ?, processed_date = CURRENT_TIMESTAMP, 
                         processed_by = ?, rejection_reason = ?
                     WHERE id = ?
                 """, (status, processed_by, rejection_reason, withdrawal_id))
-                await db.commit()
-                return True
+                
+                # Só saques aprovados descontam do saldo
+                if row and status == 'approved' and previous_status != 'approved':
+                    await ledger.post_entry(db, row[1], ledger.WITHDRAWAL, -row[2], withdrawal_id)
+                elif row and previous_status == 'approved' and status != 'approved':
+                    await ledger.post_entry(db, row[1], ledger.WITHDRAWAL_REVERSAL, row[2], withdrawal_id)
+                
+                left_pending = previous_status == 'pending' and status != 'pending'
+            if left_pending:
+                self.stats.withdrawal_processed()
+            return True
         except Exception as e:
             print(f"Erro ao processar saque: {e}")
             return False
@@ -347,7 +780,7 @@ class DatabaseManager:
     async def get_system_config(self, key: str) -> Optional[str]:
         """Busca uma configuração do sistema"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.pool.reader() as db:
                 cursor = await db.execute("""
                     SELECT value FROM system_config WHERE key = ?
                 """, (key,))
@@ -357,50 +790,252 @@ class DatabaseManager:
             print(f"Erro ao buscar configuração: {e}")
             return None
     
-    async def get_statistics(self) -> Dict:
-        """Busca estatísticas gerais do sistema"""
+    async def create_broadcast(self, audience: str, text: str, created_by: int) -> int:
+        """
+        Registra uma nova transmissão
+        
+        Args:
+            audience: Público ('all' ou 'affiliates')
+            text: Mensagem em HTML
+            created_by: Administrador que criou
+        
+        Returns:
+            ID da transmissão (0 em caso de erro)
+        """
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                stats = {}
-                
-                # Total de usuários
-                cursor = await db.execute("SELECT COUNT(*) FROM users")
-                stats['total_users'] = (await cursor.fetchone())[0]
-                
-                # Usuários hoje
+            async with self.pool.writer() as db:
                 cursor = await db.execute("""
-                    SELECT COUNT(*) FROM users 
-                    WHERE DATE(registration_date) = DATE('now')
-                """)
-                stats['users_today'] = (await cursor.fetchone())[0]
-                
-                # Assinaturas ativas
-                cursor = await db.execute("""
-                    SELECT COUNT(*) FROM subscriptions 
-                    WHERE is_active = 1 AND end_date > CURRENT_TIMESTAMP
-                """)
-                stats['active_subscriptions'] = (await cursor.fetchone())[0]
-                
-                # Faturamento total
-                cursor = await db.execute("""
-                    SELECT COALESCE(SUM(plan_price), 0) FROM subscriptions
-                """)
-                stats['total_revenue'] = (await cursor.fetchone())[0]
-                
-                # Faturamento hoje
-                cursor = await db.execute("""
-                    SELECT COALESCE(SUM(plan_price), 0) FROM subscriptions
-                    WHERE DATE(start_date) = DATE('now')
-                """)
-                stats['revenue_today'] = (await cursor.fetchone())[0]
-                
-                # Saques pendentes
+                    INSERT INTO broadcasts (audience, text, created_by) VALUES (?, ?, ?)
+                """, (audience, text, created_by))
+                return cursor.lastrowid
+        except Exception as e:
+            print(f"Erro ao criar transmissão: {e}")
+            return 0
+    
+    async def get_broadcasts(self, status: str = None) -> List[Dict]:
+        """
+        Lista transmissões, opcionalmente por status
+        
+        Args:
+            status: 'running', 'done' ou 'cancelled' (None = todas)
+        
+        Returns:
+            Transmissões em ordem de criação
+        """
+        try:
+            async with self.pool.reader() as db:
+                if status:
+                    cursor = await db.execute(
+                        "SELECT * FROM broadcasts WHERE status = ? ORDER BY id", (status,)
+                    )
+                else:
+                    cursor = await db.execute("SELECT * FROM broadcasts ORDER BY id")
+                rows = await cursor.fetchall()
+                return [dict(row) for row in rows]
+        except Exception as e:
+            print(f"Erro ao listar transmissões: {e}")
+            return []
+    
+    async def get_broadcast_recipients(self, audience: str, after_user_id: int,
+                                       limit: int) -> List[int]:
+        """
+        Lista uma página de destinatários em ordem de user_id
+        
+        A paginação é por chave (user_id > último enviado), então cada página
+        custa o mesmo independentemente de quantas já foram enviadas.
+        
+        Args:
+            audience: 'all' (todos os usuários) ou 'affiliates' (quem tem vendas)
+            after_user_id: Último destinatário já atendido
+            limit: Tamanho da página
+        
+        Returns:
+            IDs dos usuários que não bloquearam o bot
+        """
+        try:
+            async with self.pool.reader() as db:
+                if audience == "affiliates":
+                    cursor = await db.execute("""
+                        SELECT DISTINCT s.affiliate_id FROM affiliate_sales s
+                        JOIN users u ON u.user_id = s.affiliate_id
+                        WHERE s.affiliate_id > ? AND u.blocked_at IS NULL
+                        ORDER BY s.affiliate_id LIMIT ?
+                    """, (after_user_id, limit))
+                else:
+                    cursor = await db.execute("""
+                        SELECT user_id FROM users
+                        WHERE user_id > ? AND blocked_at IS NULL
+                        ORDER BY user_id LIMIT ?
+                    """, (after_user_id, limit))
+                rows = await cursor.fetchall()
+                return [row[0] for row in rows]
+        except Exception as e:
+            print(f"Erro ao listar destinatários da transmissão: {e}")
+            return []
+    
+    async def save_broadcast_progress(self, broadcast_id: int, last_user_id: int,
+                                      sent: int, failed: int, blocked: int,
+                                      status: str = None) -> bool:
+        """
+        Grava o ponto de retomada de uma transmissão
+        
+        Args:
+            broadcast_id: ID da transmissão
+            last_user_id: Último destinatário atendido
+            sent: Entregues até agora
+            failed: Falhas até agora
+            blocked: Usuários que bloquearam o bot até agora
+            status: Novo status (None = mantém)
+        
+        Returns:
+            True se gravou com sucesso
+        """
+        try:
+            async with self.pool.writer() as db:
+                await db.execute("""
+                    UPDATE broadcasts
+                    SET last_user_id = ?, sent = ?, failed = ?, blocked = ?,
+                        status = COALESCE(?, status),
+                        finished_at = CASE WHEN ? IN ('done', 'cancelled')
+                                           THEN CURRENT_TIMESTAMP ELSE finished_at END
+                    WHERE id = ?
+                """, (last_user_id, sent, failed, blocked, status, status, broadcast_id))
+                return True
+        except Exception as e:
+            print(f"Erro ao gravar progresso da transmissão: {e}")
+            return False
+    
+    async def mark_users_blocked(self, user_ids: List[int]) -> int:
+        """
+        Marca usuários que bloquearam o bot (ficam fora das próximas transmissões)
+        
+        Args:
+            user_ids: IDs dos usuários
+        
+        Returns:
+            Quantidade de usuários marcados
+        """
+        if not user_ids:
+            return 0
+        try:
+            async with self.pool.writer() as db:
+                cursor = await db.executemany("""
+                    UPDATE users SET blocked_at = CURRENT_TIMESTAMP
+                    WHERE user_id = ? AND blocked_at IS NULL
+                """, [(user_id,) for user_id in user_ids])
+                marked = cursor.rowcount
+            for user_id in user_ids:
+                self.user_cache.invalidate(user_id)
+            return marked
+        except Exception as e:
+            print(f"Erro ao marcar usuários bloqueados: {e}")
+            return 0
+    
+    async def clear_user_blocked(self, user_id: int) -> bool:
+        """Desmarca um usuário que voltou a falar com o bot"""
+        try:
+            async with self.pool.writer() as db:
+                await db.execute("""
+                    UPDATE users SET blocked_at = NULL WHERE user_id = ?
+                """, (user_id,))
+            self.user_cache.invalidate(user_id)
+            return True
+        except Exception as e:
+            print(f"Erro ao desmarcar usuário bloqueado: {e}")
+            return False
+    
+    async def get_all_system_config(self) -> Optional[Dict[str, str]]:
+        """Busca todas as configurações do sistema em uma única consulta"""
+        try:
+            async with self.pool.reader() as db:
+                cursor = await db.execute("SELECT key, value FROM system_config")
+                return {row['key']: row['value'] for row in await cursor.fetchall()}
+        except Exception as e:
+            print(f"Erro ao buscar configurações: {e}")
+            return None
+    
+    async def set_system_config(self, key: str, value: str) -> bool:
+        """Grava uma configuração do sistema"""
+        try:
+            async with self.pool.writer() as db:
+                await db.execute("""
+                    INSERT INTO system_config (key, value) VALUES (?, ?)
+                    ON CONFLICT(key) DO UPDATE SET
+                        value = excluded.value,
+                        last_updated = CURRENT_TIMESTAMP
+                """, (key, value))
+                return True
+        except Exception as e:
+            print(f"Erro ao gravar configuração: {e}")
+            return False
+    
+    async def get_media_file(self, path: str) -> Optional[Dict]:
+        """Busca o file_id registrado para um arquivo de mídia"""
+        try:
+            async with self.pool.reader() as db:
                 cursor = await db.execute("""
-                    SELECT COUNT(*) FROM withdrawal_requests WHERE status = 'pending'
-                """)
-                stats['pending_withdrawals'] = (await cursor.fetchone())[0]
-                
-                return stats
+                    SELECT path, content_hash, file_id, media_type
+                    FROM media_files WHERE path = ?
+                """, (path,))
+                row = await cursor.fetchone()
+                return dict(row) if row else None
+        except Exception as e:
+            print(f"Erro ao buscar mídia: {e}")
+            return None
+    
+    async def save_media_file(self, path: str, content_hash: str, file_id: str,
+                              media_type: str) -> bool:
+        """Registra (ou substitui) o file_id de um arquivo de mídia"""
+        try:
+            async with self.pool.writer() as db:
+                await db.execute("""
+                    INSERT INTO media_files (path, content_hash, file_id, media_type)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(path) DO UPDATE SET
+                        content_hash = excluded.content_hash,
+                        file_id = excluded.file_id,
+                        media_type = excluded.media_type,
+                        updated_at = CURRENT_TIMESTAMP
+                """, (path, content_hash, file_id, media_type))
+                return True
+        except Exception as e:
+            print(f"Erro ao registrar mídia: {e}")
+            return False
+    
+    async def delete_media_file(self, path: str) -> bool:
+        """Remove o file_id registrado para um arquivo de mídia"""
+        try:
+            async with self.pool.writer() as db:
+                await db.execute("DELETE FROM media_files WHERE path = ?", (path,))
+                return True
+        except Exception as e:
+            print(f"Erro ao remover mídia: {e}")
+            return False
+    
+    async def reconcile_statistics(self) -> bool:
+        """
+        Recalcula os contadores de estatísticas a partir das tabelas
+        
+        Roda sob o lock de escrita para que nenhuma escrita concorrente
+        seja contada duas vezes ou perdida durante a recontagem.
+        """
+        try:
+            async with self.pool.writer() as db:
+                cursor = await db.execute(RECONCILE_QUERY)
+                row = await cursor.fetchone()
+                self.stats.load(dict(row))
+                return True
+        except Exception as e:
+            print(f"Erro ao reconciliar estatísticas: {e}")
+            return False
+    
+    async def get_statistics(self) -> Dict:
+        """Busca estatísticas gerais do sistema (contadores em memória)"""
+        try:
+            if not self.stats.loaded and not await self.reconcile_statistics():
+                return {}
+            
+            return self.stats.snapshot()
         except Exception as e:
             print(f"Erro ao buscar estatísticas: {e}")
             return {}
@@ -0,0 +1,130 @@
+"""
+Pool de conexões persistentes do SQLite para o Imperium™ Bot
+Mantém uma conexão de escrita e N conexões de leitura abertas durante toda a execução
+"""
+
+import aiosqlite
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
+
+from config.settings import (
+    DB_READER_CONNECTIONS, DB_BUSY_TIMEOUT, DB_STATEMENT_CACHE_SIZE,
+    DB_SYNCHRONOUS, DB_CACHE_SIZE_KB, DB_MMAP_SIZE
+)
+
+class ConnectionPool:
+    """Pool com um escritor serializado e leitores concorrentes"""
+
+    def __init__(self, db_path: str, readers: int = DB_READER_CONNECTIONS):
+        self.db_path = db_path
+        self.readers = max(1, readers)
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._open_lock: Optional[asyncio.Lock] = None
+        self._reader_queue: Optional[asyncio.Queue] = None
+        self._reader_connections: List[aiosqlite.Connection] = []
+
+    @property
+    def is_open(self) -> bool:
+        """Indica se as conexões do pool já foram abertas"""
+        return self._writer is not None
+
+    async def _connect(self) -> aiosqlite.Connection:
+        """
+        Abre uma conexão configurada para uso no pool
+
+        Returns:
+            Conexão aiosqlite com cache de statements preparados
+        """
+        db = await aiosqlite.connect(
+            self.db_path,
+            timeout=DB_BUSY_TIMEOUT,
+            cached_statements=DB_STATEMENT_CACHE_SIZE
+        )
+        db.row_factory = aiosqlite.Row
+
+        # Pragmas por conexão (valores vêm de config/settings.py)
+        await db.execute(f"PRAGMA synchronous = {DB_SYNCHRONOUS}")
+        await db.execute(f"PRAGMA cache_size = -{int(DB_CACHE_SIZE_KB)}")
+        await db.execute(f"PRAGMA mmap_size = {int(DB_MMAP_SIZE)}")
+        await db.execute("PRAGMA temp_store = MEMORY")
+        return db
+
+    async def open(self):
+        """Abre a conexão de escrita e as conexões de leitura"""
+        if self._open_lock is None:
+            self._open_lock = asyncio.Lock()
+
+        async with self._open_lock:
+            if self.is_open:
+                return
+
+            self._write_lock = asyncio.Lock()
+            self._reader_queue = asyncio.Queue()
+
+            self._writer = await self._connect()
+            # WAL é persistente no arquivo: leitores não bloqueiam o escritor
+            # (o resultado precisa ser lido: o statement aberto manteria o lock do arquivo)
+            async with self._writer.execute("PRAGMA journal_mode = WAL") as cursor:
+                await cursor.fetchone()
+
+            for _ in range(self.readers):
+                connection = await self._connect()
+                self._reader_connections.append(connection)
+                self._reader_queue.put_nowait(connection)
+
+    @asynccontextmanager
+    async def reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Empresta uma conexão de leitura do pool
+
+        Yields:
+            Conexão de leitura (devolvida ao pool na saída)
+        """
+        if not self.is_open:
+            await self.open()
+
+        db = await self._reader_queue.get()
+        try:
+            yield db
+        finally:
+            self._reader_queue.put_nowait(db)
+
+    @asynccontextmanager
+    async def writer(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Obtém acesso exclusivo à conexão de escrita
+
+        Faz commit ao sair do bloco e rollback se ocorrer exceção.
+
+        Yields:
+            Conexão de escrita
+        """
+        if not self.is_open:
+            await self.open()
+
+        async with self._write_lock:
+            try:
+                yield self._writer
+                await self._writer.commit()
+            except BaseException:
+                await self._writer.rollback()
+                raise
+
+    async def close(self):
+        """Fecha todas as conexões do pool"""
+        if not self.is_open:
+            return
+
+        async with self._write_lock:
+            for connection in self._reader_connections:
+                await connection.close()
+
+            # Atualiza estatísticas do planejador antes de fechar
+            await self._writer.execute("PRAGMA optimize")
+            await self._writer.close()
+
+            self._reader_connections = []
+            self._writer = None
+            self._reader_queue = None
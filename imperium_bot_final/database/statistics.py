@@ -0,0 +1,116 @@
+"""
+Contadores incrementais de estatísticas do Imperium™ Bot
+Mantém os números do painel em memória e os reconcilia periodicamente com o banco
+"""
+
+from datetime import datetime, date
+from typing import Dict, Optional
+
+# Consulta única de reconciliação. Os filtros de "hoje" usam comparação de
+# intervalo (>= DATE('now')) para aproveitar os índices, e os dias seguem o
+# relógio UTC do SQLite, igual a CURRENT_TIMESTAMP.
+RECONCILE_QUERY = """
+    SELECT
+        (SELECT COUNT(*) FROM users) AS total_users,
+        (SELECT COUNT(*) FROM users
+         WHERE registration_date >= DATE('now')) AS users_today,
+        (SELECT COUNT(*) FROM subscriptions
+         WHERE is_active = 1 AND end_date > CURRENT_TIMESTAMP) AS active_subscriptions,
+        (SELECT COALESCE(SUM(plan_price), 0) FROM subscriptions) AS total_revenue,
+        (SELECT COALESCE(SUM(plan_price), 0) FROM subscriptions
+         WHERE start_date >= DATE('now')) AS revenue_today,
+        (SELECT COUNT(*) FROM withdrawal_requests
+         WHERE status = 'pending') AS pending_withdrawals,
+        DATE('now') AS today
+"""
+
+class StatisticsCounters:
+    """Contadores do painel atualizados a cada escrita"""
+
+    def __init__(self):
+        self.loaded = False
+        self.last_reconciled: Optional[datetime] = None
+        self._day: Optional[date] = None
+        self.total_users = 0
+        self.users_today = 0
+        self.active_subscriptions = 0
+        self.total_revenue = 0.0
+        self.revenue_today = 0.0
+        self.pending_withdrawals = 0
+
+    def _roll_day(self):
+        """Zera os contadores diários quando o dia (UTC) muda"""
+        today = datetime.utcnow().date()
+        if today != self._day:
+            self._day = today
+            self.users_today = 0
+            self.revenue_today = 0.0
+
+    def load(self, row: Dict):
+        """
+        Substitui os contadores pelos valores calculados no banco
+
+        Args:
+            row: Resultado de RECONCILE_QUERY
+        """
+        self.total_users = row['total_users']
+        self.users_today = row['users_today']
+        self.active_subscriptions = row['active_subscriptions']
+        self.total_revenue = row['total_revenue']
+        self.revenue_today = row['revenue_today']
+        self.pending_withdrawals = row['pending_withdrawals']
+        self._day = date.fromisoformat(row['today'])
+        self.last_reconciled = datetime.now()
+        self.loaded = True
+
+    def user_added(self):
+        """Registra um novo usuário"""
+        self._roll_day()
+        self.total_users += 1
+        self.users_today += 1
+
+    def subscription_created(self, plan_price: float):
+        """
+        Registra uma nova assinatura
+
+        Args:
+            plan_price: Valor pago pelo plano
+        """
+        self._roll_day()
+        self.active_subscriptions += 1
+        self.total_revenue += plan_price
+        self.revenue_today += plan_price
+
+    def subscriptions_expired(self, count: int):
+        """
+        Registra assinaturas desativadas por vencimento
+
+        Args:
+            count: Quantidade de assinaturas desativadas
+        """
+        self.active_subscriptions = max(0, self.active_subscriptions - count)
+
+    def withdrawal_requested(self):
+        """Registra uma nova solicitação de saque pendente"""
+        self.pending_withdrawals += 1
+
+    def withdrawal_processed(self):
+        """Registra a saída de um saque da fila de pendentes"""
+        self.pending_withdrawals = max(0, self.pending_withdrawals - 1)
+
+    def snapshot(self) -> Dict:
+        """
+        Retorna os contadores no formato de get_statistics
+
+        Returns:
+            Dict com as estatísticas atuais
+        """
+        self._roll_day()
+        return {
+            'total_users': self.total_users,
+            'users_today': self.users_today,
+            'active_subscriptions': self.active_subscriptions,
+            'total_revenue': self.total_revenue,
+            'revenue_today': self.revenue_today,
+            'pending_withdrawals': self.pending_withdrawals
+        }
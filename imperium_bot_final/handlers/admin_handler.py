@@ -0,0 +1,204 @@
+"""
+Handler da central de notificações do painel administrativo do Imperium™ Bot
+Cria, acompanha e interrompe transmissões para usuários e afiliados
+"""
+
+from aiogram import Router, F
+from aiogram.fsm.context import FSMContext
+from aiogram.types import CallbackQuery, Message
+
+from admin_panel.broadcast import (
+    broadcast_engine, AUDIENCE_ALL, AUDIENCE_AFFILIATES, AUDIENCE_NAMES
+)
+from config.settings import ADMIN_IDS, BROADCAST_MAX_LENGTH
+from keyboards.inline_keyboards import (
+    get_notification_keyboard, get_confirmation_keyboard, get_back_button_keyboard,
+    get_broadcast_progress_keyboard
+)
+from states.user_states import AdminStates
+from utils.logger import logger
+
+router = Router()
+
+# Botão da central de notificações -> público da transmissão
+AUDIENCE_CALLBACKS = {
+    "send_general_notice": AUDIENCE_ALL,
+    "notify_affiliates": AUDIENCE_AFFILIATES,
+}
+
+def format_broadcast_progress(progress: dict) -> str:
+    """
+    Formata o progresso de uma transmissão
+
+    Args:
+        progress: Retorno de broadcast_engine.get_progress
+
+    Returns:
+        Mensagem formatada
+    """
+    status = {
+        "running": "📤 Enviando",
+        "done": "✅ Concluída",
+        "cancelled": "⛔ Interrompida"
+    }.get(progress['status'], progress['status'])
+
+    return f"""
+📢 <b>TRANSMISSÃO #{progress['id']}</b>
+
+👥 Público: {AUDIENCE_NAMES.get(progress['audience'], progress['audience'])}
+📌 Status: {status}
+
+✅ Enviadas: <b>{progress['sent']}</b>
+🚫 Bloquearam o bot: <b>{progress['blocked']}</b>
+❌ Falhas: <b>{progress['failed']}</b>
+
+⚡ Vazão: <b>{progress['throughput']}</b> mensagens/s ({progress['elapsed']:.0f}s)
+"""
+
+@router.callback_query(F.data == "admin_notifications")
+async def notification_center(callback: CallbackQuery, state: FSMContext):
+    """Abre a central de notificações"""
+    try:
+        if callback.from_user.id not in ADMIN_IDS:
+            await callback.answer("❌ Acesso negado.")
+            return
+
+        await state.set_state(AdminStates.NOTIFICATION_CENTER)
+        await callback.message.edit_text(
+            "📢 <b>CENTRAL DE NOTIFICAÇÕES</b>\n\nEscolha o público da transmissão:",
+            reply_markup=get_notification_keyboard(),
+            parse_mode="HTML"
+        )
+        await callback.answer()
+    except Exception as e:
+        logger.error(f"Erro ao abrir central de notificações: {e}")
+        await callback.answer("❌ Erro ao abrir notificações.")
+
+@router.callback_query(F.data.in_(AUDIENCE_CALLBACKS))
+async def choose_audience(callback: CallbackQuery, state: FSMContext):
+    """Pede o texto da transmissão para o público escolhido"""
+    try:
+        if callback.from_user.id not in ADMIN_IDS:
+            await callback.answer("❌ Acesso negado.")
+            return
+
+        audience = AUDIENCE_CALLBACKS[callback.data]
+        await state.set_state(AdminStates.SENDING_BROADCAST)
+        await state.update_data(broadcast_audience=audience, broadcast_text=None)
+
+        await callback.message.edit_text(
+            f"✍️ Envie a mensagem para <b>{AUDIENCE_NAMES[audience]}</b>.\n\n"
+            f"A formatação (negrito, links...) é mantida.",
+            reply_markup=get_back_button_keyboard("admin_notifications"),
+            parse_mode="HTML"
+        )
+        await callback.answer()
+    except Exception as e:
+        logger.error(f"Erro ao iniciar transmissão: {e}")
+        await callback.answer("❌ Erro ao iniciar transmissão.")
+
+@router.message(AdminStates.SENDING_BROADCAST, F.text)
+async def receive_broadcast_text(message: Message, state: FSMContext):
+    """Mostra a prévia da transmissão e pede confirmação"""
+    try:
+        if message.from_user.id not in ADMIN_IDS:
+            return
+
+        text = message.html_text
+        if len(text) > BROADCAST_MAX_LENGTH:
+            await message.answer(
+                f"❌ Mensagem muito longa ({len(text)} caracteres, máximo {BROADCAST_MAX_LENGTH})."
+            )
+            return
+
+        data = await state.update_data(broadcast_text=text)
+        audience = data.get('broadcast_audience', AUDIENCE_ALL)
+
+        await message.answer(
+            f"👀 <b>PRÉVIA</b> (para {AUDIENCE_NAMES[audience]})\n\n{text}",
+            reply_markup=get_confirmation_keyboard("broadcast_confirm", "admin_notifications"),
+            parse_mode="HTML"
+        )
+    except Exception as e:
+        logger.error(f"Erro ao receber texto da transmissão: {e}")
+        await message.answer("❌ Erro ao preparar transmissão.")
+
+@router.callback_query(AdminStates.SENDING_BROADCAST, F.data == "broadcast_confirm")
+async def confirm_broadcast(callback: CallbackQuery, state: FSMContext):
+    """Inicia a transmissão confirmada"""
+    try:
+        user_id = callback.from_user.id
+        if user_id not in ADMIN_IDS:
+            await callback.answer("❌ Acesso negado.")
+            return
+
+        data = await state.get_data()
+        text = data.get('broadcast_text')
+        if not text:
+            await callback.answer("❌ Envie a mensagem antes de confirmar.")
+            return
+
+        broadcast_id = await broadcast_engine.start(data['broadcast_audience'], text, user_id)
+        if not broadcast_id:
+            await callback.answer("❌ Erro ao criar transmissão.")
+            return
+
+        await state.set_state(AdminStates.NOTIFICATION_CENTER)
+        await state.update_data(broadcast_audience=None, broadcast_text=None)
+
+        await callback.message.edit_text(
+            format_broadcast_progress(broadcast_engine.get_progress(broadcast_id)),
+            reply_markup=get_broadcast_progress_keyboard(broadcast_id),
+            parse_mode="HTML"
+        )
+        await callback.answer("📤 Transmissão iniciada!")
+        await logger.log_admin_action(
+            user_id, "TRANSMISSAO_INICIADA", f"#{broadcast_id} para {data['broadcast_audience']}"
+        )
+    except Exception as e:
+        logger.error(f"Erro ao confirmar transmissão: {e}")
+        await callback.answer("❌ Erro ao iniciar transmissão.")
+
+@router.callback_query(F.data.startswith("broadcast_status:"))
+async def broadcast_status(callback: CallbackQuery):
+    """Atualiza o progresso de uma transmissão"""
+    try:
+        if callback.from_user.id not in ADMIN_IDS:
+            await callback.answer("❌ Acesso negado.")
+            return
+
+        broadcast_id = int(callback.data.split(":")[1])
+        progress = broadcast_engine.get_progress(broadcast_id)
+        if not progress:
+            await callback.answer("ℹ️ Transmissão não está em andamento nesta execução.")
+            return
+
+        await callback.message.edit_text(
+            format_broadcast_progress(progress),
+            reply_markup=get_broadcast_progress_keyboard(broadcast_id),
+            parse_mode="HTML"
+        )
+        await callback.answer()
+    except Exception as e:
+        # "message is not modified" quando nada mudou desde a última atualização
+        logger.debug(f"Progresso da transmissão não atualizado: {e}")
+        await callback.answer()
+
+@router.callback_query(F.data.startswith("broadcast_cancel:"))
+async def cancel_broadcast(callback: CallbackQuery):
+    """Interrompe uma transmissão em andamento"""
+    try:
+        user_id = callback.from_user.id
+        if user_id not in ADMIN_IDS:
+            await callback.answer("❌ Acesso negado.")
+            return
+
+        broadcast_id = int(callback.data.split(":")[1])
+        if broadcast_engine.cancel(broadcast_id):
+            await callback.answer("⛔ Transmissão interrompida.")
+            await logger.log_admin_action(user_id, "TRANSMISSAO_INTERROMPIDA", f"#{broadcast_id}")
+        else:
+            await callback.answer("ℹ️ Transmissão já encerrada.")
+    except Exception as e:
+        logger.error(f"Erro ao interromper transmissão: {e}")
+        await callback.answer("❌ Erro ao interromper transmissão.")
@@ -14,14 +14,17 @@ from keyboards.inline_keyboards import (
     get_payment_keyboard, get_cancel_keyboard, get_main_menu_keyboard
 )
 from config.settings import (
-    PLANS, BUY_MESSAGE, PAYMENT_INSTRUCTIONS, SUCCESS_MESSAGE,
+    PLANS, BUY_MESSAGE, PAYMENT_INSTRUCTIONS,
     PAYMENT_PENDING_MESSAGE, PAYMENT_EXPIRED_MESSAGE, ERROR_MESSAGES,
-    VIP_GROUP_LINK, SUPPORT_CONTACT, COMMISSION_RATE, format_currency
+    format_currency
 )
-from utils.helpers import validate_phone, format_date_br, calculate_commission
+from config.runtime_config import runtime_config
+from utils.helpers import validate_phone, format_date_br
 from utils.logger import logger
 from payments.mercado_pago import mp_payment
 from payments.qr_generator import qr_generator
+from payments.qr_render import plan_card
+from payments.approval import approve_payment, format_success_message
 
 router = Router()
 
@@ -202,7 +205,7 @@ async def generate_payment(message: Message, state: FSMContext):
         plan = PLANS[plan_key]
         
         # Criar pagamento no Mercado Pago
-        payment_data = mp_payment.create_pix_payment(
+        payment_data = await mp_payment.create_pix_payment(
             user_id=user_id,
             user_phone=phone,
             amount=plan['price'],
@@ -224,17 +227,22 @@ async def generate_payment(message: Message, state: FSMContext):
             amount=plan['price'],
             plan_name=plan['name'],
             qr_code_data=payment_data['qr_code_data'],
-            qr_code_base64=payment_data.get('qr_code_base64', '')
+            qr_code_base64=payment_data.get('qr_code_base64', ''),
+            expiration_hours=runtime_config.payment_expiration_hours
         )
         
-        # Gerar QR Code com informações
-        qr_image_bytes = qr_generator.generate_qr_with_info(
-            payment_data['qr_code_data'],
-            plan['price'],
-            f"Imperium™ - {plan['name']}"
+        # Gerar QR Code com informações (fora do event loop)
+        description, amount = plan_card(plan)
+        qr_image_bytes = await qr_generator.render_qr_with_info(
+            payment_data['qr_code_data'], amount, description
         )
         
         # Mensagem de pagamento
+        expiration_hours = runtime_config.payment_expiration_hours
+        instructions = PAYMENT_INSTRUCTIONS.format(
+            support_contact=runtime_config.support_contact,
+            expiration_hours=expiration_hours
+        )
         payment_message = f"""
 💳 <b>PAGAMENTO PIX GERADO</b>
 
@@ -242,12 +250,12 @@ async def generate_payment(message: Message, state: FSMContext):
 💰 <b>Valor:</b> {format_currency(plan['price'])}
 🆔 <b>ID:</b> <code>{payment_data['id']}</code>
 
-{PAYMENT_INSTRUCTIONS.format(support_contact=SUPPORT_CONTACT)}
+{instructions}
 
 📋 <b>Código Pix (Copia e Cola):</b>
 <code>{payment_data['qr_code_data']}</code>
 
-⏰ <b>Este Pix expira em 24 horas!</b>
+⏰ <b>Este Pix expira em {expiration_hours} horas!</b>
 """
         
         await state.set_state(PaymentStates.WAITING_PAYMENT)
@@ -289,14 +297,15 @@ async def check_payment(callback: CallbackQuery, state: FSMContext):
         payment_id = callback.data.split(":")[1]
         
         # Verificar status no Mercado Pago
-        payment_info = mp_payment.get_payment_info(payment_id)
+        payment_info = await mp_payment.get_payment_info(payment_id)
         
         if not payment_info:
             await callback.answer("❌ Erro ao verificar pagamento.")
             return
         
-        # Atualizar status no banco
-        await db_manager.update_payment_status(payment_id, payment_info['status'])
+        # Aprovação grava o status junto com a assinatura (approve_payment)
+        if not payment_info['is_approved']:
+            await db_manager.update_payment_status(payment_id, payment_info['status'])
         
         if payment_info['is_approved']:
             await process_approved_payment(callback, state, payment_id)
@@ -320,49 +329,14 @@ async def process_approved_payment(callback: CallbackQuery, state: FSMContext, p
         state_data = await state.get_data()
         plan_key = state_data.get('selected_plan')
         
-        if not plan_key or plan_key not in PLANS:
-            await callback.answer("❌ Erro: dados do plano não encontrados.")
-            return
-        
-        plan = PLANS[plan_key]
+        # Assinatura e comissão (não duplica se o webhook já liberou o acesso)
+        result = await approve_payment(payment_id, user_id=user_id, plan_key=plan_key)
         
-        # Criar assinatura
-        subscription_id = await db_manager.create_subscription(
-            user_id=user_id,
-            plan_name=plan['name'],
-            plan_price=plan['price'],
-            duration_days=plan['duration_days'],
-            payment_id=payment_id
-        )
-        
-        if not subscription_id:
+        if not result:
             await callback.answer("❌ Erro ao criar assinatura.")
             return
         
-        # Processar comissão de afiliado se houver
-        user_data = await db_manager.get_user(user_id)
-        if user_data and user_data.get('referrer_id'):
-            commission = calculate_commission(plan['price'], COMMISSION_RATE)
-            await db_manager.create_affiliate_sale(
-                affiliate_id=user_data['referrer_id'],
-                referred_user_id=user_id,
-                subscription_id=subscription_id,
-                commission_amount=commission
-            )
-            
-            await logger.log_affiliate_event(
-                user_data['referrer_id'], user_id, "NOVA_VENDA", commission
-            )
-        
-        # Calcular data de vencimento
-        from datetime import datetime, timedelta
-        end_date = datetime.now() + timedelta(days=plan['duration_days'])
-        
-        success_msg = SUCCESS_MESSAGE.format(
-            vip_group_link=VIP_GROUP_LINK,
-            end_date=format_date_br(end_date),
-            support_contact=SUPPORT_CONTACT
-        )
+        success_msg = format_success_message(result['end_date'])
         
         await state.set_state(UserStates.PAYMENT_CONFIRMED)
         
@@ -373,7 +347,6 @@ async def process_approved_payment(callback: CallbackQuery, state: FSMContext, p
         )
         
         await callback.answer("🎉 Pagamento aprovado!")
-        await logger.log_payment_event(user_id, payment_id, "APROVADO", plan['price'])
         
     except Exception as e:
         logger.error(f"Erro ao processar pagamento aprovado: {e}")
@@ -384,7 +357,7 @@ async def process_pending_payment(callback: CallbackQuery, payment_info: dict):
     try:
         pending_msg = PAYMENT_PENDING_MESSAGE.format(
             time_remaining=payment_info['time_remaining'],
-            support_contact=SUPPORT_CONTACT
+            support_contact=runtime_config.support_contact
         )
         
         await callback.message.edit_text(
@@ -403,7 +376,7 @@ async def process_expired_payment(callback: CallbackQuery, state: FSMContext, pa
     """Processa pagamento expirado"""
     try:
         expired_msg = PAYMENT_EXPIRED_MESSAGE.format(
-            support_contact=SUPPORT_CONTACT
+            support_contact=runtime_config.support_contact
         )
         
         await state.set_state(UserStates.MAIN_MENU)
@@ -4,20 +4,22 @@ Gerencia entrada de usuários, referências e menu principal
 """
 
 from aiogram import Router, F
-from aiogram.types import Message, CallbackQuery, FSInputFile
+from aiogram.types import Message, CallbackQuery
 from aiogram.filters import Command, CommandStart
 from aiogram.fsm.context import FSMContext
 from typing import Optional
 
 from database.models import db_manager
 from states.user_states import UserStates
-from keyboards.inline_keyboards import get_main_menu_keyboard, get_admin_menu_keyboard
-from config.settings import (
-    WELCOME_MESSAGE, ADMIN_IDS, VIP_GROUP_LINK, 
-    SUPPORT_CONTACT, format_date_br
+from keyboards.inline_keyboards import (
+    get_main_menu_keyboard, get_admin_main_menu_keyboard, get_admin_menu_keyboard
 )
-from utils.helpers import extract_referrer_from_start, get_user_display_name
+from config.settings import ADMIN_IDS
+from config.runtime_config import runtime_config
+from utils.helpers import extract_referrer_from_start, get_user_display_name, format_date_br
+from utils.templates import render_welcome_message
 from utils.logger import logger
+from utils.media_cache import media_cache
 import os
 
 router = Router()
@@ -78,6 +80,9 @@ async def start_command(message: Message, state: FSMContext, command: CommandSta
                 await logger.log_system_event("ERRO", f"Falha ao adicionar usuário {user_id}")
         else:
             await logger.log_user_action(user_id, "RETORNO", "Usuário retornando")
+            # Voltou a falar com o bot: entra de novo nas transmissões
+            if existing_user.get('blocked_at'):
+                await db_manager.clear_user_blocked(user_id)
         
         # Definir estado inicial
         await state.set_state(UserStates.MAIN_MENU)
@@ -89,13 +94,13 @@ async def start_command(message: Message, state: FSMContext, command: CommandSta
         banner_path = "assets/imperium_banner.jpg"
         if os.path.exists(banner_path):
             try:
-                photo = FSInputFile(banner_path)
-                await message.answer_photo(
+                # Upload só no primeiro envio; depois reutiliza o file_id registrado
+                await media_cache.send(banner_path, lambda photo: message.answer_photo(
                     photo=photo,
                     caption=format_welcome_message(message.from_user, subscription),
                     reply_markup=get_appropriate_keyboard(user_id),
                     parse_mode="HTML"
-                )
+                ))
             except Exception as e:
                 logger.error(f"Erro ao enviar banner: {e}")
                 # Fallback sem imagem
@@ -252,9 +257,9 @@ async def status_command(message: Message):
 🤖 <b>Status:</b> Acesso liberado a todas as IAs
 
 🔗 <b>Acesso ao grupo VIP:</b>
-{VIP_GROUP_LINK}
+{runtime_config.vip_group_link}
 
-🆘 <b>Suporte:</b> {SUPPORT_CONTACT}
+🆘 <b>Suporte:</b> {runtime_config.support_contact}
 """
         else:
             status_msg = f"""
@@ -265,7 +270,7 @@ async def status_command(message: Message):
 🛒 Para adquirir o Imperium™, use: /start
 👥 Para se tornar afiliado, use: /start
 
-🆘 <b>Precisa de ajuda?</b> {SUPPORT_CONTACT}
+🆘 <b>Precisa de ajuda?</b> {runtime_config.support_contact}
 """
         
         await message.answer(status_msg, parse_mode="HTML")
@@ -286,31 +291,7 @@ def format_welcome_message(user, subscription: Optional[dict]) -> str:
     Returns:
         Mensagem formatada
     """
-    from utils.helpers import get_greeting
-    
-    greeting = get_greeting()
-    name = get_user_display_name(user.__dict__)
-    
-    # Formatar mensagem com o nome da pessoa
-    base_message = f"{greeting}!\n\n{WELCOME_MESSAGE.format(name=name)}"
-    
-    if subscription:
-        end_date = subscription['end_date']
-        if isinstance(end_date, str):
-            from datetime import datetime
-            end_date = datetime.fromisoformat(end_date)
-        
-        base_message += f"""
-
-✅ <b>SUA ASSINATURA ESTÁ ATIVA!</b>
-💎 Plano: {subscription['plan_name']}
-📅 Válida até: {format_date_br(end_date)}
-
-🤖 <b>Acesso liberado ao grupo VIP:</b>
-{VIP_GROUP_LINK}
-"""
-    
-    return base_message
+    return render_welcome_message(user, subscription)
 
 def get_appropriate_keyboard(user_id: int):
     """
@@ -320,53 +301,11 @@ def get_appropriate_keyboard(user_id: int):
         user_id: ID do usuário
     
     Returns:
-        Teclado apropriado
+        Teclado apropriado (montado uma única vez)
     """
     if user_id in ADMIN_IDS:
-        # Adicionar botão de admin para administradores
-        from keyboards.inline_keyboards import InlineKeyboardBuilder, InlineKeyboardButton
-        from config.settings import EMOJIS
-        
-        builder = InlineKeyboardBuilder()
-        
-        # Botões normais do menu principal
-        builder.row(
-            InlineKeyboardButton(
-                text=f"{EMOJIS['cart']} QUERO ADQUIRIR O IMPERIUM™",
-                callback_data="buy_plans"
-            )
-        )
-        
-        builder.row(
-            InlineKeyboardButton(
-                text=f"{EMOJIS['users']} SISTEMA DE AFILIADOS",
-                callback_data="affiliate_menu"
-            )
-        )
-        
-        # Botão administrativo
-        builder.row(
-            InlineKeyboardButton(
-                text=f"{EMOJIS['gear']} PAINEL ADMINISTRATIVO",
-                callback_data="admin_menu"
-            )
-        )
-        
-        # Suporte e canal
-        builder.row(
-            InlineKeyboardButton(
-                text=f"{EMOJIS['info']} SUPORTE",
-                url="https://t.me/seu_suporte"
-            ),
-            InlineKeyboardButton(
-                text=f"{EMOJIS['rocket']} CANAL",
-                url="https://t.me/seu_canal"
-            )
-        )
-        
-        return builder.as_markup()
-    else:
-        return get_main_menu_keyboard()
+        return get_admin_main_menu_keyboard()
+    return get_main_menu_keyboard()
 
 async def send_text_welcome(message: Message, subscription: Optional[dict], user_id: int):
     """
@@ -415,7 +354,7 @@ async def help_command(message: Message):
 3. Gere seu link de afiliado
 4. Compartilhe e ganhe 20% de comissão
 
-🆘 <b>Suporte:</b> {SUPPORT_CONTACT}
+🆘 <b>Suporte:</b> {runtime_config.support_contact}
 📢 <b>Canal:</b> https://t.me/seu_canal
 """
     
@@ -222,7 +222,7 @@ import sys
 try:
     import aiogram
     import aiosqlite
-    import mercadopago
+    import aiohttp
     import qrcode
     import PIL
     print('✅ Todas as dependências foram importadas com sucesso!')
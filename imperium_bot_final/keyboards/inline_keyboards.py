@@ -3,20 +3,61 @@ Teclados inline para o Imperium™ Bot
 Define todos os botões e menus utilizados na interface
 """
 
+import functools
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.utils.keyboard import InlineKeyboardBuilder
-from typing import List, Dict, Optional
+from typing import Callable, Iterable, List, Dict, Optional, Tuple
 from config.settings import PLANS, format_currency, EMOJIS
 
-def get_main_menu_keyboard() -> InlineKeyboardMarkup:
+# Teclados estáticos registrados: nome -> (função que monta, variações de argumentos)
+_static_keyboards: Dict[str, Tuple[Callable[..., InlineKeyboardMarkup], Callable[[], Iterable[tuple]]]] = {}
+
+# Teclados já montados: (nome, *argumentos) -> markup
+_markup_cache: Dict[tuple, InlineKeyboardMarkup] = {}
+
+def static_keyboard(variants: Callable[[], Iterable[tuple]] = lambda: [()]):
     """
-    Retorna teclado do menu principal
+    Registra um teclado que só depende dos argumentos e das configurações
+    
+    O markup é montado uma vez e o mesmo objeto é devolvido nas chamadas
+    seguintes (quem recebe não deve alterá-lo). Depois de mudar configurações
+    que aparecem nos botões, chame rebuild_static_keyboards().
+    
+    Args:
+        variants: Função que lista os argumentos a pré-montar (ex: cada plano)
+    """
+    def decorator(build: Callable[..., InlineKeyboardMarkup]):
+        _static_keyboards[build.__name__] = (build, variants)
+        
+        @functools.wraps(build)
+        def cached(*args) -> InlineKeyboardMarkup:
+            key = (build.__name__, *args)
+            markup = _markup_cache.get(key)
+            if markup is None:
+                markup = _markup_cache[key] = build(*args)
+            return markup
+        
+        return cached
+    return decorator
+
+def rebuild_static_keyboards() -> int:
+    """
+    Descarta e monta novamente todos os teclados estáticos
     
     Returns:
-        Teclado inline do menu principal
+        Quantidade de teclados montados
     """
-    builder = InlineKeyboardBuilder()
+    rebuilt = {}
+    for name, (build, variants) in _static_keyboards.items():
+        for args in variants():
+            rebuilt[(name, *args)] = build(*args)
     
+    _markup_cache.clear()
+    _markup_cache.update(rebuilt)
+    return len(rebuilt)
+
+def _add_main_menu_rows(builder: InlineKeyboardBuilder, admin: bool):
+    """Adiciona as linhas do menu principal (com o painel para administradores)"""
     # Primeira linha - Comprar
     builder.row(
         InlineKeyboardButton(
@@ -33,7 +74,16 @@ def get_main_menu_keyboard() -> InlineKeyboardMarkup:
         )
     )
     
-    # Terceira linha - Suporte e canal
+    # Botão administrativo
+    if admin:
+        builder.row(
+            InlineKeyboardButton(
+                text=f"{EMOJIS['gear']} PAINEL ADMINISTRATIVO",
+                callback_data="admin_menu"
+            )
+        )
+    
+    # Última linha - Suporte e canal
     builder.row(
         InlineKeyboardButton(
             text=f"{EMOJIS['info']} SUPORTE",
@@ -44,9 +94,32 @@ def get_main_menu_keyboard() -> InlineKeyboardMarkup:
             url="https://t.me/seu_canal"
         )
     )
+
+@static_keyboard()
+def get_main_menu_keyboard() -> InlineKeyboardMarkup:
+    """
+    Retorna teclado do menu principal
+    
+    Returns:
+        Teclado inline do menu principal
+    """
+    builder = InlineKeyboardBuilder()
+    _add_main_menu_rows(builder, admin=False)
+    return builder.as_markup()
+
+@static_keyboard()
+def get_admin_main_menu_keyboard() -> InlineKeyboardMarkup:
+    """
+    Retorna teclado do menu principal com o botão do painel administrativo
     
+    Returns:
+        Teclado inline do menu principal para administradores
+    """
+    builder = InlineKeyboardBuilder()
+    _add_main_menu_rows(builder, admin=True)
     return builder.as_markup()
 
+@static_keyboard()
 def get_plans_keyboard() -> InlineKeyboardMarkup:
     """
     Retorna teclado com planos disponíveis
@@ -76,6 +149,7 @@ def get_plans_keyboard() -> InlineKeyboardMarkup:
     
     return builder.as_markup()
 
+@static_keyboard(variants=lambda: [(plan_key,) for plan_key in PLANS])
 def get_plan_confirmation_keyboard(plan_key: str) -> InlineKeyboardMarkup:
     """
     Retorna teclado de confirmação do plano
@@ -136,6 +210,7 @@ def get_payment_keyboard(payment_id: str) -> InlineKeyboardMarkup:
     
     return builder.as_markup()
 
+@static_keyboard()
 def get_affiliate_menu_keyboard() -> InlineKeyboardMarkup:
     """
     Retorna teclado do menu de afiliados
@@ -187,6 +262,7 @@ def get_affiliate_menu_keyboard() -> InlineKeyboardMarkup:
     
     return builder.as_markup()
 
+@static_keyboard()
 def get_affiliate_dashboard_keyboard() -> InlineKeyboardMarkup:
     """
     Retorna teclado do dashboard de afiliados
@@ -244,6 +320,7 @@ def get_withdrawal_confirmation_keyboard(amount: float) -> InlineKeyboardMarkup:
     
     return builder.as_markup()
 
+@static_keyboard()
 def get_admin_menu_keyboard() -> InlineKeyboardMarkup:
     """
     Retorna teclado do menu administrativo
@@ -306,6 +383,7 @@ def get_admin_menu_keyboard() -> InlineKeyboardMarkup:
     
     return builder.as_markup()
 
+@static_keyboard()
 def get_admin_dashboard_keyboard() -> InlineKeyboardMarkup:
     """
     Retorna teclado do dashboard administrativo
@@ -341,6 +419,7 @@ def get_admin_dashboard_keyboard() -> InlineKeyboardMarkup:
     
     return builder.as_markup()
 
+@static_keyboard()
 def get_admin_withdrawals_keyboard() -> InlineKeyboardMarkup:
     """
     Retorna teclado para gerenciamento de saques
@@ -414,6 +493,7 @@ def get_withdrawal_action_keyboard(withdrawal_id: int) -> InlineKeyboardMarkup:
     
     return builder.as_markup()
 
+@static_keyboard()
 def get_export_data_keyboard() -> InlineKeyboardMarkup:
     """
     Retorna teclado para exportação de dados
@@ -559,6 +639,7 @@ def get_back_button_keyboard(callback_data: str) -> InlineKeyboardMarkup:
     
     return builder.as_markup()
 
+@static_keyboard()
 def get_cancel_keyboard() -> InlineKeyboardMarkup:
     """
     Retorna teclado para cancelar operação
@@ -652,6 +733,7 @@ def create_dynamic_keyboard(buttons: List[List[Dict]], row_width: int = 2) -> In
     
     return builder.as_markup()
 
+@static_keyboard()
 def get_notification_keyboard() -> InlineKeyboardMarkup:
     """
     Retorna teclado para notificações administrativas
@@ -685,4 +767,42 @@ def get_notification_keyboard() -> InlineKeyboardMarkup:
         )
     )
     
-    return builder.as_markup()
\ No newline at end of file
+    return builder.as_markup()
+
+def get_broadcast_progress_keyboard(broadcast_id: int) -> InlineKeyboardMarkup:
+    """
+    Retorna teclado para acompanhar uma transmissão
+    
+    Args:
+        broadcast_id: ID da transmissão
+    
+    Returns:
+        Teclado de acompanhamento
+    """
+    builder = InlineKeyboardBuilder()
+    
+    # Atualizar progresso
+    builder.row(
+        InlineKeyboardButton(
+            text=f"{EMOJIS['clock']} ATUALIZAR PROGRESSO",
+            callback_data=f"broadcast_status:{broadcast_id}"
+        )
+    )
+    
+    # Interromper envio
+    builder.row(
+        InlineKeyboardButton(
+            text=f"{EMOJIS['warning']} INTERROMPER ENVIO",
+            callback_data=f"broadcast_cancel:{broadcast_id}"
+        )
+    )
+    
+    # Voltar
+    builder.row(
+        InlineKeyboardButton(
+            text=f"{EMOJIS['cross']} VOLTAR",
+            callback_data="admin_notifications"
+        )
+    )
+    
+    return builder.as_markup()
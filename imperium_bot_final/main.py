@@ -9,20 +9,34 @@ import os
 from datetime import datetime
 
 from aiogram import Bot, Dispatcher
-from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
 
-from config.settings import BOT_TOKEN, validate_config
+from config.settings import BOT_TOKEN, BOT_RUN_MODE, MP_WEBHOOK_SECRET, validate_config
+from config.runtime_config import runtime_config
 from database.models import db_manager
+from payments.mercado_pago import mp_payment
+from payments.qr_generator import qr_generator
+from payments.reconciliation import payment_reconciler
+from admin_panel.subscription_expiry import subscription_expiry
+from admin_panel.broadcast import broadcast_engine
+from payments.webhook import mp_webhook
+from utils.telegram_webhook import telegram_webhook
+from utils.web_server import web_server
 from utils.logger import logger
-from handlers import start_handler, payment_handler
+from utils.rate_limiter import telegram_rate_limiter
+from handlers import start_handler, payment_handler, admin_handler
+from keyboards.inline_keyboards import rebuild_static_keyboards
+from utils.templates import rebuild_message_templates
+from states.storage import create_fsm_storage
+from states.sweeper import state_sweeper
 from admin_panel.scheduler import scheduler
 
 async def main():
     """Função principal do bot"""
     try:
         # Validar configurações
+        await logger.start()
         logger.info("Iniciando Imperium™ Bot...")
         validate_config()
         logger.info("✅ Configurações validadas")
@@ -31,29 +45,81 @@ async def main():
         await db_manager.init_database()
         logger.info("✅ Banco de dados inicializado")
         
+        # Configurações editáveis (system_config) em memória; mensagens prontas
+        # são recompiladas só quando o link do grupo VIP muda
+        await runtime_config.load()
+        runtime_config.subscribe(
+            lambda changes: rebuild_message_templates(), keys=("vip_group_link",)
+        )
+        rebuild_message_templates()
+        logger.info("✅ Configurações do sistema carregadas")
+        
         # Configurar bot
         bot = Bot(
             token=BOT_TOKEN,
             default=DefaultBotProperties(parse_mode=ParseMode.HTML)
         )
+        # Todas as chamadas à API passam pelo limitador (filas por prioridade)
+        bot.session.middleware(telegram_rate_limiter)
         
-        # Configurar dispatcher
-        dp = Dispatcher(storage=MemoryStorage())
+        # Configurar dispatcher (estados persistem entre reinícios; o sweeper
+        # registra os prazos de TEMPORARY_STATES e CLEANUP_STATES na gravação)
+        dp = Dispatcher(storage=state_sweeper.wrap(create_fsm_storage()))
         
-        # Registrar handlers
+        # Registrar handlers (admin antes do fallback de mensagens do start_handler)
+        dp.include_router(admin_handler.router)
         dp.include_router(start_handler.router)
         dp.include_router(payment_handler.router)
         
+        # Webhook do Mercado Pago (confirmação automática de pagamentos)
+        if MP_WEBHOOK_SECRET:
+            mp_webhook.setup(web_server.app, bot, dp)
+        else:
+            logger.warning("MP_WEBHOOK_SECRET não configurado: pagamentos serão confirmados pelo botão de verificação e pela conferência periódica")
+        
+        # Conferência periódica avisa os usuários de pagamentos aprovados
+        payment_reconciler.setup(bot, dp)
+        
+        # Avisos de vencimento e remoção do grupo VIP
+        subscription_expiry.setup(bot)
+        
+        # Transmissões administrativas
+        broadcast_engine.setup(bot)
+        
+        # Atualizações do Telegram via webhook (atrás de proxy reverso)
+        if BOT_RUN_MODE == "webhook":
+            telegram_webhook.setup(web_server.app, bot, dp)
+        
+        if web_server.has_routes:
+            await web_server.start()
+            logger.info("✅ Servidor de webhooks iniciado")
+        
+        # Teclados fixos montados uma vez (reaproveitados em todos os envios)
+        logger.info(f"✅ {rebuild_static_keyboards()} teclados pré-montados")
+        
+        # Fontes e textos dos cartões de pagamento prontos antes do primeiro Pix
+        await qr_generator.warm_up()
+        
         # Iniciar scheduler
         scheduler.start()
+        
+        # Retomar transmissões interrompidas pelo último desligamento
+        if await broadcast_engine.resume():
+            logger.info("✅ Transmissões pendentes retomadas")
         logger.info("✅ Scheduler iniciado")
         
         # Log de startup
         await logger.log_system_event("STARTUP", "Bot iniciado com sucesso")
         
-        # Iniciar polling
-        logger.info("🚀 Bot iniciado! Pressione Ctrl+C para parar.")
-        await dp.start_polling(bot)
+        if BOT_RUN_MODE == "webhook":
+            await telegram_webhook.start(bot, dp)
+            logger.info("🚀 Bot iniciado em modo webhook! Pressione Ctrl+C para parar.")
+            await telegram_webhook.wait_for_stop()
+        else:
+            # Polling não funciona com webhook ativo no Telegram
+            await bot.delete_webhook()
+            logger.info("🚀 Bot iniciado! Pressione Ctrl+C para parar.")
+            await dp.start_polling(bot)
         
     except KeyboardInterrupt:
         logger.info("🛑 Bot interrompido pelo usuário")
@@ -65,8 +131,17 @@ async def main():
         # Cleanup
         if 'scheduler' in locals():
             scheduler.shutdown()
+        await broadcast_engine.shutdown()
+        await telegram_webhook.shutdown()
+        await web_server.stop()
+        await mp_webhook.shutdown()
+        await mp_payment.close()
+        qr_generator.shutdown()
+        await db_manager.close()
         await logger.log_system_event("SHUTDOWN", "Bot finalizado")
         logger.info("👋 Bot finalizado")
+        await logger.shutdown()
+        await telegram_rate_limiter.shutdown()
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,121 @@
+"""
+Liberação de acesso para pagamentos aprovados do Imperium™ Bot
+Compartilhado pela verificação manual, pelo webhook do Mercado Pago e pelas rotinas automáticas
+"""
+
+from datetime import datetime
+from typing import Dict, Optional
+
+from aiogram import Bot, Dispatcher
+
+from config.settings import (
+    PLANS, SUCCESS_MESSAGE
+)
+from config.runtime_config import runtime_config
+from database.models import db_manager
+from keyboards.inline_keyboards import get_main_menu_keyboard
+from states.user_states import UserStates
+from utils.helpers import format_date_br
+from utils.logger import logger
+
+def find_plan(plan_name: str) -> Optional[Dict]:
+    """
+    Localiza um plano pelo nome gravado no pagamento
+
+    Args:
+        plan_name: Nome (ou chave) do plano
+
+    Returns:
+        Dados do plano ou None se não existir
+    """
+    if plan_name in PLANS:
+        return PLANS[plan_name]
+    for plan in PLANS.values():
+        if plan['name'] == plan_name:
+            return plan
+    return None
+
+def format_success_message(end_date: datetime) -> str:
+    """
+    Monta a mensagem de pagamento aprovado
+
+    Args:
+        end_date: Data de vencimento da assinatura
+
+    Returns:
+        Mensagem formatada em HTML
+    """
+    return SUCCESS_MESSAGE.format(
+        vip_group_link=runtime_config.vip_group_link,
+        end_date=format_date_br(end_date),
+        support_contact=runtime_config.support_contact
+    )
+
+async def approve_payment(mp_payment_id: str, user_id: int = None,
+                          plan_key: str = None) -> Optional[Dict]:
+    """
+    Cria a assinatura e a comissão de afiliado de um pagamento aprovado
+
+    Tudo acontece em uma única transação protegida por compare-and-set no
+    status do pagamento: chamadas repetidas ou simultâneas (botão, webhook,
+    conferência) não criam nada novamente.
+
+    Args:
+        mp_payment_id: ID do pagamento no Mercado Pago
+        user_id: Usuário, caso o pagamento não esteja no banco (opcional)
+        plan_key: Plano, caso o pagamento não esteja no banco (opcional)
+
+    Returns:
+        Dict com user_id, plan, subscription_id, end_date e already_processed,
+        ou None se não foi possível liberar o acesso
+    """
+    result = await db_manager.approve_payment(
+        mp_payment_id,
+        resolve_plan=find_plan,
+        commission_rate=runtime_config.commission_rate,
+        user_id=user_id,
+        plan_key=plan_key
+    )
+    if not result:
+        logger.error(f"Não foi possível liberar o pagamento aprovado {mp_payment_id}")
+        return None
+
+    if isinstance(result['end_date'], str):
+        result['end_date'] = datetime.fromisoformat(result['end_date'])
+
+    if result['already_processed']:
+        return result
+
+    if result['referrer_id']:
+        await logger.log_affiliate_event(
+            result['referrer_id'], result['user_id'], "NOVA_VENDA", result['commission']
+        )
+    await logger.log_payment_event(
+        result['user_id'], mp_payment_id, "APROVADO", result['plan']['price']
+    )
+
+    return result
+
+async def notify_payment_approved(bot: Bot, dispatcher: Optional[Dispatcher], result: Dict):
+    """
+    Avisa o usuário de um pagamento aprovado fora do botão de verificação
+
+    Args:
+        bot: Bot usado para enviar a mensagem
+        dispatcher: Dispatcher para atualizar o estado FSM (opcional)
+        result: Retorno de approve_payment
+    """
+    user_id = result['user_id']
+    try:
+        await bot.send_message(
+            chat_id=user_id,
+            text=format_success_message(result['end_date']),
+            reply_markup=get_main_menu_keyboard(),
+            parse_mode="HTML"
+        )
+
+        if dispatcher:
+            state = dispatcher.fsm.get_context(bot=bot, chat_id=user_id, user_id=user_id)
+            await state.set_state(UserStates.PAYMENT_CONFIRMED)
+    except Exception as e:
+        logger.error(f"Erro ao avisar usuário {user_id} sobre pagamento aprovado: {e}")
@@ -3,25 +3,30 @@ Integração com Mercado Pago para processamento de pagamentos Pix
 Implementa criação de pagamentos e verificação de status
 """
 
-import mercadopago
 import uuid
 import json
 from datetime import datetime, timedelta
 from typing import Dict, Optional, Tuple
-from config.settings import MP_ACCESS_TOKEN, MP_PUBLIC_KEY
+from config.settings import (
+    MP_ACCESS_TOKEN, MP_PUBLIC_KEY, MP_STATUS_CACHE_TTL, MP_NOTIFICATION_URL
+)
+from config.runtime_config import runtime_config
 from utils.logger import logger
+from utils.cache import AsyncTTLCache
+from payments.mp_client import MercadoPagoClient
 
 class MercadoPagoPayment:
     def __init__(self):
         """Inicializa a integração com Mercado Pago"""
         try:
-            self.sdk = mercadopago.SDK(MP_ACCESS_TOKEN)
-            logger.info("SDK do Mercado Pago inicializado com sucesso")
+            self.client = MercadoPagoClient(MP_ACCESS_TOKEN)
+            self._status_cache = AsyncTTLCache(ttl=MP_STATUS_CACHE_TTL)
+            logger.info("Cliente do Mercado Pago inicializado com sucesso")
         except Exception as e:
-            logger.error(f"Erro ao inicializar SDK do Mercado Pago: {e}")
+            logger.error(f"Erro ao inicializar cliente do Mercado Pago: {e}")
             raise
     
-    def create_pix_payment(self, user_id: int, user_phone: str, amount: float, 
+    async def create_pix_payment(self, user_id: int, user_phone: str, amount: float, 
                           plan_name: str, description: str = None) -> Optional[Dict]:
         """
         Cria um pagamento Pix no Mercado Pago
@@ -61,8 +66,9 @@ class MercadoPagoPayment:
                         "number": "00000000000"  # CPF fictício para testes
                     }
                 },
-                "notification_url": f"https://webhook.site/unique-id",  # Substitua por sua URL
-                "date_of_expiration": (datetime.now() + timedelta(hours=24)).isoformat(),
+                "date_of_expiration": (
+                    datetime.now() + timedelta(hours=runtime_config.payment_expiration_hours)
+                ).isoformat(),
                 "metadata": {
                     "user_id": str(user_id),
                     "plan_name": plan_name,
@@ -70,10 +76,14 @@ class MercadoPagoPayment:
                 }
             }
             
+            # Notificações vão para o webhook interno quando houver URL pública configurada
+            if MP_NOTIFICATION_URL:
+                payment_data["notification_url"] = MP_NOTIFICATION_URL
+            
             # Criar pagamento
             logger.info(f"Criando pagamento Pix para usuário {user_id}, valor: R$ {amount}")
             
-            payment_response = self.sdk.payment().create(payment_data)
+            payment_response = await self.client.create_payment(payment_data)
             payment = payment_response["response"]
             
             if payment_response["status"] == 201:
@@ -102,9 +112,9 @@ class MercadoPagoPayment:
             logger.error(f"Erro ao criar pagamento Pix: {e}")
             return None
     
-    def check_payment_status(self, payment_id: str) -> Optional[Dict]:
+    async def _fetch_payment_status(self, payment_id: str) -> Optional[Dict]:
         """
-        Verifica o status de um pagamento no Mercado Pago
+        Busca o status de um pagamento diretamente na API (sem cache)
         
         Args:
             payment_id: ID do pagamento no Mercado Pago
@@ -115,7 +125,7 @@ class MercadoPagoPayment:
         try:
             logger.info(f"Verificando status do pagamento: {payment_id}")
             
-            payment_response = self.sdk.payment().get(payment_id)
+            payment_response = await self.client.get_payment(payment_id)
             
             if payment_response["status"] == 200:
                 payment = payment_response["response"]
@@ -146,7 +156,76 @@ class MercadoPagoPayment:
             logger.error(f"Erro ao verificar status do pagamento {payment_id}: {e}")
             return None
     
-    def is_payment_approved(self, payment_id: str) -> bool:
+    async def check_payment_status(self, payment_id: str) -> Optional[Dict]:
+        """
+        Verifica o status de um pagamento no Mercado Pago
+        
+        O resultado fica em cache por MP_STATUS_CACHE_TTL segundos e consultas
+        simultâneas do mesmo pagamento compartilham uma única chamada à API.
+        
+        Args:
+            payment_id: ID do pagamento no Mercado Pago
+        
+        Returns:
+            Dict com status do pagamento ou None se erro
+        """
+        status_info = await self._status_cache.get_or_load(
+            payment_id, lambda: self._fetch_payment_status(payment_id)
+        )
+        # Cópia para que quem chamou possa acrescentar campos sem alterar o cache
+        return dict(status_info) if status_info else None
+    
+    def invalidate_status(self, payment_id: str):
+        """
+        Descarta o status em cache de um pagamento
+        
+        Args:
+            payment_id: ID do pagamento no Mercado Pago
+        """
+        self._status_cache.invalidate(payment_id)
+    
+    @staticmethod
+    def _expiration_time(status_info: Dict) -> datetime:
+        """Calcula o horário de expiração (payment_expiration_hours após a criação) sem fuso"""
+        date_created = datetime.fromisoformat(status_info["date_created"].replace("Z", "+00:00"))
+        expiration_hours = runtime_config.payment_expiration_hours
+        return (date_created + timedelta(hours=expiration_hours)).replace(tzinfo=None)
+    
+    @staticmethod
+    def _status_is_approved(status_info: Dict) -> bool:
+        """Indica se o snapshot do pagamento está aprovado"""
+        return status_info["status"] == "approved"
+    
+    @staticmethod
+    def _status_is_pending(status_info: Dict) -> bool:
+        """Indica se o snapshot do pagamento está pendente"""
+        return status_info["status"] in ["pending", "in_process"]
+    
+    @classmethod
+    def _status_is_expired(cls, status_info: Dict) -> bool:
+        """Indica se o snapshot do pagamento foi rejeitado, cancelado ou expirou"""
+        # Verificar se foi rejeitado ou cancelado
+        if status_info["status"] in ["rejected", "cancelled"]:
+            return True
+        
+        # Verificar se expirou por tempo
+        return datetime.now() > cls._expiration_time(status_info)
+    
+    @classmethod
+    def _status_time_remaining(cls, status_info: Dict) -> str:
+        """Formata o tempo restante para expiração do snapshot"""
+        expiration_time = cls._expiration_time(status_info)
+        now = datetime.now()
+        
+        if now < expiration_time:
+            remaining = expiration_time - now
+            hours = remaining.seconds // 3600
+            minutes = (remaining.seconds % 3600) // 60
+            return f"{hours}h {minutes}min"
+        else:
+            return "Expirado"
+    
+    async def is_payment_approved(self, payment_id: str) -> bool:
         """
         Verifica se um pagamento foi aprovado
         
@@ -157,15 +236,15 @@ class MercadoPagoPayment:
             True se aprovado, False caso contrário
         """
         try:
-            status_info = self.check_payment_status(payment_id)
+            status_info = await self.check_payment_status(payment_id)
             if status_info:
-                return status_info["status"] == "approved"
+                return self._status_is_approved(status_info)
             return False
         except Exception as e:
             logger.error(f"Erro ao verificar aprovação do pagamento {payment_id}: {e}")
             return False
     
-    def is_payment_pending(self, payment_id: str) -> bool:
+    async def is_payment_pending(self, payment_id: str) -> bool:
         """
         Verifica se um pagamento está pendente
         
@@ -176,15 +255,15 @@ class MercadoPagoPayment:
             True se pendente, False caso contrário
         """
         try:
-            status_info = self.check_payment_status(payment_id)
+            status_info = await self.check_payment_status(payment_id)
             if status_info:
-                return status_info["status"] in ["pending", "in_process"]
+                return self._status_is_pending(status_info)
             return False
         except Exception as e:
             logger.error(f"Erro ao verificar se pagamento está pendente {payment_id}: {e}")
             return False
     
-    def is_payment_expired(self, payment_id: str) -> bool:
+    async def is_payment_expired(self, payment_id: str) -> bool:
         """
         Verifica se um pagamento expirou
         
@@ -195,23 +274,15 @@ class MercadoPagoPayment:
             True se expirado, False caso contrário
         """
         try:
-            status_info = self.check_payment_status(payment_id)
+            status_info = await self.check_payment_status(payment_id)
             if status_info:
-                # Verificar se foi rejeitado ou cancelado
-                if status_info["status"] in ["rejected", "cancelled"]:
-                    return True
-                
-                # Verificar se expirou por tempo
-                date_created = datetime.fromisoformat(status_info["date_created"].replace("Z", "+00:00"))
-                expiration_time = date_created + timedelta(hours=24)
-                
-                return datetime.now() > expiration_time.replace(tzinfo=None)
+                return self._status_is_expired(status_info)
             return False
         except Exception as e:
             logger.error(f"Erro ao verificar expiração do pagamento {payment_id}: {e}")
             return False
     
-    def get_payment_time_remaining(self, payment_id: str) -> str:
+    async def get_payment_time_remaining(self, payment_id: str) -> str:
         """
         Calcula o tempo restante para expiração do pagamento
         
@@ -222,25 +293,15 @@ class MercadoPagoPayment:
             String formatada com tempo restante
         """
         try:
-            status_info = self.check_payment_status(payment_id)
+            status_info = await self.check_payment_status(payment_id)
             if status_info:
-                date_created = datetime.fromisoformat(status_info["date_created"].replace("Z", "+00:00"))
-                expiration_time = date_created + timedelta(hours=24)
-                now = datetime.now()
-                
-                if now < expiration_time.replace(tzinfo=None):
-                    remaining = expiration_time.replace(tzinfo=None) - now
-                    hours = remaining.seconds // 3600
-                    minutes = (remaining.seconds % 3600) // 60
-                    return f"{hours}h {minutes}min"
-                else:
-                    return "Expirado"
+                return self._status_time_remaining(status_info)
             return "Não disponível"
         except Exception as e:
             logger.error(f"Erro ao calcular tempo restante do pagamento {payment_id}: {e}")
             return "Erro ao calcular"
     
-    def cancel_payment(self, payment_id: str) -> bool:
+    async def cancel_payment(self, payment_id: str) -> bool:
         """
         Cancela um pagamento no Mercado Pago
         
@@ -254,9 +315,10 @@ class MercadoPagoPayment:
             logger.info(f"Cancelando pagamento: {payment_id}")
             
             cancel_data = {"status": "cancelled"}
-            response = self.sdk.payment().update(payment_id, cancel_data)
+            response = await self.client.update_payment(payment_id, cancel_data)
             
             if response["status"] == 200:
+                self._status_cache.invalidate(payment_id)
                 logger.info(f"Pagamento {payment_id} cancelado com sucesso")
                 return True
             else:
@@ -267,7 +329,7 @@ class MercadoPagoPayment:
             logger.error(f"Erro ao cancelar pagamento {payment_id}: {e}")
             return False
     
-    def refund_payment(self, payment_id: str, amount: float = None) -> bool:
+    async def refund_payment(self, payment_id: str, amount: float = None) -> bool:
         """
         Realiza reembolso de um pagamento
         
@@ -285,9 +347,10 @@ class MercadoPagoPayment:
             if amount:
                 refund_data["amount"] = amount
             
-            response = self.sdk.refund().create(payment_id, refund_data)
+            response = await self.client.create_refund(payment_id, refund_data)
             
             if response["status"] == 201:
+                self._status_cache.invalidate(payment_id)
                 logger.info(f"Reembolso do pagamento {payment_id} processado com sucesso")
                 return True
             else:
@@ -298,10 +361,12 @@ class MercadoPagoPayment:
             logger.error(f"Erro ao processar reembolso do pagamento {payment_id}: {e}")
             return False
     
-    def get_payment_info(self, payment_id: str) -> Optional[Dict]:
+    async def get_payment_info(self, payment_id: str) -> Optional[Dict]:
         """
         Obtém informações completas de um pagamento
         
+        Todos os campos calculados vêm de um único snapshot do pagamento.
+        
         Args:
             payment_id: ID do pagamento no Mercado Pago
         
@@ -309,19 +374,23 @@ class MercadoPagoPayment:
             Dict com informações completas do pagamento
         """
         try:
-            status_info = self.check_payment_status(payment_id)
+            status_info = await self.check_payment_status(payment_id)
             if status_info:
                 # Adicionar informações calculadas
-                status_info["is_approved"] = self.is_payment_approved(payment_id)
-                status_info["is_pending"] = self.is_payment_pending(payment_id)
-                status_info["is_expired"] = self.is_payment_expired(payment_id)
-                status_info["time_remaining"] = self.get_payment_time_remaining(payment_id)
+                status_info["is_approved"] = self._status_is_approved(status_info)
+                status_info["is_pending"] = self._status_is_pending(status_info)
+                status_info["is_expired"] = self._status_is_expired(status_info)
+                status_info["time_remaining"] = self._status_time_remaining(status_info)
                 
                 return status_info
             return None
         except Exception as e:
             logger.error(f"Erro ao obter informações do pagamento {payment_id}: {e}")
             return None
+    
+    async def close(self):
+        """Encerra as conexões com a API do Mercado Pago"""
+        await self.client.close()
 
 # Instância global do processador de pagamentos
 mp_payment = MercadoPagoPayment()
\ No newline at end of file
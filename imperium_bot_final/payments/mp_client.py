@@ -0,0 +1,156 @@
+"""
+Cliente HTTP assíncrono da API do Mercado Pago
+Reaproveita conexões keep-alive e repete requisições com backoff e jitter
+"""
+
+import aiohttp
+import asyncio
+import random
+import uuid
+from typing import Dict, Optional
+
+from config.settings import (
+    MP_API_BASE_URL, MP_HTTP_TIMEOUT, MP_CONNECT_TIMEOUT, MP_MAX_CONNECTIONS,
+    MP_KEEPALIVE_TIMEOUT, MP_MAX_RETRIES, MP_RETRY_BASE_DELAY, MP_RETRY_MAX_DELAY
+)
+from utils.logger import logger
+
+# Respostas que valem uma nova tentativa
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+class MercadoPagoClient:
+    """Cliente assíncrono com sessão aiohttp compartilhada"""
+
+    def __init__(self, access_token: str, base_url: str = MP_API_BASE_URL,
+                 max_retries: int = MP_MAX_RETRIES):
+        self.access_token = access_token
+        self.base_url = base_url.rstrip("/")
+        self.max_retries = max_retries
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Cria a sessão na primeira requisição (precisa do loop em execução)
+
+        Returns:
+            Sessão aiohttp com pool de conexões keep-alive
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=MP_MAX_CONNECTIONS,
+                keepalive_timeout=MP_KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(
+                    total=MP_HTTP_TIMEOUT,
+                    sock_connect=MP_CONNECT_TIMEOUT
+                ),
+                headers={
+                    "Authorization": f"Bearer {self.access_token}",
+                    "Content-Type": "application/json"
+                }
+            )
+        return self._session
+
+    def _backoff_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Calcula a espera antes da próxima tentativa
+
+        Args:
+            attempt: Número da tentativa que falhou (começa em 0)
+            retry_after: Valor do cabeçalho Retry-After, se houver
+
+        Returns:
+            Segundos de espera (backoff exponencial com jitter completo)
+        """
+        if retry_after:
+            try:
+                return min(float(retry_after), MP_RETRY_MAX_DELAY)
+            except ValueError:
+                pass
+        ceiling = min(MP_RETRY_MAX_DELAY, MP_RETRY_BASE_DELAY * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    async def request(self, method: str, path: str, payload: Dict = None,
+                      idempotency_key: str = None) -> Dict:
+        """
+        Executa uma requisição à API com novas tentativas
+
+        Args:
+            method: Método HTTP
+            path: Caminho da API (ex: /v1/payments)
+            payload: Corpo JSON (opcional)
+            idempotency_key: Chave de idempotência para criações (opcional)
+
+        Returns:
+            Dict no formato {"status": código HTTP, "response": corpo JSON}
+        """
+        session = self._get_session()
+        headers = {}
+        if idempotency_key:
+            # A mesma chave em todas as tentativas evita cobranças duplicadas
+            headers["X-Idempotency-Key"] = idempotency_key
+
+        url = f"{self.base_url}{path}"
+        last_error: Optional[BaseException] = None
+
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                async with session.request(method, url, json=payload, headers=headers) as response:
+                    try:
+                        body = await response.json(content_type=None)
+                    except ValueError:
+                        body = {"message": await response.text()}
+
+                    result = {"status": response.status, "response": body}
+                    if response.status not in RETRYABLE_STATUS or attempt == self.max_retries:
+                        return result
+
+                    retry_after = response.headers.get("Retry-After")
+                    logger.warning(
+                        f"Mercado Pago respondeu {response.status} em {method} {path}, "
+                        f"tentativa {attempt + 1}/{self.max_retries + 1}"
+                    )
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                last_error = e
+                if attempt == self.max_retries:
+                    break
+                logger.warning(
+                    f"Falha de conexão com Mercado Pago em {method} {path}: {e!r}, "
+                    f"tentativa {attempt + 1}/{self.max_retries + 1}"
+                )
+
+            await asyncio.sleep(self._backoff_delay(attempt, retry_after))
+
+        raise ConnectionError(f"Mercado Pago indisponível em {method} {path}: {last_error!r}")
+
+    async def create_payment(self, payment_data: Dict) -> Dict:
+        """Cria um pagamento"""
+        return await self.request(
+            "POST", "/v1/payments", payment_data,
+            idempotency_key=str(uuid.uuid4())
+        )
+
+    async def get_payment(self, payment_id: str) -> Dict:
+        """Consulta um pagamento"""
+        return await self.request("GET", f"/v1/payments/{payment_id}")
+
+    async def update_payment(self, payment_id: str, data: Dict) -> Dict:
+        """Atualiza um pagamento"""
+        return await self.request("PUT", f"/v1/payments/{payment_id}", data)
+
+    async def create_refund(self, payment_id: str, data: Dict) -> Dict:
+        """Cria um reembolso (total ou parcial)"""
+        return await self.request(
+            "POST", f"/v1/payments/{payment_id}/refunds", data,
+            idempotency_key=str(uuid.uuid4())
+        )
+
+    async def close(self):
+        """Fecha a sessão e as conexões keep-alive"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
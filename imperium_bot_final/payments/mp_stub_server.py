@@ -0,0 +1,143 @@
+"""
+Servidor local que imita a API de pagamentos do Mercado Pago
+Usado em testes e desenvolvimento sem tocar na API real
+
+Uso:
+    python -m payments.mp_stub_server --port 8081 --latency 2 --fail-rate 0.2
+    MP_API_BASE_URL=http://127.0.0.1:8081 python main.py
+
+Rotas extras para controlar o estado dos pagamentos:
+    POST /_stub/payments/{id}/status   {"status": "approved"}
+"""
+
+import argparse
+import asyncio
+import base64
+import itertools
+import random
+from datetime import datetime, timedelta, timezone
+
+from aiohttp import web
+
+def _now_iso() -> str:
+    """Data atual no formato usado pela API"""
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+class MercadoPagoStub:
+    """Estado em memória e rotas do servidor falso"""
+
+    def __init__(self, latency: float = 0.0, fail_rate: float = 0.0):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.payments = {}
+        self.idempotency = {}
+        self._ids = itertools.count(1000000001)
+
+    @web.middleware
+    async def chaos_middleware(self, request: web.Request, handler):
+        """Simula latência e falhas intermitentes nas rotas da API"""
+        if request.path.startswith("/v1/"):
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            if self.fail_rate and random.random() < self.fail_rate:
+                return web.json_response({"message": "stub: falha simulada"}, status=503)
+        return await handler(request)
+
+    def _get_or_404(self, request: web.Request) -> dict:
+        payment = self.payments.get(request.match_info["payment_id"])
+        if not payment:
+            raise web.HTTPNotFound(
+                text='{"message": "Payment not found"}', content_type="application/json"
+            )
+        return payment
+
+    async def create_payment(self, request: web.Request) -> web.Response:
+        key = request.headers.get("X-Idempotency-Key")
+        if key and key in self.idempotency:
+            return web.json_response(self.payments[self.idempotency[key]], status=201)
+
+        data = await request.json()
+        payment_id = str(next(self._ids))
+        qr_code = f"00020126STUBPIX{payment_id}5204000053039865802BR6304ABCD"
+        payment = {
+            "id": int(payment_id),
+            "status": "pending",
+            "status_detail": "pending_waiting_transfer",
+            "transaction_amount": data.get("transaction_amount"),
+            "currency_id": "BRL",
+            "description": data.get("description", ""),
+            "external_reference": data.get("external_reference", ""),
+            "metadata": data.get("metadata", {}),
+            "date_created": _now_iso(),
+            "date_last_updated": _now_iso(),
+            "date_approved": None,
+            "date_of_expiration": data.get("date_of_expiration") or (
+                datetime.now(timezone.utc) + timedelta(hours=24)
+            ).isoformat(),
+            "point_of_interaction": {
+                "transaction_data": {
+                    "qr_code": qr_code,
+                    "qr_code_base64": base64.b64encode(qr_code.encode()).decode(),
+                    "ticket_url": f"http://{request.host}/checkout/{payment_id}"
+                }
+            }
+        }
+        self.payments[payment_id] = payment
+        if key:
+            self.idempotency[key] = payment_id
+        return web.json_response(payment, status=201)
+
+    async def get_payment(self, request: web.Request) -> web.Response:
+        return web.json_response(self._get_or_404(request))
+
+    async def update_payment(self, request: web.Request) -> web.Response:
+        payment = self._get_or_404(request)
+        payment.update(await request.json())
+        payment["date_last_updated"] = _now_iso()
+        return web.json_response(payment)
+
+    async def refund_payment(self, request: web.Request) -> web.Response:
+        payment = self._get_or_404(request)
+        data = await request.json() if request.can_read_body else {}
+        payment["status"] = "refunded"
+        payment["date_last_updated"] = _now_iso()
+        refund = {
+            "id": next(self._ids),
+            "payment_id": payment["id"],
+            "amount": data.get("amount", payment["transaction_amount"]),
+            "status": "approved"
+        }
+        return web.json_response(refund, status=201)
+
+    async def set_status(self, request: web.Request) -> web.Response:
+        payment = self._get_or_404(request)
+        data = await request.json()
+        payment["status"] = data["status"]
+        payment["date_last_updated"] = _now_iso()
+        if data["status"] == "approved":
+            payment["date_approved"] = _now_iso()
+        return web.json_response(payment)
+
+    def create_app(self) -> web.Application:
+        """Monta a aplicação aiohttp com as rotas da API"""
+        app = web.Application(middlewares=[self.chaos_middleware])
+        app.router.add_post("/v1/payments", self.create_payment)
+        app.router.add_get("/v1/payments/{payment_id}", self.get_payment)
+        app.router.add_put("/v1/payments/{payment_id}", self.update_payment)
+        app.router.add_post("/v1/payments/{payment_id}/refunds", self.refund_payment)
+        app.router.add_post("/_stub/payments/{payment_id}/status", self.set_status)
+        return app
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor falso da API do Mercado Pago")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.0, help="Atraso (s) por requisição")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fração de respostas 503")
+    args = parser.parse_args()
+
+    stub = MercadoPagoStub(latency=args.latency, fail_rate=args.fail_rate)
+    web.run_app(stub.create_app(), host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+"""
+Renderização das imagens de QR Code do Imperium™ Bot
+Funções puras e sem logs, seguras para rodar em threads ou processos separados
+
+Fontes e os textos do cartão (título, valor e instrução) ficam pré-renderizados
+em cache por processo; cada pagamento apenas cola os textos e os módulos do QR.
+"""
+
+import io
+import os
+import platform
+import threading
+from functools import lru_cache
+from typing import Iterable, Tuple
+
+import qrcode
+from PIL import Image, ImageDraw, ImageFont
+
+from config.settings import QR_TEMPLATE_CACHE_SIZE
+
+SYSTEM = platform.system().lower()
+
+# Fontes procuradas por sistema operacional, em ordem de preferência
+FONT_PATHS = {
+    "windows": [
+        "C:/Windows/Fonts/arial.ttf",
+        "C:/Windows/Fonts/calibri.ttf",
+        "C:/Windows/Fonts/tahoma.ttf"
+    ],
+    "darwin": [  # macOS
+        "/System/Library/Fonts/Arial.ttf",
+        "/System/Library/Fonts/Helvetica.ttc",
+        "/Library/Fonts/Arial.ttf"
+    ],
+    "linux": [  # Linux e Termux
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+        "/usr/share/fonts/TTF/DejaVuSans.ttf",
+        "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+        "/system/fonts/DroidSans.ttf",  # Android/Termux
+        "/data/data/com.termux/files/usr/share/fonts/TTF/DejaVuSans.ttf"  # Termux específico
+    ]
+}
+
+# Tamanhos usados no cartão de pagamento (título, valor e instrução)
+TITLE_FONT_SIZE, VALUE_FONT_SIZE, INSTRUCTION_FONT_SIZE = 24, 18, 14
+
+INSTRUCTION_TEXT = "Escaneie com seu app bancário"
+
+# Fontes do FreeType não podem ser usadas por duas threads ao mesmo tempo
+_template_lock = threading.Lock()
+
+@lru_cache(maxsize=None)
+def get_font(size: int) -> ImageFont.ImageFont:
+    """
+    Obtém fonte com fallback multiplataforma (carregada uma vez por tamanho)
+
+    Args:
+        size: Tamanho da fonte
+
+    Returns:
+        Objeto de fonte
+    """
+    for font_path in FONT_PATHS.get(SYSTEM, FONT_PATHS["linux"]):
+        if os.path.exists(font_path):
+            try:
+                return ImageFont.truetype(font_path, size)
+            except OSError:
+                continue
+    # Fallback para fonte padrão
+    return ImageFont.load_default()
+
+# Paleta das imagens de pagamento: 4 cores cabem em PNG de 2 bits por pixel
+PALETTE = [
+    255, 255, 255,  # branco (fundo)
+    0, 0, 0,        # preto (módulos e título)
+    0, 128, 0,      # verde (valor)
+    128, 128, 128,  # cinza (instrução)
+]
+WHITE, BLACK, GREEN, GRAY = range(4)
+
+def _build_qr(data: str, error_correction: int, box_size: int, border: int) -> qrcode.QRCode:
+    """Monta a matriz do QR Code"""
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=error_correction,
+        box_size=box_size,
+        border=border,
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+    return qr
+
+def _module_mask(qr: qrcode.QRCode) -> Image.Image:
+    """
+    Converte a matriz do QR Code em máscara 1-bit já no tamanho final
+
+    Cada módulo vira um pixel e a ampliação por box_size é feita de uma vez
+    com NEAREST, sem passar pelo desenho módulo a módulo do qrcode.
+
+    Args:
+        qr: QR Code já montado (a matriz inclui a borda)
+
+    Returns:
+        Imagem modo "1" com os módulos escuros ligados
+    """
+    matrix = qr.get_matrix()
+    modules = len(matrix)
+    pixels = bytes(255 if cell else 0 for row in matrix for cell in row)
+    size = modules * qr.box_size
+
+    mask = Image.frombytes('L', (modules, modules), pixels)
+    mask = mask.resize((size, size), Image.Resampling.NEAREST)
+    return mask.convert('1', dither=Image.Dither.NONE)
+
+def _encode_png(image: Image.Image, **options) -> bytes:
+    """Codifica a imagem em PNG com compressão máxima"""
+    img_buffer = io.BytesIO()
+    image.save(img_buffer, format='PNG', optimize=True, **options)
+    return img_buffer.getvalue()
+
+def _add_logo_to_qr(qr_img: Image.Image, logo_path: str) -> Image.Image:
+    """
+    Adiciona logo ao centro do QR Code
+
+    Args:
+        qr_img: Imagem do QR Code
+        logo_path: Caminho para o logo
+
+    Returns:
+        Imagem do QR Code com logo
+    """
+    logo = Image.open(logo_path)
+
+    # Calcular tamanho do logo (10% do QR Code)
+    qr_width, qr_height = qr_img.size
+    logo_size = min(qr_width, qr_height) // 10
+    logo = logo.resize((logo_size, logo_size), Image.Resampling.LANCZOS)
+
+    # Criar máscara circular para o logo
+    mask = Image.new('L', (logo_size, logo_size), 0)
+    draw = ImageDraw.Draw(mask)
+    draw.ellipse((0, 0, logo_size, logo_size), fill=255)
+    logo.putalpha(mask)
+
+    # Colar logo no centro do QR Code
+    logo_pos = ((qr_width - logo_size) // 2, (qr_height - logo_size) // 2)
+    qr_img.paste(logo, logo_pos, logo)
+    return qr_img
+
+def render_qr_code(data: str, logo_path: str = None) -> bytes:
+    """
+    Gera QR Code como imagem PNG
+
+    Sem logo a imagem sai em 1 bit por pixel; com logo é preciso RGB.
+
+    Args:
+        data: Dados para o QR Code (código Pix)
+        logo_path: Caminho para logo a ser inserido no centro (opcional)
+
+    Returns:
+        Bytes da imagem do QR Code
+    """
+    qr = _build_qr(data, qrcode.constants.ERROR_CORRECT_H, box_size=10, border=4)  # Alta correção para logo
+    modules = _module_mask(qr)
+
+    if logo_path and os.path.exists(logo_path):
+        qr_img = Image.new('RGB', modules.size, 'white')
+        qr_img.paste((0, 0, 0), (0, 0), modules)
+        return _encode_png(_add_logo_to_qr(qr_img, logo_path))
+
+    qr_img = Image.new('1', modules.size, 1)
+    qr_img.paste(0, (0, 0), modules)
+    return _encode_png(qr_img)
+
+# Um texto pré-renderizado: (máscara 1-bit, largura visível, cor da paleta)
+TextStrip = Tuple[Image.Image, int, int]
+
+def _render_text(text: str, font_size: int, fill: int) -> TextStrip:
+    """
+    Renderiza uma linha de texto como máscara reaproveitável
+
+    A máscara começa na origem do texto, então colá-la em (x, y) equivale a
+    draw.text((x, y), ...).
+
+    Args:
+        text: Texto da linha
+        font_size: Tamanho da fonte
+        fill: Índice da cor na PALETTE
+
+    Returns:
+        TextStrip com a máscara, a largura usada na centralização e a cor
+    """
+    font = get_font(font_size)
+    measure = ImageDraw.Draw(Image.new('1', (1, 1)))
+    measure.fontmode = "1"  # Sem antialiasing: o texto usa só as cores da paleta
+    left, _, right, bottom = measure.textbbox((0, 0), text, font=font)
+
+    mask = Image.new('1', (max(1, right), max(1, bottom)), 0)
+    draw = ImageDraw.Draw(mask)
+    draw.fontmode = "1"
+    draw.text((0, 0), text, fill=1, font=font)
+    return mask, right - left, fill
+
+@lru_cache(maxsize=None)
+def _instruction_strip() -> TextStrip:
+    """Linha de instrução, igual em todos os cartões"""
+    return _render_text(INSTRUCTION_TEXT, INSTRUCTION_FONT_SIZE, GRAY)
+
+@lru_cache(maxsize=QR_TEMPLATE_CACHE_SIZE)
+def _header_strips(description: str, amount: float) -> Tuple[TextStrip, TextStrip]:
+    """
+    Título e valor de um cartão (um par por plano)
+
+    Args:
+        description: Título do cartão
+        amount: Valor do pagamento
+
+    Returns:
+        Tupla (título, valor)
+    """
+    return (
+        _render_text(description, TITLE_FONT_SIZE, BLACK),
+        _render_text(f"R$ {amount:.2f}".replace(".", ","), VALUE_FONT_SIZE, GREEN),
+    )
+
+def _card_template(description: str, amount: float) -> Tuple[TextStrip, ...]:
+    """
+    Busca os textos do cartão no cache, renderizando com exclusividade se faltarem
+
+    Returns:
+        Tupla (título, valor, instrução)
+    """
+    with _template_lock:
+        return (*_header_strips(description, amount), _instruction_strip())
+
+def _paste_centered(image: Image.Image, y: int, strip: TextStrip):
+    """Cola um texto pré-renderizado centralizado na horizontal"""
+    mask, width, fill = strip
+    image.paste(fill, ((image.width - width) // 2, y), mask)
+
+def _add_payment_info(modules: Image.Image, amount: float, description: str) -> Image.Image:
+    """
+    Monta a imagem final com o QR Code e as informações de pagamento
+
+    Args:
+        modules: Máscara dos módulos do QR Code
+        amount: Valor do pagamento
+        description: Descrição
+
+    Returns:
+        Imagem final com informações (modo "P", paleta PALETTE)
+    """
+    qr_width, qr_height = modules.size
+
+    # Criar imagem maior para incluir texto
+    padding = 100
+    final_width = qr_width + (padding * 2)
+    final_height = qr_height + padding + 150  # Espaço extra para texto
+
+    final_image = Image.new('P', (final_width, final_height), WHITE)
+    final_image.putpalette(PALETTE)
+    final_image.paste(BLACK, (padding, padding), modules)
+
+    title, value, instruction = _card_template(description, amount)
+    _paste_centered(final_image, 20, title)
+    _paste_centered(final_image, 50, value)
+    _paste_centered(final_image, final_height - 40, instruction)
+    return final_image
+
+def render_qr_with_info(pix_data: str, amount: float, description: str = "Imperium™") -> bytes:
+    """
+    Gera QR Code com título, valor e instrução
+
+    A imagem é composta direto da matriz do QR Code sobre o modelo em cache do
+    cartão, sem PNG intermediário, e codificada uma única vez como PNG de
+    paleta com 2 bits por pixel.
+
+    Args:
+        pix_data: Código Pix
+        amount: Valor do pagamento
+        description: Descrição do pagamento
+
+    Returns:
+        Bytes da imagem PNG
+    """
+    qr = _build_qr(pix_data, qrcode.constants.ERROR_CORRECT_H, box_size=10, border=4)
+    final_image = _add_payment_info(_module_mask(qr), amount, description)
+    return _encode_png(final_image, bits=2)
+
+def plan_card(plan: dict) -> Tuple[str, float]:
+    """
+    Título e valor do cartão de pagamento de um plano
+
+    Args:
+        plan: Plano de PLANS
+
+    Returns:
+        Tupla (descrição, valor)
+    """
+    return f"Imperium™ - {plan['name']}", plan['price']
+
+def warm_up(cards: Iterable[Tuple[str, float]] = ()) -> int:
+    """
+    Carrega as fontes e renderiza os textos dos cartões antes do primeiro pagamento
+
+    Também serve de initializer para os workers de um ProcessPoolExecutor.
+
+    Args:
+        cards: Pares (descrição, valor) dos planos
+
+    Returns:
+        Quantidade de cartões preparados
+    """
+    for size in (TITLE_FONT_SIZE, VALUE_FONT_SIZE, INSTRUCTION_FONT_SIZE):
+        get_font(size)
+
+    prepared = 0
+    for description, amount in cards:
+        _card_template(description, amount)
+        prepared += 1
+    return prepared
+
+def render_fallback_qr(data: str) -> bytes:
+    """
+    Gera QR Code usando método de fallback mais simples
+
+    Args:
+        data: Dados para o QR Code
+
+    Returns:
+        Bytes da imagem PNG (1 bit por pixel)
+    """
+    qr = _build_qr(data, qrcode.constants.ERROR_CORRECT_M, box_size=8, border=2)
+    modules = _module_mask(qr)
+
+    img = Image.new('1', modules.size, 1)
+    img.paste(0, (0, 0), modules)
+    return _encode_png(img)
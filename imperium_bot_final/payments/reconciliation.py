@@ -0,0 +1,201 @@
+"""
+Conferência periódica dos pagamentos pendentes do Imperium™ Bot
+Atualiza pagamentos abandonados e libera acessos aprovados que ninguém verificou
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from aiogram import Bot, Dispatcher
+
+from config.settings import (
+    PAYMENT_RECONCILE_MIN_AGE, PAYMENT_RECONCILE_PAGE_SIZE,
+    PAYMENT_RECONCILE_CONCURRENCY, PAYMENT_RECONCILE_MAX_PER_RUN
+)
+from database.models import db_manager
+from payments.approval import approve_payment, notify_payment_approved
+from payments.mercado_pago import mp_payment
+from utils.logger import logger
+
+class PaymentReconciler:
+    """Varre pagamentos pendentes em páginas e sincroniza com o Mercado Pago"""
+
+    def __init__(self, page_size: int = PAYMENT_RECONCILE_PAGE_SIZE,
+                 concurrency: int = PAYMENT_RECONCILE_CONCURRENCY,
+                 max_per_run: int = PAYMENT_RECONCILE_MAX_PER_RUN):
+        self.page_size = page_size
+        self.concurrency = concurrency
+        self.max_per_run = max_per_run
+        self.bot: Optional[Bot] = None
+        self.dispatcher: Optional[Dispatcher] = None
+        self._running = False
+        self.metrics = {
+            "runs": 0,
+            "scanned": 0,
+            "updated": 0,
+            "approved": 0,
+            "expired": 0,
+            "errors": 0,
+            "last_run": None,
+            "last_duration": 0.0,
+            "last_throughput": 0.0
+        }
+
+    def setup(self, bot: Bot, dispatcher: Dispatcher):
+        """
+        Informa o bot usado para avisar os usuários aprovados
+
+        Args:
+            bot: Bot do Telegram
+            dispatcher: Dispatcher (acesso ao FSM do usuário)
+        """
+        self.bot = bot
+        self.dispatcher = dispatcher
+
+    def get_metrics(self) -> Dict:
+        """
+        Métricas acumuladas da conferência
+
+        Returns:
+            Dict com totais e a vazão (pagamentos/s) da última execução
+        """
+        return dict(self.metrics)
+
+    @staticmethod
+    def _resolve_status(payment: Dict, payment_info: Dict) -> str:
+        """
+        Decide o novo status local de um pagamento
+
+        Pagamentos que o Mercado Pago ainda mostra como pendentes, mas cujo
+        Pix já venceu, são marcados como expirados.
+        """
+        if payment_info['is_pending'] and payment_info['is_expired']:
+            return 'expired'
+        if payment_info['is_pending'] and payment.get('expiration_date'):
+            expiration_date = payment['expiration_date']
+            if isinstance(expiration_date, str):
+                expiration_date = datetime.fromisoformat(expiration_date)
+            if expiration_date <= datetime.now():
+                return 'expired'
+        return payment_info['status']
+
+    async def _check_page(self, page: List[Dict]) -> Tuple[List[Tuple[str, str]], int]:
+        """
+        Consulta os pagamentos de uma página com concorrência limitada
+
+        Args:
+            page: Pagamentos pendentes
+
+        Returns:
+            Tupla (lista de (mp_payment_id, novo status), número de falhas)
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def check(payment: Dict) -> Optional[Tuple[str, str]]:
+            async with semaphore:
+                payment_info = await mp_payment.get_payment_info(payment['mp_payment_id'])
+            if not payment_info:
+                return None
+            return payment['mp_payment_id'], self._resolve_status(payment, payment_info)
+
+        results = await asyncio.gather(*(check(payment) for payment in page))
+        statuses = {payment['mp_payment_id']: payment['status'] for payment in page}
+
+        updates = [
+            result for result in results
+            if result and result[1] != statuses[result[0]]
+        ]
+        errors = sum(1 for result in results if result is None)
+        return updates, errors
+
+    async def _finalize_approvals(self, payment_ids: List[str]) -> int:
+        """
+        Cria assinaturas e comissões dos pagamentos aprovados
+
+        Args:
+            payment_ids: Pagamentos que passaram para aprovado
+
+        Returns:
+            Quantidade de acessos liberados nesta execução
+        """
+        released = 0
+        for payment_id in payment_ids:
+            try:
+                result = await approve_payment(payment_id)
+                if not result or result['already_processed']:
+                    continue
+                released += 1
+                if self.bot:
+                    await notify_payment_approved(self.bot, self.dispatcher, result)
+            except Exception as e:
+                logger.error(f"Erro ao liberar pagamento {payment_id} na conferência: {e}")
+        return released
+
+    async def run(self) -> Dict:
+        """
+        Executa uma varredura completa dos pagamentos pendentes
+
+        Returns:
+            Dict com os números desta execução
+        """
+        if self._running:
+            return {}
+        self._running = True
+
+        run_stats = {"scanned": 0, "updated": 0, "approved": 0, "expired": 0, "errors": 0}
+        started = time.monotonic()
+        try:
+            cursor = None
+            while run_stats["scanned"] < self.max_per_run:
+                page = await db_manager.get_pending_payments_page(
+                    PAYMENT_RECONCILE_MIN_AGE, self.page_size, after=cursor
+                )
+                if not page:
+                    break
+                cursor = (page[-1]['creation_date'], page[-1]['id'])
+                run_stats["scanned"] += len(page)
+
+                updates, errors = await self._check_page(page)
+                run_stats["errors"] += errors
+                if updates:
+                    # Aprovados mudam de status na mesma transação da assinatura
+                    approved = [payment_id for payment_id, status in updates if status == 'approved']
+                    others = [update for update in updates if update[1] != 'approved']
+
+                    run_stats["updated"] += await db_manager.update_payment_statuses(others)
+                    run_stats["expired"] += sum(1 for _, status in others if status == 'expired')
+
+                    released = await self._finalize_approvals(approved)
+                    run_stats["updated"] += released
+                    run_stats["approved"] += released
+
+                if len(page) < self.page_size:
+                    break
+        except Exception as e:
+            logger.error(f"Erro na conferência de pagamentos: {e}")
+        finally:
+            self._running = False
+
+        duration = time.monotonic() - started
+        throughput = run_stats["scanned"] / duration if duration > 0 else 0.0
+
+        for key, value in run_stats.items():
+            self.metrics[key] += value
+        self.metrics["runs"] += 1
+        self.metrics["last_run"] = datetime.now()
+        self.metrics["last_duration"] = round(duration, 3)
+        self.metrics["last_throughput"] = round(throughput, 1)
+
+        if run_stats["scanned"]:
+            logger.info(
+                f"Conferência de pagamentos: {run_stats['scanned']} conferidos, "
+                f"{run_stats['updated']} atualizados, {run_stats['approved']} liberados, "
+                f"{run_stats['expired']} expirados, {run_stats['errors']} falhas "
+                f"({duration:.1f}s, {throughput:.1f} pagamentos/s)"
+            )
+        return run_stats
+
+# Instância global da conferência de pagamentos
+payment_reconciler = PaymentReconciler()
@@ -0,0 +1,189 @@
+"""
+Receptor de notificações (webhooks) do Mercado Pago
+Confirma pagamentos assim que o Mercado Pago avisa, sem depender do botão de verificação
+"""
+
+import asyncio
+import hashlib
+import hmac
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set
+
+from aiohttp import web
+from aiogram import Bot, Dispatcher
+
+from config.settings import (
+    MP_WEBHOOK_SECRET, MP_WEBHOOK_PATH, MP_WEBHOOK_TOLERANCE, MP_WEBHOOK_DEDUP_TTL
+)
+from database.models import db_manager
+from payments.approval import approve_payment, notify_payment_approved
+from payments.mercado_pago import mp_payment
+from utils.logger import logger
+
+# Status que não mudam mais; novas notificações do mesmo pagamento são ignoradas
+FINAL_STATUSES = {"approved", "rejected", "cancelled", "refunded", "charged_back"}
+
+class MercadoPagoWebhook:
+    """Valida, deduplica e processa notificações de pagamento"""
+
+    def __init__(self, secret: str = MP_WEBHOOK_SECRET):
+        self.secret = secret
+        self.bot: Optional[Bot] = None
+        self.dispatcher: Optional[Dispatcher] = None
+        self._finalized: "OrderedDict[str, float]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    def setup(self, app: web.Application, bot: Bot, dispatcher: Dispatcher):
+        """
+        Registra a rota do webhook na aplicação aiohttp
+
+        Args:
+            app: Aplicação do servidor HTTP interno
+            bot: Bot usado para avisar o usuário
+            dispatcher: Dispatcher (acesso ao FSM do usuário)
+        """
+        self.bot = bot
+        self.dispatcher = dispatcher
+        app.router.add_post(MP_WEBHOOK_PATH, self.handle)
+        logger.info(f"Webhook do Mercado Pago registrado em {MP_WEBHOOK_PATH}")
+
+    def verify_signature(self, request: web.Request, data_id: str) -> bool:
+        """
+        Valida o cabeçalho x-signature enviado pelo Mercado Pago
+
+        O manifesto assinado é "id:{data.id};request-id:{x-request-id};ts:{ts};"
+        com HMAC-SHA256 usando a assinatura secreta do painel.
+
+        Args:
+            request: Requisição recebida
+            data_id: ID do recurso informado na query string
+
+        Returns:
+            True se a assinatura confere e não está vencida
+        """
+        signature = request.headers.get("x-signature", "")
+        parts = dict(
+            item.strip().split("=", 1) for item in signature.split(",") if "=" in item
+        )
+        ts, received = parts.get("ts"), parts.get("v1")
+        if not ts or not received:
+            return False
+
+        try:
+            ts_seconds = int(ts)
+        except ValueError:
+            return False
+        if ts_seconds > 10 ** 12:  # Carimbo em milissegundos
+            ts_seconds //= 1000
+        if abs(time.time() - ts_seconds) > MP_WEBHOOK_TOLERANCE:
+            return False
+
+        manifest = ""
+        if data_id:
+            manifest += f"id:{data_id.lower() if data_id.isalnum() else data_id};"
+        request_id = request.headers.get("x-request-id")
+        if request_id:
+            manifest += f"request-id:{request_id};"
+        manifest += f"ts:{ts};"
+
+        expected = hmac.new(
+            self.secret.encode(), manifest.encode(), hashlib.sha256
+        ).hexdigest()
+        return hmac.compare_digest(expected, received)
+
+    def _is_finalized(self, payment_id: str) -> bool:
+        """Verifica se o pagamento já foi concluído recentemente"""
+        now = time.monotonic()
+        while self._finalized:
+            _, finalized_at = next(iter(self._finalized.items()))
+            if now - finalized_at <= MP_WEBHOOK_DEDUP_TTL:
+                break
+            self._finalized.popitem(last=False)
+        return payment_id in self._finalized
+
+    async def handle(self, request: web.Request) -> web.Response:
+        """
+        Recebe a notificação e agenda o processamento em segundo plano
+
+        Args:
+            request: Requisição do Mercado Pago
+
+        Returns:
+            200 para notificações aceitas (o Mercado Pago reenvia em caso de erro)
+        """
+        try:
+            body = await request.json()
+        except Exception:
+            body = {}
+
+        topic = request.query.get("type") or request.query.get("topic") or body.get("type")
+        data_id = request.query.get("data.id") or request.query.get("id") or \
+            str((body.get("data") or {}).get("id") or "")
+
+        if not self.verify_signature(request, data_id):
+            logger.warning(f"Webhook do Mercado Pago com assinatura inválida (id={data_id})")
+            return web.Response(status=401)
+
+        if topic != "payment" or not data_id:
+            return web.Response(status=200)
+
+        if data_id in self._inflight or self._is_finalized(data_id):
+            return web.Response(status=200)
+
+        task = asyncio.create_task(self._process(data_id))
+        self._inflight[data_id] = task
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return web.Response(status=200)
+
+    async def _process(self, payment_id: str):
+        """
+        Consulta o pagamento e libera o acesso se estiver aprovado
+
+        Args:
+            payment_id: ID do pagamento no Mercado Pago
+        """
+        try:
+            payment = await db_manager.get_payment(payment_id)
+            if not payment:
+                logger.warning(f"Webhook para pagamento desconhecido: {payment_id}")
+                self._finalized[payment_id] = time.monotonic()
+                return
+
+            # A notificação indica mudança: descarta o status em cache
+            mp_payment.invalidate_status(payment_id)
+            payment_info = await mp_payment.get_payment_info(payment_id)
+            if not payment_info:
+                return  # O Mercado Pago reenviará a notificação
+
+            # Aprovação grava o status junto com a assinatura (approve_payment)
+            if not payment_info['is_approved']:
+                await db_manager.update_payment_status(payment_id, payment_info['status'])
+
+            if payment_info['is_approved']:
+                result = await approve_payment(payment_id)
+                if not result:
+                    return
+                if not result['already_processed']:
+                    await notify_payment_approved(self.bot, self.dispatcher, result)
+
+            if payment_info['status'] in FINAL_STATUSES:
+                self._finalized[payment_id] = time.monotonic()
+
+            await logger.log_payment_event(
+                payment['user_id'], payment_id, f"WEBHOOK_{payment_info['status'].upper()}"
+            )
+        except Exception as e:
+            logger.error(f"Erro ao processar webhook do pagamento {payment_id}: {e}")
+        finally:
+            self._inflight.pop(payment_id, None)
+
+    async def shutdown(self):
+        """Aguarda o término das notificações em processamento"""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+# Instância global do receptor de webhooks
+mp_webhook = MercadoPagoWebhook()
@@ -70,7 +70,7 @@ import sys
 try:
     import aiogram
     import aiosqlite
-    import mercadopago
+    import aiohttp
     import qrcode
     import PIL
     print('✅ Dependências verificadas')
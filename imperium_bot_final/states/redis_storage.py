@@ -0,0 +1,59 @@
+"""
+Storage do FSM em Redis com expiração por estado para o Imperium™ Bot
+Permite rodar o bot em vários processos compartilhando os estados dos usuários
+
+Requer o pacote opcional redis (FSM_STORAGE=redis). Para testes locais:
+    python -m states.redis_stub_server --port 6380
+    FSM_STORAGE=redis FSM_REDIS_URL=redis://127.0.0.1:6380/0 python main.py
+"""
+
+from typing import Any, Dict
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import StateType, StorageKey
+from aiogram.fsm.storage.redis import RedisStorage
+
+from states.user_states import get_state_ttl
+
+class TimedRedisStorage(RedisStorage):
+    """
+    RedisStorage que aplica o tempo de TEMPORARY_STATES como TTL
+
+    Os dados do usuário expiram junto com o estado temporário, então o
+    Redis descarta o fluxo abandonado inteiro sem nenhuma varredura.
+    """
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        state_key = self.key_builder.build(key, "state")
+        data_key = self.key_builder.build(key, "data")
+
+        if state is None:
+            await self.redis.delete(state_key)
+            return
+
+        state_name = state.state if isinstance(state, State) else state
+        ttl = get_state_ttl(state_name) or self.state_ttl
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.set(state_key, state_name, ex=ttl)
+            if ttl:
+                pipe.expire(data_key, ttl)
+            elif self.data_ttl is None:
+                pipe.persist(data_key)
+            await pipe.execute()
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        data_key = self.key_builder.build(key, "data")
+
+        if not data:
+            await self.redis.delete(data_key)
+            return
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.set(data_key, self.json_dumps(data), ex=self.data_ttl)
+            pipe.pttl(self.key_builder.build(key, "state"))
+            _, state_pttl = await pipe.execute()
+
+        # Mantém os dados vivos apenas enquanto o estado temporário existir
+        if state_pttl and state_pttl > 0:
+            await self.redis.pexpire(data_key, state_pttl)
@@ -0,0 +1,151 @@
+"""
+Servidor local que fala o protocolo do Redis (RESP) para testar o storage do FSM
+Implementa apenas os comandos usados pelo TimedRedisStorage, em memória
+
+Uso:
+    python -m states.redis_stub_server --port 6380
+    FSM_STORAGE=redis FSM_REDIS_URL=redis://127.0.0.1:6380/0 python main.py
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+class RedisStub:
+    """Chaves do tipo string com expiração, no formato esperado pelo redis-py"""
+
+    def __init__(self):
+        # chave -> (valor, expira_em em monotonic ou None)
+        self.store: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+
+    def _get(self, key: bytes) -> Optional[bytes]:
+        entry = self.store.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.store[key]
+            return None
+        return value
+
+    def _set_expiry(self, key: bytes, seconds: Optional[float]) -> int:
+        if self._get(key) is None:
+            return 0
+        value, _ = self.store[key]
+        self.store[key] = (value, time.monotonic() + seconds if seconds is not None else None)
+        return 1
+
+    def _pttl(self, key: bytes) -> int:
+        if self._get(key) is None:
+            return -2
+        _, expires_at = self.store[key]
+        if expires_at is None:
+            return -1
+        return max(0, int((expires_at - time.monotonic()) * 1000))
+
+    def execute(self, args: List[bytes]):
+        """Executa um comando e retorna o valor a ser serializado"""
+        command = args[0].upper().decode()
+        params = args[1:]
+
+        if command == "PING":
+            return "PONG"
+        if command in ("SELECT", "CLIENT", "FLUSHALL", "FLUSHDB"):
+            if command.startswith("FLUSH"):
+                self.store.clear()
+            return "OK"
+        if command == "GET":
+            return self._get(params[0])
+        if command == "SET":
+            key, value, options = params[0], params[1], [p.upper() for p in params[2:]]
+            expires_at = None
+            if b"EX" in options:
+                expires_at = time.monotonic() + int(params[2 + options.index(b"EX") + 1])
+            elif b"PX" in options:
+                expires_at = time.monotonic() + int(params[2 + options.index(b"PX") + 1]) / 1000
+            self.store[key] = (value, expires_at)
+            return "OK"
+        if command == "DEL":
+            deleted = 0
+            for key in params:
+                if self._get(key) is not None:
+                    del self.store[key]
+                    deleted += 1
+            return deleted
+        if command == "EXISTS":
+            return sum(1 for key in params if self._get(key) is not None)
+        if command == "EXPIRE":
+            return self._set_expiry(params[0], int(params[1]))
+        if command == "PEXPIRE":
+            return self._set_expiry(params[0], int(params[1]) / 1000)
+        if command == "PERSIST":
+            return self._set_expiry(params[0], None)
+        if command == "PTTL":
+            return self._pttl(params[0])
+        if command == "TTL":
+            pttl = self._pttl(params[0])
+            return pttl if pttl < 0 else pttl // 1000
+        if command == "DBSIZE":
+            return sum(1 for key in list(self.store) if self._get(key) is not None)
+        return Exception(f"ERR unknown command '{command}'")
+
+def encode(value) -> bytes:
+    """Serializa uma resposta no formato RESP2"""
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, Exception):
+        return f"-{value}\r\n".encode()
+    if isinstance(value, str):
+        return f"+{value}\r\n".encode()
+    if isinstance(value, int):
+        return f":{value}\r\n".encode()
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+async def read_command(reader: asyncio.StreamReader) -> Optional[List[bytes]]:
+    """Lê um comando RESP (array de bulk strings)"""
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        return line.strip().split()  # Comando inline (ex: redis-cli via telnet)
+
+    args = []
+    for _ in range(int(line[1:])):
+        length = int((await reader.readline())[1:])
+        args.append((await reader.readexactly(length + 2))[:-2])
+    return args
+
+async def serve_client(stub: RedisStub, reader: asyncio.StreamReader,
+                       writer: asyncio.StreamWriter):
+    try:
+        while True:
+            args = await read_command(reader)
+            if args is None:
+                break
+            if args:
+                writer.write(encode(stub.execute(args)))
+                await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionResetError):
+        pass
+    finally:
+        writer.close()
+
+async def run(host: str, port: int):
+    stub = RedisStub()
+    server = await asyncio.start_server(
+        lambda r, w: serve_client(stub, r, w), host, port
+    )
+    print(f"Redis falso escutando em {host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor falso com protocolo do Redis")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6380)
+    args = parser.parse_args()
+    asyncio.run(run(args.host, args.port))
+
+if __name__ == "__main__":
+    main()
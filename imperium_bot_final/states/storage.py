@@ -0,0 +1,282 @@
+"""
+Armazenamento persistente dos estados do FSM para o Imperium™ Bot
+Mantém estados e dados dos usuários entre reinícios e respeita TEMPORARY_STATES
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from config.settings import (
+    FSM_STORAGE, FSM_REDIS_URL, FSM_FLUSH_INTERVAL, FSM_FLUSH_MAX_PENDING, FSM_PURGE_INTERVAL
+)
+from database.models import db_manager
+from database.pool import ConnectionPool
+from states.user_states import get_state_ttl
+from utils.logger import logger
+
+def build_storage_key(key: StorageKey) -> str:
+    """
+    Converte a chave do aiogram em texto para o banco
+
+    Args:
+        key: Chave do FSM (bot, chat, usuário, tópico e destino)
+
+    Returns:
+        Chave no formato "bot:chat:usuário:tópico:destino"
+    """
+    thread_id = key.thread_id if key.thread_id is not None else ""
+    return f"{key.bot_id}:{key.chat_id}:{key.user_id}:{thread_id}:{key.destiny}"
+
+class SQLiteStorage(BaseStorage):
+    """
+    Storage do FSM na tabela fsm_storage do banco do bot
+
+    As escritas ficam em um buffer e são gravadas em lote a cada
+    FSM_FLUSH_INTERVAL segundos (ou antes, se o buffer encher), em uma única
+    transação. Leituras consultam o buffer antes do banco, então o processo
+    sempre enxerga as próprias escritas.
+
+    Estados de TEMPORARY_STATES recebem expires_at; depois disso o estado e os
+    dados do usuário são tratados como inexistentes e removidos na limpeza.
+    """
+
+    def __init__(self, pool: Optional[ConnectionPool] = None,
+                 flush_interval: float = FSM_FLUSH_INTERVAL,
+                 max_pending: int = FSM_FLUSH_MAX_PENDING,
+                 purge_interval: float = FSM_PURGE_INTERVAL):
+        self.pool = pool or db_manager.pool
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.purge_interval = purge_interval
+        # chave -> {"state": (nome, expires_at), "data": json}
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._flushing: Dict[str, Dict[str, Any]] = {}
+        self._dirty: Optional[asyncio.Event] = None
+        self._full: Optional[asyncio.Event] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._last_purge = time.monotonic()
+        self._closed = False
+        self.flushes = 0
+        self.rows_written = 0
+
+    # ----- Buffer de escrita -----
+
+    def _schedule_flush(self):
+        """Acorda a tarefa de gravação, iniciando-a se necessário"""
+        if self._dirty is None:
+            self._dirty = asyncio.Event()
+            self._full = asyncio.Event()
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+        self._dirty.set()
+        if len(self._pending) >= self.max_pending:
+            self._full.set()
+
+    async def _flush_loop(self):
+        """Grava o buffer em lotes enquanto o storage estiver aberto"""
+        while not self._closed:
+            await self._dirty.wait()
+            if len(self._pending) < self.max_pending:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            self._dirty.clear()
+            self._full.clear()
+
+            await self.flush()
+            if time.monotonic() - self._last_purge >= self.purge_interval:
+                await self.purge_expired()
+
+    def _requeue(self, batch: Dict[str, Dict[str, Any]]):
+        """Devolve ao buffer um lote não gravado, sem sobrescrever alterações mais novas"""
+        for key, entry in batch.items():
+            newer = self._pending.setdefault(key, {})
+            for field, value in entry.items():
+                newer.setdefault(field, value)
+
+    async def flush(self) -> int:
+        """
+        Grava todas as alterações pendentes em uma transação
+
+        Returns:
+            Quantidade de chaves gravadas
+        """
+        if not self._pending:
+            return 0
+
+        self._flushing, self._pending = self._pending, {}
+        batch = self._flushing
+
+        state_rows = [
+            (key, entry["state"][0], entry["state"][1])
+            for key, entry in batch.items() if "state" in entry
+        ]
+        data_rows = [
+            (key, entry["data"]) for key, entry in batch.items() if "data" in entry
+        ]
+
+        try:
+            async with self.pool.writer() as db:
+                if state_rows:
+                    await db.executemany("""
+                        INSERT INTO fsm_storage (key, state, expires_at) VALUES (?, ?, ?)
+                        ON CONFLICT(key) DO UPDATE
+                        SET state = excluded.state, expires_at = excluded.expires_at
+                    """, state_rows)
+                if data_rows:
+                    await db.executemany("""
+                        INSERT INTO fsm_storage (key, data) VALUES (?, ?)
+                        ON CONFLICT(key) DO UPDATE SET data = excluded.data
+                    """, data_rows)
+                # Chaves sem estado e sem dados não precisam ocupar espaço
+                await db.executemany("""
+                    DELETE FROM fsm_storage
+                    WHERE key = ? AND state IS NULL AND (data IS NULL OR data = '{}')
+                """, [(key,) for key in batch])
+        except asyncio.CancelledError:
+            self._requeue(batch)
+            raise
+        except Exception as e:
+            logger.error(f"Erro ao gravar estados do FSM ({len(batch)} chaves): {e}")
+            self._requeue(batch)
+            return 0
+        finally:
+            self._flushing = {}
+
+        self.flushes += 1
+        self.rows_written += len(batch)
+        return len(batch)
+
+    async def purge_expired(self) -> int:
+        """
+        Remove do banco os estados temporários vencidos
+
+        Returns:
+            Quantidade de linhas removidas
+        """
+        self._last_purge = time.monotonic()
+        try:
+            async with self.pool.writer() as db:
+                cursor = await db.execute("""
+                    DELETE FROM fsm_storage
+                    WHERE expires_at IS NOT NULL AND expires_at <= ?
+                """, (time.time(),))
+                return cursor.rowcount
+        except Exception as e:
+            logger.error(f"Erro ao remover estados expirados do FSM: {e}")
+            return 0
+
+    # ----- Leitura -----
+
+    def _buffered(self, key: str, field: str) -> Tuple[bool, Any]:
+        """Procura um campo alterado e ainda não gravado no banco"""
+        for buffer in (self._pending, self._flushing):
+            entry = buffer.get(key)
+            if entry and field in entry:
+                return True, entry[field]
+        return False, None
+
+    async def _load(self, key: str) -> Tuple[Optional[str], Optional[str], Optional[float]]:
+        """
+        Monta o registro atual de uma chave (buffer sobre o banco)
+
+        Returns:
+            Tupla (estado, dados em JSON, expires_at)
+        """
+        has_state, state = self._buffered(key, "state")
+        has_data, data = self._buffered(key, "data")
+
+        if not (has_state and has_data):
+            async with self.pool.reader() as db:
+                cursor = await db.execute(
+                    "SELECT state, data, expires_at FROM fsm_storage WHERE key = ?", (key,)
+                )
+                row = await cursor.fetchone()
+            if row:
+                if not has_state:
+                    state = (row['state'], row['expires_at'])
+                if not has_data:
+                    data = row['data']
+
+        state_name, expires_at = state if state else (None, None)
+        return state_name, data, expires_at
+
+    @staticmethod
+    def _is_expired(expires_at: Optional[float]) -> bool:
+        return expires_at is not None and expires_at <= time.time()
+
+    # ----- Interface do aiogram -----
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        state_name = state.state if isinstance(state, State) else state
+        ttl = get_state_ttl(state_name) if state_name else 0
+        expires_at = time.time() + ttl if ttl else None
+
+        self._pending.setdefault(build_storage_key(key), {})["state"] = (state_name, expires_at)
+        self._schedule_flush()
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        state_name, _, expires_at = await self._load(build_storage_key(key))
+        if self._is_expired(expires_at):
+            return None
+        return state_name
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        self._pending.setdefault(build_storage_key(key), {})["data"] = json.dumps(
+            data, ensure_ascii=False
+        )
+        self._schedule_flush()
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        _, data, expires_at = await self._load(build_storage_key(key))
+        if not data or self._is_expired(expires_at):
+            return {}
+        return json.loads(data)
+
+    async def close(self) -> None:
+        """Grava o que estiver pendente e encerra a tarefa de gravação"""
+        if self._closed:
+            return
+        self._closed = True
+
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+
+def create_fsm_storage(backend: str = FSM_STORAGE) -> BaseStorage:
+    """
+    Cria o storage do FSM configurado em FSM_STORAGE
+
+    Args:
+        backend: "sqlite", "redis" ou "memory"
+
+    Returns:
+        Instância do storage para o Dispatcher
+    """
+    if backend == "sqlite":
+        return SQLiteStorage()
+
+    if backend == "redis":
+        try:
+            from states.redis_storage import TimedRedisStorage
+        except ImportError:
+            raise RuntimeError("FSM_STORAGE=redis requer o pacote redis (pip install redis)")
+        return TimedRedisStorage.from_url(FSM_REDIS_URL)
+
+    if backend == "memory":
+        logger.warning("FSM_STORAGE=memory: estados dos usuários serão perdidos ao reiniciar")
+        return MemoryStorage()
+
+    raise ValueError(f"FSM_STORAGE inválido: {backend} (use 'sqlite', 'redis' ou 'memory')")
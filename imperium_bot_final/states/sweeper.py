@@ -0,0 +1,209 @@
+"""
+Expiração dos estados temporários do FSM para o Imperium™ Bot
+Registra quando cada usuário entra em um estado e aplica TEMPORARY_STATES e CLEANUP_STATES
+"""
+
+import heapq
+import itertools
+import json
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from config.settings import FSM_CLEANUP_GRACE
+from states.user_states import CLEANUP_STATE_NAMES, get_state_ttl
+from utils.logger import logger
+
+# Ações agendadas no heap
+EXPIRE = "expire"    # Estado temporário venceu: limpa estado e dados
+CLEANUP = "cleanup"  # Estado final de fluxo: descarta apenas os dados
+
+def estimate_size(data: Dict[str, Any]) -> int:
+    """
+    Estima em bytes o espaço ocupado pelos dados de um usuário
+
+    Args:
+        data: Dados do FSM
+
+    Returns:
+        Tamanho aproximado (JSON em UTF-8)
+    """
+    if not data:
+        return 0
+    return len(json.dumps(data, ensure_ascii=False, default=str).encode())
+
+class StateSweeper:
+    """
+    Heap de prazos por usuário
+
+    Cada mudança de estado agenda no máximo uma expiração e uma limpeza por
+    chave. Entradas antigas continuam no heap, mas são ignoradas ao sair dele
+    (o prazo vigente fica em _deadlines), então registrar é O(log n) e cada
+    varredura só toca nos prazos já vencidos.
+    """
+
+    def __init__(self, cleanup_grace: float = FSM_CLEANUP_GRACE):
+        self.cleanup_grace = cleanup_grace
+        self.storage: Optional[BaseStorage] = None
+        self._heap: List[Tuple[float, int, StorageKey, str, str]] = []
+        self._deadlines: Dict[Tuple[StorageKey, str], float] = {}
+        self._sequence = itertools.count()
+        self.totals = {"expired": 0, "cleaned": 0, "bytes_reclaimed": 0, "sweeps": 0}
+
+    def wrap(self, storage: BaseStorage) -> BaseStorage:
+        """
+        Passa a acompanhar as mudanças de estado gravadas no storage
+
+        Args:
+            storage: Storage do FSM
+
+        Returns:
+            Storage a ser entregue ao Dispatcher
+        """
+        self.storage = storage
+        return TrackingStorage(storage, self)
+
+    @property
+    def tracked(self) -> int:
+        """Prazos vigentes aguardando vencimento"""
+        return len(self._deadlines)
+
+    def _schedule(self, key: StorageKey, action: str, state_name: str, delay: float):
+        deadline = time.monotonic() + delay
+        self._deadlines[(key, action)] = deadline
+        heapq.heappush(self._heap, (deadline, next(self._sequence), key, action, state_name))
+
+    def track(self, key: StorageKey, state_name: Optional[str]):
+        """
+        Registra a entrada de um usuário em um novo estado
+
+        Args:
+            key: Chave do FSM do usuário
+            state_name: Nome do novo estado (None quando o estado foi limpo)
+        """
+        ttl = get_state_ttl(state_name) if state_name else 0
+        if ttl:
+            self._schedule(key, EXPIRE, state_name, ttl)
+        else:
+            self._deadlines.pop((key, EXPIRE), None)
+
+        if state_name in CLEANUP_STATE_NAMES:
+            self._schedule(key, CLEANUP, state_name, self.cleanup_grace)
+        else:
+            self._deadlines.pop((key, CLEANUP), None)
+
+        # Muitas entradas antigas acumuladas: reconstrói o heap só com as vigentes
+        if len(self._heap) > 2 * len(self._deadlines) + 1000:
+            self._compact()
+
+    def _compact(self):
+        """Remove do heap as entradas que não valem mais"""
+        self._heap = [
+            entry for entry in self._heap
+            if self._deadlines.get((entry[2], entry[3])) == entry[0]
+        ]
+        heapq.heapify(self._heap)
+
+    async def _apply(self, key: StorageKey, action: str, state_name: str) -> Tuple[bool, int]:
+        """
+        Expira ou limpa uma chave se o usuário ainda estiver no mesmo estado
+
+        Returns:
+            Tupla (aplicado, bytes liberados)
+        """
+        current = await self.storage.get_state(key)
+        # Storages com TTL (SQLite, Redis) já devolvem None para o estado vencido
+        if current != state_name and not (action == EXPIRE and current is None):
+            return False, 0
+
+        data = await self.storage.get_data(key)
+        reclaimed = estimate_size(data)
+
+        if action == EXPIRE:
+            await self.storage.set_state(key, None)
+            self._deadlines.pop((key, CLEANUP), None)
+        await self.storage.set_data(key, {})
+
+        # MemoryStorage mantém um registro vazio por chave; remove de vez
+        if isinstance(self.storage, MemoryStorage) and action == EXPIRE:
+            self.storage.storage.pop(key, None)
+
+        return True, reclaimed
+
+    async def sweep(self) -> Dict[str, int]:
+        """
+        Aplica todos os prazos vencidos
+
+        Returns:
+            Dict com estados expirados, dados limpos e bytes liberados
+        """
+        result = {"expired": 0, "cleaned": 0, "bytes_reclaimed": 0}
+        if not self.storage:
+            return result
+
+        now = time.monotonic()
+        while self._heap and self._heap[0][0] <= now:
+            deadline, _, key, action, state_name = heapq.heappop(self._heap)
+            if self._deadlines.get((key, action)) != deadline:
+                continue  # Usuário mudou de estado depois deste agendamento
+            del self._deadlines[(key, action)]
+
+            try:
+                applied, reclaimed = await self._apply(key, action, state_name)
+            except Exception as e:
+                logger.error(f"Erro ao expirar estado do usuário {key.user_id}: {e}")
+                continue
+
+            if applied:
+                result["expired" if action == EXPIRE else "cleaned"] += 1
+                result["bytes_reclaimed"] += reclaimed
+
+        for name, value in result.items():
+            self.totals[name] += value
+        self.totals["sweeps"] += 1
+
+        if result["expired"] or result["cleaned"]:
+            logger.info(
+                f"Varredura de estados: {result['expired']} expirados, "
+                f"{result['cleaned']} limpos, {result['bytes_reclaimed']} bytes liberados "
+                f"({self.tracked} prazos pendentes)"
+            )
+        return result
+
+class TrackingStorage(BaseStorage):
+    """
+    Storage que informa ao sweeper cada estado gravado
+
+    O registro acontece na escrita, sem reler o estado depois dos handlers.
+    Vale também para mudanças feitas fora de um handler.
+    """
+
+    def __init__(self, storage: BaseStorage, sweeper: StateSweeper):
+        self.storage = storage
+        self.sweeper = sweeper
+
+    def __getattr__(self, name: str) -> Any:
+        # flush, purge_expired etc. do storage real
+        return getattr(self.storage, name)
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        await self.storage.set_state(key, state)
+        self.sweeper.track(key, state.state if isinstance(state, State) else state)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        return await self.storage.get_state(key)
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        await self.storage.set_data(key, data)
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        return await self.storage.get_data(key)
+
+    async def close(self) -> None:
+        await self.storage.close()
+
+# Instância global do sweeper de estados
+state_sweeper = StateSweeper()
@@ -255,6 +255,22 @@ def get_state_timeout(state) -> int:
     """
     return TEMPORARY_STATES.get(state, 0)
 
+# Mesmo mapeamento indexado pelo nome gravado no storage ("Grupo:ESTADO")
+TEMPORARY_STATE_NAMES = {state.state: minutes for state, minutes in TEMPORARY_STATES.items()}
+
+def get_state_ttl(state) -> int:
+    """
+    Retorna o tempo de vida do estado em segundos
+    
+    Args:
+        state: Estado (objeto State ou nome gravado no storage)
+    
+    Returns:
+        Segundos até o estado expirar ou 0 se não expira
+    """
+    state_name = state.state if isinstance(state, State) else state
+    return TEMPORARY_STATE_NAMES.get(state_name, 0) * 60
+
 def is_admin_state(state) -> bool:
     """
     Verifica se é um estado administrativo
@@ -380,4 +396,7 @@ def requires_cleanup(state) -> bool:
     Returns:
         True se requer limpeza, False caso contrário
     """
-    return state in CLEANUP_STATES
\ No newline at end of file
+    return state in CLEANUP_STATES
+
+# Mesmo conjunto indexado pelo nome gravado no storage ("Grupo:ESTADO")
+CLEANUP_STATE_NAMES = {state.state for state in CLEANUP_STATES}
\ No newline at end of file
@@ -0,0 +1,129 @@
+"""
+Cache assíncrono em memória para o Imperium™ Bot
+TTL por entrada, limite LRU e coalescência de cargas concorrentes da mesma chave
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+class AsyncTTLCache:
+    """Cache com expiração, limite de tamanho e proteção contra stampede"""
+
+    def __init__(self, ttl: float, maxsize: int = 10000, cache_none: bool = False):
+        """
+        Args:
+            ttl: Segundos que uma entrada permanece válida
+            maxsize: Número máximo de entradas (as menos usadas saem primeiro)
+            cache_none: Se True, resultados None também são guardados
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.cache_none = cache_none
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Busca uma entrada válida sem disparar carga
+
+        Args:
+            key: Chave da entrada
+
+        Returns:
+            Tupla (encontrado, valor)
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return False, None
+
+        self._entries.move_to_end(key)
+        return True, value
+
+    def set(self, key: Hashable, value: Any):
+        """Guarda um valor, descartando as entradas menos usadas se necessário"""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        """Remove uma entrada e descarta cargas em andamento para ela"""
+        self._entries.pop(key, None)
+        # A carga em andamento ainda responde a quem já espera, mas não é gravada
+        self._inflight.pop(key, None)
+
+    def clear(self):
+        """Remove todas as entradas"""
+        self._entries.clear()
+        self._inflight.clear()
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Retorna o valor em cache ou executa o loader uma única vez
+
+        Chamadas concorrentes para a mesma chave aguardam a mesma carga.
+
+        Args:
+            key: Chave da entrada
+            loader: Função assíncrona que busca o valor na origem
+
+        Returns:
+            Valor em cache ou recém-carregado
+        """
+        found, value = self.get(key)
+        if found:
+            self.hits += 1
+            return value
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+
+        try:
+            value = await loader()
+        except BaseException as e:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+            if isinstance(e, Exception):
+                future.set_exception(e)
+                # Evita aviso de exceção não consumida quando ninguém mais espera
+                future.exception()
+            else:
+                future.cancel()
+            raise
+
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+            if value is not None or self.cache_none:
+                self.set(key, value)
+        future.set_result(value)
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Contadores de uso do cache
+
+        Returns:
+            Dict com hits, misses, cargas coalescidas e tamanho atual
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "size": len(self._entries)
+        }
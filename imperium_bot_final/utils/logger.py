@@ -5,101 +5,390 @@ Implementa logging local em arquivo e envio para canal do Telegram
 
 import logging
 import asyncio
+import atexit
+import copy
+import html
+import json
 import os
+import queue
+import random
+import threading
+import time
+from collections import deque
 from datetime import datetime
-from typing import Optional
-from logging.handlers import RotatingFileHandler
+from typing import Deque, Dict, List, Optional, Tuple
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from aiogram import Bot
-from config.settings import CANAL_LOGS_ID, BOT_TOKEN, LOG_FORMAT, LOG_FILE
+from aiogram.exceptions import TelegramRetryAfter
+from config.settings import (
+    CANAL_LOGS_ID, BOT_TOKEN, LOG_FORMAT, LOG_FILE, LOG_JSON_FILE, LOG_BATCH_SIZE,
+    LOG_SAMPLE_RATES, TELEGRAM_LOG_MAX_QUEUE,
+    TELEGRAM_LOG_BATCH_DELAY, TELEGRAM_LOG_MIN_INTERVAL, TELEGRAM_LOG_MESSAGE_LIMIT
+)
+from utils.rate_limiter import REPORTS, send_lane, set_send_lane, telegram_rate_limiter
 
 class TelegramLogHandler(logging.Handler):
-    """Handler personalizado para enviar logs para o Telegram"""
+    """
+    Handler que envia WARNING, ERROR e CRITICAL para o canal de logs do Telegram
+
+    emit() pode ser chamado de qualquer thread: o registro entra em filas
+    limitadas (uma por nível) protegidas por lock, e o event loop é acordado
+    com call_soon_threadsafe. Uma única tarefa no loop junta os registros em
+    mensagens de até 4096 caracteres, agrupando erros repetidos com contador.
+    Com a fila cheia, descarta primeiro os registros de menor nível.
+    """
+    
+    EMOJI_MAP = {
+        logging.DEBUG: "🔍",
+        logging.INFO: "ℹ️",
+        logging.WARNING: "⚠️",
+        logging.ERROR: "❌",
+        logging.CRITICAL: "🚨"
+    }
     
-    def __init__(self, bot_token: str, chat_id: str):
+    def __init__(self, bot_token: str, chat_id: str,
+                 max_queue: int = TELEGRAM_LOG_MAX_QUEUE,
+                 batch_delay: float = TELEGRAM_LOG_BATCH_DELAY,
+                 min_interval: float = TELEGRAM_LOG_MIN_INTERVAL):
         super().__init__()
         self.bot_token = bot_token
         self.chat_id = chat_id
         self.bot = None
-        self._log_queue = []
-        self._processing = False
+        self.max_queue = max_queue
+        self.batch_delay = batch_delay
+        self.min_interval = min_interval
+        
+        self._lock = threading.Lock()
+        self._queues: Dict[int, Deque[dict]] = {}  # nível -> entradas em ordem de chegada
+        self._index: Dict[tuple, dict] = {}  # (nível, logger, mensagem) -> entrada na fila
+        self._size = 0
+        self._dropped: Dict[str, int] = {}  # descartes ainda não informados no canal
+        
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._wakeup_scheduled = False
+        self._task: Optional[asyncio.Task] = None
+        self._last_send = 0.0
+        
+        self.stats = {"sent_messages": 0, "sent_records": 0, "coalesced": 0,
+                      "dropped": 0, "failed": 0}
     
-    async def _init_bot(self):
-        """Inicializa o bot se necessário"""
+    async def start(self):
+        """Liga o envio ao event loop atual"""
+        if self._task and not self._task.done():
+            return
         if not self.bot:
             self.bot = Bot(token=self.bot_token)
+            # Mesmo token do bot principal: divide o mesmo limite de chamadas
+            self.bot.session.middleware(telegram_rate_limiter)
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._sender())
+        self._schedule_wakeup()  # Registros emitidos antes do start
     
     def emit(self, record):
-        """Envia log para o Telegram de forma assíncrona"""
-        if record.levelno >= logging.WARNING:  # Apenas WARNING, ERROR e CRITICAL
-            try:
-                # Adicionar à fila de logs
-                self._log_queue.append(record)
+        """Enfileira o registro sem bloquear nem depender do event loop"""
+        try:
+            message = record.getMessage()
+            if record.exc_info:
+                # Apenas a última linha do traceback; o arquivo local guarda o resto
+                message += f"\n{self._exception_text(record).strip().splitlines()[-1]}"
+            key = (record.levelno, record.name, message)
+            
+            with self._lock:
+                entry = self._index.get(key)
+                if entry is not None:
+                    entry["count"] += 1
+                    entry["last"] = record.created
+                    self.stats["coalesced"] += 1
+                    return
                 
-                # Processar fila se não estiver processando
-                if not self._processing:
-                    asyncio.create_task(self._process_log_queue())
-            except Exception:
-                pass  # Não gerar erro se falhar o log remoto
+                if self._size >= self.max_queue and not self._drop_lower(record.levelno):
+                    self._count_drop(record.levelname)
+                    return
+                
+                entry = {"key": key, "levelno": record.levelno, "levelname": record.levelname,
+                         "name": record.name, "message": message, "count": 1,
+                         "first": record.created, "last": record.created}
+                self._queues.setdefault(record.levelno, deque()).append(entry)
+                self._index[key] = entry
+                self._size += 1
+            
+            self._schedule_wakeup()
+        except Exception:
+            pass  # Não gerar erro se falhar o log remoto
     
-    async def _process_log_queue(self):
-        """Processa a fila de logs para envio"""
-        if self._processing:
-            return
+    @staticmethod
+    def _exception_text(record) -> str:
+        """Texto da exceção anexada ao registro"""
+        return record.exc_text or logging.Formatter().formatException(record.exc_info)
+    
+    def _drop_lower(self, levelno: int) -> bool:
+        """
+        Abre espaço descartando o registro mais antigo de menor nível
         
-        self._processing = True
+        Deve ser chamado com o lock adquirido.
         
+        Returns:
+            True se abriu espaço, False se o novo registro é o de menor nível
+        """
+        for queued_level in sorted(self._queues):
+            if queued_level > levelno:
+                break
+            queue = self._queues[queued_level]
+            if queue:
+                entry = queue.popleft()
+                del self._index[entry["key"]]
+                self._size -= 1
+                self._count_drop(entry["levelname"], entry["count"])
+                return True
+        return False
+    
+    def _count_drop(self, levelname: str, count: int = 1):
+        self._dropped[levelname] = self._dropped.get(levelname, 0) + count
+        self.stats["dropped"] += count
+    
+    def _schedule_wakeup(self):
+        """Acorda a tarefa de envio a partir de qualquer thread"""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        with self._lock:
+            if self._wakeup_scheduled:
+                return
+            self._wakeup_scheduled = True
         try:
-            await self._init_bot()
-            
-            while self._log_queue:
-                record = self._log_queue.pop(0)
-                await self._send_log_message(record)
-                await asyncio.sleep(1)  # Evitar spam
-        except Exception:
-            pass  # Falha silenciosa para não quebrar o bot
-        finally:
-            self._processing = False
+            loop.call_soon_threadsafe(self._wakeup.set)
+        except RuntimeError:
+            self._wakeup_scheduled = False  # Loop encerrado
+    
+    def _drain(self) -> Tuple[List[dict], Dict[str, int]]:
+        """Retira da fila todas as entradas e o total de descartes"""
+        with self._lock:
+            entries = [entry for queue in self._queues.values() for entry in queue]
+            self._queues.clear()
+            self._index.clear()
+            self._size = 0
+            dropped, self._dropped = self._dropped, {}
+            self._wakeup_scheduled = False
+        entries.sort(key=lambda entry: entry["first"])
+        return entries, dropped
+    
+    def _format_entry(self, entry: dict) -> str:
+        """Formata uma entrada (possivelmente agrupada) para o Telegram"""
+        emoji = self.EMOJI_MAP.get(entry["levelno"], "📝")
+        timestamp = datetime.fromtimestamp(entry["first"]).strftime("%d/%m %H:%M:%S")
+        header = f"{emoji} <b>{entry['levelname']}</b> <i>{timestamp}</i> <code>{html.escape(entry['name'])}</code>\n💬 "
+        footer = ""
+        if entry["count"] > 1:
+            last = datetime.fromtimestamp(entry["last"]).strftime("%H:%M:%S")
+            footer = f"\n🔁 <b>×{entry['count']}</b> (último às {last})"
+        
+        # Corta antes de escapar para não quebrar entidades HTML ao meio
+        available = TELEGRAM_LOG_MESSAGE_LIMIT - len(header) - len(footer) - 3
+        raw = entry["message"]
+        body = html.escape(raw)
+        if len(body) > available:
+            raw = raw[:available]
+            body = html.escape(raw)
+            while len(body) > available:
+                raw = raw[:-(len(body) - available)]
+                body = html.escape(raw)
+            body += "..."
+        return header + body + footer
+    
+    def _build_messages(self, entries: List[dict], dropped: Dict[str, int]) -> List[str]:
+        """Junta as entradas em mensagens dentro do limite do Telegram"""
+        blocks = [self._format_entry(entry) for entry in entries]
+        if dropped:
+            summary = ", ".join(f"{count} {level}" for level, count in dropped.items())
+            blocks.insert(0, f"🗑 <b>Descartados por excesso:</b> {summary}")
+        
+        messages, current = [], ""
+        for block in blocks:
+            if current and len(current) + 2 + len(block) > TELEGRAM_LOG_MESSAGE_LIMIT:
+                messages.append(current)
+                current = ""
+            current = f"{current}\n\n{block}" if current else block
+        if current:
+            messages.append(current)
+        return messages
     
-    async def _send_log_message(self, record):
-        """Envia mensagem de log para o Telegram"""
+    async def _send(self, text: str) -> bool:
+        """Envia uma mensagem respeitando o intervalo mínimo e o retry_after"""
+        for _ in range(2):
+            wait = self._last_send + self.min_interval - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                await self.bot.send_message(chat_id=self.chat_id, text=text, parse_mode="HTML")
+                self._last_send = time.monotonic()
+                return True
+            except TelegramRetryAfter as e:
+                await asyncio.sleep(e.retry_after)
+            except Exception:
+                break
+        self._last_send = time.monotonic()
+        self.stats["failed"] += 1
+        return False
+    
+    async def _flush(self):
+        """Envia tudo o que está na fila"""
+        entries, dropped = self._drain()
+        if not entries and not dropped:
+            return
+        for text in self._build_messages(entries, dropped):
+            if await self._send(text):
+                self.stats["sent_messages"] += 1
+        self.stats["sent_records"] += sum(entry["count"] for entry in entries)
+    
+    async def _sender(self):
+        """Tarefa única que agrupa e envia os registros"""
+        set_send_lane(REPORTS)  # Depois das respostas aos usuários
+        while True:
+            await self._wakeup.wait()
+            # Espera um pouco para juntar rajadas em uma única mensagem
+            await asyncio.sleep(self.batch_delay)
+            self._wakeup.clear()
+            try:
+                await self._flush()
+            except Exception:
+                pass  # Falha silenciosa para não quebrar o bot
+    
+    async def shutdown(self):
+        """Envia o que restou na fila e encerra a tarefa de envio"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
         try:
-            # Formatr mensagem de log
-            message = self._format_telegram_message(record)
-            
-            if len(message) > 4096:  # Limite do Telegram
-                message = message[:4090] + "..."
-            
-            await self.bot.send_message(
-                chat_id=self.chat_id,
-                text=message,
-                parse_mode="HTML"
-            )
+            await self._flush()
         except Exception:
-            pass  # Falha silenciosa
-    
-    def _format_telegram_message(self, record) -> str:
-        """Formata mensagem de log para o Telegram"""
-        # Emoji por nível de log
-        emoji_map = {
-            logging.DEBUG: "🔍",
-            logging.INFO: "ℹ️",
-            logging.WARNING: "⚠️",
-            logging.ERROR: "❌", 
-            logging.CRITICAL: "🚨"
+            pass
+        self._loop = None
+        if self.bot:
+            await self.bot.session.close()
+
+class BatchFlushMixin:
+    """
+    Adia o flush do stream para o fim de cada lote do QueueListener
+
+    Os registros de um lote saem em uma única escrita no disco/console em
+    vez de uma chamada de flush por registro.
+    """
+    
+    def flush(self):
+        pass  # Chamado a cada emit(); o flush real acontece em flush_batch()
+    
+    def flush_batch(self):
+        super().flush()
+
+class BatchedRotatingFileHandler(BatchFlushMixin, RotatingFileHandler):
+    """RotatingFileHandler com flush por lote"""
+
+class BatchedStreamHandler(BatchFlushMixin, logging.StreamHandler):
+    """StreamHandler com flush por lote"""
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formata cada registro como uma linha JSON com os campos extras"""
+    
+    # Atributos padrão de LogRecord que não entram como campos extras
+    RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "keep"}
+    
+    def format(self, record) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
         }
-        
-        emoji = emoji_map.get(record.levelno, "📝")
-        timestamp = datetime.fromtimestamp(record.created).strftime("%d/%m/%Y %H:%M:%S")
-        
-        message = f"{emoji} <b>{record.levelname}</b>\n"
-        message += f"🕐 <i>{timestamp}</i>\n"
-        message += f"📁 <code>{record.name}</code>\n"
-        message += f"💬 {record.getMessage()}\n"
-        
+        for key, value in record.__dict__.items():
+            if key not in self.RESERVED and not key.startswith("_"):
+                entry[key] = value
         if record.exc_info:
-            message += f"🔥 <code>{record.exc_text}</code>"
-        
-        return message
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class SamplingFilter(logging.Filter):
+    """
+    Amostragem por nível para eventos de alto volume
+    
+    Registros acima de INFO e os marcados com keep=True sempre passam.
+    """
+    
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = {logging.getLevelName(level): rate for level, rate in rates.items()}
+        self.dropped: Dict[str, int] = {}
+    
+    def filter(self, record) -> bool:
+        if record.levelno > logging.INFO or getattr(record, "keep", False):
+            return True
+        rate = self.rates.get(record.levelno, 1.0)
+        if rate >= 1.0 or random.random() < rate:
+            return True
+        self.dropped[record.levelname] = self.dropped.get(record.levelname, 0) + 1
+        return False
+
+class StructuredQueueHandler(QueueHandler):
+    """
+    QueueHandler que mantém mensagem e traceback separados no registro
+    
+    O QueueHandler padrão junta o traceback à mensagem; aqui ele vai em
+    exc_text, que os formatadores de texto e JSON tratam cada um do seu jeito.
+    """
+    
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+class BatchedQueueListener(QueueListener):
+    """QueueListener que processa os registros em lotes e faz um flush por lote"""
+    
+    def __init__(self, queue, *handlers, max_batch: int = LOG_BATCH_SIZE,
+                 respect_handler_level: bool = True):
+        super().__init__(queue, *handlers, respect_handler_level=respect_handler_level)
+        self.max_batch = max_batch
+    
+    def _monitor(self):
+        """Laço da thread de logs (substitui o da classe base)"""
+        q = self.queue
+        has_task_done = hasattr(q, "task_done")
+        running = True
+        while running:
+            batch = [self.dequeue(True)]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            
+            for record in batch:
+                if record is self._sentinel:
+                    running = False
+                else:
+                    self.handle(record)
+                if has_task_done:
+                    q.task_done()
+            
+            for handler in self.handlers:
+                flush_batch = getattr(handler, "flush_batch", None)
+                if flush_batch:
+                    try:
+                        flush_batch()
+                    except Exception:
+                        pass
 
 class ImperiumLogger:
     """Classe principal para gerenciamento de logs"""
@@ -107,6 +396,9 @@ class ImperiumLogger:
     def __init__(self):
         self.logger = None
         self.telegram_handler = None
+        self.listener = None
+        self.sampling_filter = None
+        self._listener_running = False
         self._setup_logger()
     
     def _setup_logger(self):
@@ -121,8 +413,12 @@ class ImperiumLogger:
         # Limpar handlers existentes
         self.logger.handlers.clear()
         
+        # Arquivo e console são escritos pela thread do QueueListener;
+        # o event loop só coloca o registro na fila
+        sinks = []
+        
         # Handler para arquivo local com rotação
-        file_handler = RotatingFileHandler(
+        file_handler = BatchedRotatingFileHandler(
             LOG_FILE,
             maxBytes=10*1024*1024,  # 10MB
             backupCount=5,
@@ -131,16 +427,40 @@ class ImperiumLogger:
         file_handler.setLevel(logging.DEBUG)
         file_formatter = logging.Formatter(LOG_FORMAT)
         file_handler.setFormatter(file_formatter)
-        self.logger.addHandler(file_handler)
+        sinks.append(file_handler)
         
         # Handler para console
-        console_handler = logging.StreamHandler()
+        console_handler = BatchedStreamHandler()
         console_handler.setLevel(logging.INFO)
         console_formatter = logging.Formatter(
             '%(asctime)s - %(levelname)s - %(message)s'
         )
         console_handler.setFormatter(console_formatter)
-        self.logger.addHandler(console_handler)
+        sinks.append(console_handler)
+        
+        # Saída estruturada opcional (uma linha JSON por registro)
+        if LOG_JSON_FILE:
+            os.makedirs(os.path.dirname(LOG_JSON_FILE) or ".", exist_ok=True)
+            json_handler = BatchedRotatingFileHandler(
+                LOG_JSON_FILE,
+                maxBytes=10*1024*1024,  # 10MB
+                backupCount=5,
+                encoding='utf-8'
+            )
+            json_handler.setLevel(logging.DEBUG)
+            json_handler.setFormatter(JsonLinesFormatter())
+            sinks.append(json_handler)
+        
+        log_queue = queue.SimpleQueue()
+        queue_handler = StructuredQueueHandler(log_queue)
+        self.sampling_filter = SamplingFilter(LOG_SAMPLE_RATES)
+        queue_handler.addFilter(self.sampling_filter)
+        self.logger.addHandler(queue_handler)
+        
+        self.listener = BatchedQueueListener(log_queue, *sinks)
+        self.listener.start()
+        self._listener_running = True
+        atexit.register(self.stop_listener)
         
         # Handler para Telegram (se configurado)
         if BOT_TOKEN and CANAL_LOGS_ID:
@@ -151,6 +471,26 @@ class ImperiumLogger:
             except Exception as e:
                 self.logger.warning(f"Não foi possível configurar logs remotos: {e}")
     
+    async def start(self):
+        """Inicia o envio de logs para o Telegram no event loop atual"""
+        if self.telegram_handler:
+            await self.telegram_handler.start()
+    
+    async def shutdown(self):
+        """Envia os logs remotos pendentes e encerra o envio"""
+        if self.telegram_handler:
+            await self.telegram_handler.shutdown()
+        await asyncio.to_thread(self.stop_listener)
+    
+    def stop_listener(self):
+        """Grava os registros ainda na fila e encerra a thread de logs"""
+        if not self._listener_running:
+            return
+        self._listener_running = False
+        self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+    
     def debug(self, message: str):
         """Log de debug"""
         self.logger.debug(message)
@@ -175,12 +515,26 @@ class ImperiumLogger:
         """Log de exceção com traceback"""
         self.logger.exception(message)
     
+    def _log_event(self, level: int, message: str, keep: bool = True, **fields):
+        """
+        Registra um evento com campos estruturados (usados na saída JSON)
+        
+        Args:
+            level: Nível do log
+            message: Mensagem legível
+            keep: Se False, o evento pode ser descartado pela amostragem de INFO
+            **fields: Campos extras do evento
+        """
+        self.logger.log(level, message, extra={"keep": keep, **fields})
+    
     async def log_user_action(self, user_id: int, action: str, details: str = ""):
         """Log específico para ações de usuários"""
         message = f"Usuário {user_id} - {action}"
         if details:
             message += f" - {details}"
-        self.info(message)
+        # Evento de alto volume: sujeito à amostragem de LOG_SAMPLE_RATES
+        self._log_event(logging.INFO, message, keep=False,
+                        user_id=user_id, action=action, details=details)
     
     async def log_payment_event(self, user_id: int, payment_id: str, 
                                event: str, amount: float = None):
@@ -188,11 +542,12 @@ class ImperiumLogger:
         message = f"Pagamento {payment_id} - Usuário {user_id} - {event}"
         if amount:
             message += f" - R$ {amount:.2f}"
-        self.info(message)
+        fields = {"user_id": user_id, "payment_id": payment_id, "event": event, "amount": amount}
+        self._log_event(logging.INFO, message, **fields)
         
         # Eventos importantes vão para o Telegram
         if event in ["APROVADO", "ERRO", "EXPIRADO"]:
-            self.warning(message)
+            self._log_event(logging.WARNING, message, **fields)
     
     async def log_affiliate_event(self, affiliate_id: int, referred_user_id: int, 
                                  event: str, commission: float = None):
@@ -200,10 +555,12 @@ class ImperiumLogger:
         message = f"Afiliado {affiliate_id} - Indicado {referred_user_id} - {event}"
         if commission:
             message += f" - Comissão: R$ {commission:.2f}"
-        self.info(message)
+        fields = {"affiliate_id": affiliate_id, "referred_user_id": referred_user_id,
+                  "event": event, "commission": commission}
+        self._log_event(logging.INFO, message, **fields)
         
         if event in ["NOVA_VENDA", "SAQUE_SOLICITADO"]:
-            self.warning(message)
+            self._log_event(logging.WARNING, message, **fields)
     
     async def log_admin_action(self, admin_id: int, action: str, target: str = ""):
         """Log específico para ações administrativas"""
@@ -217,11 +574,11 @@ class ImperiumLogger:
         message = f"Sistema - {event}"
         if details:
             message += f" - {details}"
-        self.info(message)
+        self._log_event(logging.INFO, message, event=event, details=details)
         
         # Eventos críticos do sistema
         if event in ["STARTUP", "SHUTDOWN", "ERROR", "DATABASE_ERROR"]:
-            self.warning(message)
+            self._log_event(logging.WARNING, message, event=event, details=details)
     
     async def send_daily_report(self, stats: dict):
         """Envia relatório diário para o canal de logs"""
@@ -236,11 +593,12 @@ class ImperiumLogger:
             report += f"\n🕐 Gerado em: {datetime.now().strftime('%d/%m/%Y às %H:%M')}"
             
             if self.telegram_handler and self.telegram_handler.bot:
-                await self.telegram_handler.bot.send_message(
-                    chat_id=CANAL_LOGS_ID,
-                    text=report,
-                    parse_mode="HTML"
-                )
+                with send_lane(REPORTS):
+                    await self.telegram_handler.bot.send_message(
+                        chat_id=CANAL_LOGS_ID,
+                        text=report,
+                        parse_mode="HTML"
+                    )
             
             self.info("Relatório diário enviado")
         except Exception as e:
@@ -260,11 +618,12 @@ class ImperiumLogger:
             alert_text = f"{emoji} <b>{title}</b>\n\n{message}\n\n🕐 {datetime.now().strftime('%d/%m/%Y às %H:%M')}"
             
             if self.telegram_handler and self.telegram_handler.bot:
-                await self.telegram_handler.bot.send_message(
-                    chat_id=CANAL_LOGS_ID,
-                    text=alert_text,
-                    parse_mode="HTML"
-                )
+                with send_lane(REPORTS):
+                    await self.telegram_handler.bot.send_message(
+                        chat_id=CANAL_LOGS_ID,
+                        text=alert_text,
+                        parse_mode="HTML"
+                    )
             
             # Também logar localmente
             getattr(self, level, self.info)(f"{title}: {message}")
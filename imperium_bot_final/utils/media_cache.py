@@ -0,0 +1,163 @@
+"""
+Cache de file_id das mídias estáticas do Imperium™ Bot
+Cada arquivo é enviado ao Telegram uma única vez; os envios seguintes reutilizam o file_id
+"""
+
+import asyncio
+import hashlib
+import os
+from typing import Awaitable, Callable, Dict, Optional, Tuple, Union
+
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import FSInputFile, Message
+
+from database.models import db_manager
+from utils.logger import logger
+
+# Função que envia a mídia recebendo um file_id ou o arquivo para upload
+MediaSender = Callable[[Union[str, FSInputFile]], Awaitable[Message]]
+
+def file_hash(path: str) -> str:
+    """
+    Calcula o SHA-256 do conteúdo de um arquivo
+
+    Args:
+        path: Caminho do arquivo
+
+    Returns:
+        Hash em hexadecimal
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def extract_file_id(message: Message, media_type: str) -> Optional[str]:
+    """
+    Obtém o file_id da mídia de uma mensagem enviada
+
+    Args:
+        message: Mensagem retornada pelo Telegram
+        media_type: Campo da mídia ("photo", "document", "video", "animation"...)
+
+    Returns:
+        file_id ou None se a mensagem não tiver essa mídia
+    """
+    media = getattr(message, media_type, None)
+    if isinstance(media, list):
+        media = media[-1] if media else None  # Fotos vêm em vários tamanhos; o último é o maior
+    return media.file_id if media else None
+
+class MediaCache:
+    """
+    Registro de file_id por arquivo, persistido na tabela media_files
+
+    O hash do conteúdo é recalculado apenas quando o mtime ou o tamanho do
+    arquivo mudam; se o hash não bater com o registrado, o arquivo é enviado
+    de novo e o file_id é substituído. Uploads simultâneos do mesmo arquivo
+    (ex: /start em massa durante uma campanha) são feitos uma única vez.
+    """
+
+    def __init__(self):
+        # caminho -> (mtime_ns, tamanho, hash)
+        self._signatures: Dict[str, Tuple[int, int, str]] = {}
+        # caminho -> (hash, file_id)
+        self._file_ids: Dict[str, Tuple[str, str]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.stats = {"hits": 0, "uploads": 0, "invalidations": 0}
+
+    async def _content_hash(self, path: str) -> str:
+        """Hash do arquivo, reaproveitado enquanto mtime e tamanho não mudarem"""
+        stat = os.stat(path)
+        signature = self._signatures.get(path)
+        if signature and signature[:2] == (stat.st_mtime_ns, stat.st_size):
+            return signature[2]
+
+        content_hash = await asyncio.to_thread(file_hash, path)
+        self._signatures[path] = (stat.st_mtime_ns, stat.st_size, content_hash)
+        return content_hash
+
+    async def _cached_file_id(self, path: str, content_hash: str) -> Optional[str]:
+        """Retorna o file_id registrado se ainda corresponder ao conteúdo atual"""
+        cached = self._file_ids.get(path)
+        if cached is None:
+            row = await db_manager.get_media_file(path)
+            if row:
+                cached = (row['content_hash'], row['file_id'])
+                self._file_ids[path] = cached
+
+        if cached is None:
+            return None
+        if cached[0] == content_hash:
+            return cached[1]
+
+        logger.info(f"Mídia alterada, será enviada novamente: {path}")
+        self.stats["invalidations"] += 1
+        self._file_ids.pop(path, None)
+        return None
+
+    async def invalidate(self, path: str):
+        """
+        Descarta o file_id registrado para um arquivo
+
+        Args:
+            path: Caminho do arquivo
+        """
+        path = os.path.normpath(path)
+        self._file_ids.pop(path, None)
+        self._signatures.pop(path, None)
+        await db_manager.delete_media_file(path)
+        self.stats["invalidations"] += 1
+
+    async def send(self, path: str, sender: MediaSender, media_type: str = "photo") -> Message:
+        """
+        Envia uma mídia estática reutilizando o file_id quando possível
+
+        Args:
+            path: Caminho do arquivo
+            sender: Função de envio (ex: lambda media: message.answer_photo(photo=media, ...))
+            media_type: Campo da mídia na mensagem retornada
+
+        Returns:
+            Mensagem enviada
+
+        Raises:
+            FileNotFoundError: se o arquivo não existir
+        """
+        path = os.path.normpath(path)
+        content_hash = await self._content_hash(path)
+
+        file_id = await self._cached_file_id(path, content_hash)
+        if file_id:
+            try:
+                result = await sender(file_id)
+                self.stats["hits"] += 1
+                return result
+            except TelegramBadRequest as e:
+                # file_id de outro bot ou descartado pelo Telegram; outros erros sobem
+                if "file" not in e.message.lower():
+                    raise
+                logger.warning(f"file_id de {path} recusado pelo Telegram, reenviando: {e.message}")
+                await self.invalidate(path)
+
+        lock = self._locks.setdefault(path, asyncio.Lock())
+        async with lock:
+            # Outro envio pode ter feito o upload enquanto este aguardava
+            cached = self._file_ids.get(path)
+            if cached and cached[0] == content_hash:
+                self.stats["hits"] += 1
+                return await sender(cached[1])
+
+            result = await sender(FSInputFile(path))
+            self.stats["uploads"] += 1
+
+            file_id = extract_file_id(result, media_type)
+            if file_id:
+                self._file_ids[path] = (content_hash, file_id)
+                await db_manager.save_media_file(path, content_hash, file_id, media_type)
+                logger.info(f"Mídia registrada no Telegram: {path}")
+            return result
+
+# Instância global do cache de mídias
+media_cache = MediaCache()
@@ -0,0 +1,243 @@
+"""
+Limite de chamadas de saída à API do Telegram para o Imperium™ Bot
+Token buckets global, por conversa e por grupo, com filas de prioridade e respeito ao retry_after
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import Response, TelegramMethod
+
+from config.settings import (
+    TELEGRAM_GLOBAL_RATE, TELEGRAM_GLOBAL_BURST, TELEGRAM_CHAT_RATE, TELEGRAM_CHAT_BURST,
+    TELEGRAM_GROUP_RATE, TELEGRAM_GROUP_BURST, TELEGRAM_MAX_RETRIES, TELEGRAM_MAX_CHAT_BUCKETS
+)
+
+# Filas de prioridade (menor valor sai primeiro)
+INTERACTIVE = 0  # Respostas a ações do usuário
+REPORTS = 1      # Canal de logs, relatórios e avisos automáticos
+BULK = 2         # Transmissões em massa
+
+LANE_NAMES = {INTERACTIVE: "interactive", REPORTS: "reports", BULK: "bulk"}
+
+_current_lane: ContextVar[int] = ContextVar("telegram_send_lane", default=INTERACTIVE)
+
+# Métodos que entregam mensagens em uma conversa (sujeitos ao limite por conversa)
+MESSAGE_METHOD_PREFIXES = ("send", "copy", "forward", "editMessage")
+
+def set_send_lane(lane: int):
+    """
+    Define a fila das chamadas feitas pela tarefa atual
+
+    Args:
+        lane: INTERACTIVE, REPORTS ou BULK
+    """
+    _current_lane.set(lane)
+
+@contextmanager
+def send_lane(lane: int) -> Iterator[None]:
+    """
+    Usa outra fila para as chamadas feitas dentro do bloco
+
+    Args:
+        lane: INTERACTIVE, REPORTS ou BULK
+    """
+    token = _current_lane.set(lane)
+    try:
+        yield
+    finally:
+        _current_lane.reset(token)
+
+class TokenBucket:
+    """Balde de fichas com reserva: cada chamada reserva uma ficha e recebe o tempo de espera"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, now: float) -> float:
+        """
+        Reserva uma ficha
+
+        Args:
+            now: time.monotonic() atual
+
+        Returns:
+            Segundos a esperar antes de usar a ficha
+        """
+        self._refill(now)
+        self.tokens -= 1
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, self.blocked_until - now)
+
+    def block(self, seconds: float, now: float):
+        """Suspende o balde (retry_after informado pelo Telegram)"""
+        self.blocked_until = max(self.blocked_until, now + seconds)
+
+    def is_idle(self, now: float) -> bool:
+        """Indica se o balde está cheio e livre (pode ser descartado)"""
+        self._refill(now)
+        return self.tokens >= self.capacity and self.blocked_until <= now
+
+class TelegramRateLimiter(BaseRequestMiddleware):
+    """
+    Middleware da sessão do aiogram que controla todas as chamadas do bot
+
+    Mensagens passam primeiro pelo balde da conversa (privada ou grupo) e
+    depois pelo balde global, que atende as filas por prioridade: respostas
+    interativas saem antes de relatórios e transmissões. Um TelegramRetryAfter
+    suspende o balde afetado e a chamada é repetida automaticamente.
+    """
+
+    def __init__(self):
+        self.global_bucket = TokenBucket(TELEGRAM_GLOBAL_RATE, TELEGRAM_GLOBAL_BURST)
+        self._chat_buckets: Dict[Union[int, str], TokenBucket] = {}
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._queued = {lane: 0 for lane in LANE_NAMES}
+        self.stats = {
+            "calls": 0,
+            "delayed": 0,
+            "retry_after": 0,
+            "retry_after_seconds": 0.0,
+            "failed_after_retries": 0,
+            "max_wait": 0.0
+        }
+
+    def _chat_bucket(self, chat_id: Union[int, str], now: float) -> TokenBucket:
+        """Balde da conversa; grupos e canais (ids negativos ou @nome) têm limite menor"""
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            if len(self._chat_buckets) >= TELEGRAM_MAX_CHAT_BUCKETS:
+                self._prune(now)
+            is_group = isinstance(chat_id, str) or chat_id < 0
+            bucket = (TokenBucket(TELEGRAM_GROUP_RATE, TELEGRAM_GROUP_BURST) if is_group
+                      else TokenBucket(TELEGRAM_CHAT_RATE, TELEGRAM_CHAT_BURST))
+            self._chat_buckets[chat_id] = bucket
+        return bucket
+
+    def _prune(self, now: float):
+        """Descarta os baldes de conversas sem atividade recente"""
+        for chat_id in [chat_id for chat_id, bucket in self._chat_buckets.items() if bucket.is_idle(now)]:
+            del self._chat_buckets[chat_id]
+
+    async def _dispatch(self):
+        """Libera as chamadas da fila global no ritmo do balde, por ordem de prioridade"""
+        while True:
+            while not self._waiters:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+
+            wait = self.global_bucket.reserve(time.monotonic())
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            # A prioridade é decidida só agora: quem chegou durante a espera também concorre
+            while self._waiters:
+                _, _, future = heapq.heappop(self._waiters)
+                if not future.done():
+                    future.set_result(None)
+                    break
+
+    async def _acquire_global(self, lane: int):
+        """Aguarda uma ficha do balde global na fila indicada"""
+        if not self._waiters and self.global_bucket.reserve(time.monotonic()) <= 0:
+            return
+        if not self._waiters:
+            # A reserva acima falhou: devolve a ficha e entra na fila
+            self.global_bucket.tokens += 1
+
+        if self._dispatcher is None or self._dispatcher.done():
+            self._wakeup = asyncio.Event()
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (lane, next(self._sequence), future))
+        self._queued[lane] += 1
+        self._wakeup.set()
+        try:
+            await future
+        finally:
+            self._queued[lane] -= 1
+
+    async def _acquire(self, method: TelegramMethod) -> Optional[TokenBucket]:
+        """Aguarda a vez da chamada; retorna o balde da conversa, se houver"""
+        started = time.monotonic()
+        chat_id = getattr(method, "chat_id", None)
+        bucket = None
+
+        if chat_id is not None and method.__api_method__.startswith(MESSAGE_METHOD_PREFIXES):
+            bucket = self._chat_bucket(chat_id, started)
+            wait = bucket.reserve(started)
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+        await self._acquire_global(_current_lane.get())
+
+        waited = time.monotonic() - started
+        if waited > 0.001:
+            self.stats["delayed"] += 1
+            self.stats["max_wait"] = max(self.stats["max_wait"], round(waited, 3))
+        return bucket
+
+    async def __call__(self, make_request: NextRequestMiddlewareType, bot: Bot,
+                       method: TelegramMethod) -> Response:
+        # getUpdates fica bloqueado por até 30s no long polling; não conta no limite
+        if method.__api_method__ == "getUpdates":
+            return await make_request(bot, method)
+
+        for attempt in range(TELEGRAM_MAX_RETRIES + 1):
+            bucket = await self._acquire(method)
+            self.stats["calls"] += 1
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as e:
+                self.stats["retry_after"] += 1
+                self.stats["retry_after_seconds"] += e.retry_after
+                (bucket or self.global_bucket).block(e.retry_after, time.monotonic())
+                if attempt == TELEGRAM_MAX_RETRIES:
+                    self.stats["failed_after_retries"] += 1
+                    raise
+
+    def get_metrics(self) -> Dict:
+        """
+        Métricas do limitador
+
+        Returns:
+            Dict com profundidade de cada fila, baldes ativos e contadores
+        """
+        return {
+            "queued": {LANE_NAMES[lane]: count for lane, count in self._queued.items()},
+            "chat_buckets": len(self._chat_buckets),
+            **self.stats
+        }
+
+    async def shutdown(self):
+        """Encerra a tarefa que libera a fila global"""
+        if self._dispatcher:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+
+# Instância global (compartilhada por todos os Bot com o mesmo token)
+telegram_rate_limiter = TelegramRateLimiter()
@@ -0,0 +1,167 @@
+"""
+Recebimento de atualizações do Telegram via webhook
+Alternativa ao long polling para rodar atrás de um proxy reverso
+"""
+
+import asyncio
+import hmac
+import signal
+from typing import Any, Dict, Optional
+
+from aiohttp import web
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+
+from config.settings import (
+    WEBHOOK_BASE_URL, WEBHOOK_SECRET, WEBHOOK_PATH, WEBHOOK_MAX_CONCURRENCY,
+    WEBHOOK_MAX_PENDING, WEBHOOK_MAX_CONNECTIONS, WEBHOOK_DRAIN_TIMEOUT
+)
+from utils.logger import logger
+
+class LimitedRequestHandler(SimpleRequestHandler):
+    """
+    Handler do aiogram com limite de concorrência e drenagem no desligamento
+
+    As atualizações são confirmadas ao Telegram imediatamente e processadas
+    em segundo plano; no máximo max_concurrency rodam ao mesmo tempo.
+    """
+
+    def __init__(self, dispatcher: Dispatcher, bot: Bot, secret_token: str,
+                 max_concurrency: int = WEBHOOK_MAX_CONCURRENCY,
+                 max_pending: int = WEBHOOK_MAX_PENDING, **data: Any):
+        super().__init__(
+            dispatcher=dispatcher, bot=bot, handle_in_background=True,
+            secret_token=secret_token, **data
+        )
+        self.max_pending = max_pending
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._draining = False
+        self.received = 0
+        self.rejected = 0
+
+    def verify_secret(self, telegram_secret_token: str, bot: Bot) -> bool:
+        """Compara o cabeçalho secreto em tempo constante"""
+        if not self.secret_token:
+            return True
+        return hmac.compare_digest(telegram_secret_token or "", self.secret_token)
+
+    @property
+    def pending(self) -> int:
+        """Atualizações aceitas e ainda não concluídas"""
+        return len(self._background_feed_update_tasks)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        """
+        Recebe uma atualização, recusando-a durante a drenagem ou sobrecarga
+
+        Respostas diferentes de 2xx fazem o Telegram reenviar a atualização,
+        então nada se perde ao recusar.
+        """
+        if self._draining or self.pending >= self.max_pending:
+            self.rejected += 1
+            return web.Response(status=503, headers={"Retry-After": "1"})
+
+        self.received += 1
+        return await super().handle(request)
+
+    async def _background_feed_update(self, bot: Bot, update: Dict[str, Any]) -> None:
+        async with self._semaphore:
+            await super()._background_feed_update(bot, update)
+
+    async def drain(self, timeout: float = WEBHOOK_DRAIN_TIMEOUT) -> int:
+        """
+        Para de aceitar atualizações e aguarda as que estão em andamento
+
+        Args:
+            timeout: Tempo máximo de espera em segundos
+
+        Returns:
+            Quantidade de atualizações que não terminaram a tempo
+        """
+        self._draining = True
+        tasks = set(self._background_feed_update_tasks)
+        if not tasks:
+            return 0
+
+        _, still_running = await asyncio.wait(tasks, timeout=timeout)
+        for task in still_running:
+            task.cancel()
+        return len(still_running)
+
+class TelegramWebhook:
+    """Registra o webhook no Telegram e controla o ciclo de vida do handler"""
+
+    def __init__(self, base_url: str = WEBHOOK_BASE_URL, secret: str = WEBHOOK_SECRET,
+                 path: str = WEBHOOK_PATH):
+        self.base_url = (base_url or "").rstrip("/")
+        self.secret = secret
+        self.path = path
+        self.handler: Optional[LimitedRequestHandler] = None
+        self._stop_event: Optional[asyncio.Event] = None
+
+    @property
+    def url(self) -> str:
+        """URL pública informada ao Telegram"""
+        return f"{self.base_url}{self.path}"
+
+    def setup(self, app: web.Application, bot: Bot, dispatcher: Dispatcher):
+        """
+        Registra a rota das atualizações na aplicação aiohttp
+
+        Os eventos de startup/shutdown do dispatcher passam a acompanhar
+        o ciclo de vida do servidor, como acontece no polling.
+
+        Args:
+            app: Aplicação do servidor HTTP interno
+            bot: Bot do Telegram
+            dispatcher: Dispatcher com os handlers registrados
+        """
+        self.handler = LimitedRequestHandler(dispatcher, bot, secret_token=self.secret)
+        self.handler.register(app, path=self.path)
+        setup_application(app, dispatcher, bot=bot)
+        logger.info(f"Webhook do Telegram registrado em {self.path}")
+
+    async def start(self, bot: Bot, dispatcher: Dispatcher):
+        """
+        Aponta o Telegram para a URL pública do webhook
+
+        Args:
+            bot: Bot do Telegram
+            dispatcher: Dispatcher (define os tipos de atualização usados)
+        """
+        await bot.set_webhook(
+            url=self.url,
+            secret_token=self.secret,
+            allowed_updates=dispatcher.resolve_used_update_types(),
+            max_connections=WEBHOOK_MAX_CONNECTIONS
+        )
+        logger.info(f"Webhook do Telegram configurado: {self.url}")
+
+    async def wait_for_stop(self):
+        """Bloqueia até receber SIGINT/SIGTERM"""
+        self._stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self._stop_event.set)
+            except (NotImplementedError, RuntimeError):
+                pass  # Windows: Ctrl+C interrompe via KeyboardInterrupt
+
+        await self._stop_event.wait()
+        logger.info("🛑 Sinal de parada recebido")
+
+    async def shutdown(self):
+        """Drena as atualizações em andamento antes de fechar o servidor"""
+        if not self.handler:
+            return
+
+        unfinished = await self.handler.drain()
+        if unfinished:
+            logger.warning(f"{unfinished} atualizações canceladas ao desligar o webhook")
+        logger.info(
+            f"Webhook do Telegram drenado ({self.handler.received} recebidas, "
+            f"{self.handler.rejected} recusadas)"
+        )
+
+# Instância global do webhook do Telegram
+telegram_webhook = TelegramWebhook()
@@ -0,0 +1,149 @@
+"""
+Templates de mensagens pré-compilados para o Imperium™ Bot
+O texto fixo é dividido em partes uma única vez; a cada envio só os dados do usuário são encaixados
+"""
+
+from datetime import datetime
+from string import Formatter
+from typing import Dict, List, Optional, Tuple
+
+from config.runtime_config import runtime_config
+from config.settings import WELCOME_MESSAGE
+from utils.helpers import format_date_br, get_greeting, get_user_display_name
+
+class MessageTemplate:
+    """
+    Template no formato de str.format, compilado em (texto fixo, campo)
+
+    Aceita apenas campos simples ({name}); formatações como {valor:.2f}
+    devem ser aplicadas antes de chamar render().
+    """
+
+    def __init__(self, template: str):
+        """
+        Args:
+            template: Texto com campos entre chaves
+
+        Raises:
+            ValueError: se houver campo com formatação, conversão ou atributo
+        """
+        self.fields = set()
+        self._parts: List[Tuple[str, Optional[str]]] = []
+
+        for literal, field, spec, conversion in Formatter().parse(template):
+            if field is not None and (spec or conversion or not field.isidentifier()):
+                raise ValueError(f"Campo não suportado no template: {{{field}}}")
+            if field is not None:
+                self.fields.add(field)
+            self._parts.append((literal, field))
+
+    def partial(self, **values: str) -> "MessageTemplate":
+        """
+        Fixa alguns campos, gerando um template só com os campos restantes
+
+        Args:
+            **values: Valores dos campos fixados
+
+        Returns:
+            Novo template
+        """
+        compiled = MessageTemplate.__new__(MessageTemplate)
+        compiled.fields = self.fields - values.keys()
+        compiled._parts = []
+
+        pending = ""
+        for literal, field in self._parts:
+            pending += literal
+            if field in values:
+                pending += str(values[field])
+            else:
+                compiled._parts.append((pending, field))
+                pending = ""
+        if pending:
+            compiled._parts.append((pending, None))
+        return compiled
+
+    def render(self, **values) -> str:
+        """
+        Monta o texto final
+
+        Args:
+            **values: Valores de todos os campos restantes
+
+        Returns:
+            Mensagem formatada
+        """
+        chunks = []
+        for literal, field in self._parts:
+            chunks.append(literal)
+            if field is not None:
+                chunks.append(str(values[field]))
+        return "".join(chunks)
+
+ACTIVE_SUBSCRIPTION_TEMPLATE = """
+
+✅ <b>SUA ASSINATURA ESTÁ ATIVA!</b>
+💎 Plano: {plan_name}
+📅 Válida até: {end_date}
+
+🤖 <b>Acesso liberado ao grupo VIP:</b>
+{vip_group_link}
+"""
+
+# Templates compilados (montados por rebuild_message_templates)
+_welcome_templates: Dict[str, MessageTemplate] = {}
+_active_subscription_template: Optional[MessageTemplate] = None
+
+def _compile_welcome(greeting: str) -> MessageTemplate:
+    """Compila a mensagem de boas-vindas para uma saudação"""
+    template = MessageTemplate("{greeting}!\n\n" + WELCOME_MESSAGE).partial(greeting=greeting)
+    _welcome_templates[greeting] = template
+    return template
+
+def rebuild_message_templates() -> int:
+    """
+    Compila novamente os templates a partir das configurações atuais
+
+    Returns:
+        Quantidade de templates compilados
+    """
+    global _active_subscription_template
+
+    # Uma variação por saudação, com a saudação já embutida no texto fixo
+    _welcome_templates.clear()
+    for greeting in ("Bom dia", "Boa tarde", "Boa noite"):
+        _compile_welcome(greeting)
+
+    _active_subscription_template = MessageTemplate(ACTIVE_SUBSCRIPTION_TEMPLATE).partial(
+        vip_group_link=runtime_config.vip_group_link
+    )
+    return len(_welcome_templates) + 1
+
+def render_welcome_message(user, subscription: Optional[dict]) -> str:
+    """
+    Formata mensagem de boas-vindas personalizada
+
+    Args:
+        user: Objeto do usuário
+        subscription: Dados da assinatura (se houver)
+
+    Returns:
+        Mensagem formatada
+    """
+    greeting = get_greeting()
+    template = _welcome_templates.get(greeting) or _compile_welcome(greeting)
+    message = template.render(name=get_user_display_name(user.__dict__))
+
+    if subscription:
+        end_date = subscription['end_date']
+        if isinstance(end_date, str):
+            end_date = datetime.fromisoformat(end_date)
+
+        message += _active_subscription_template.render(
+            plan_name=subscription['plan_name'],
+            end_date=format_date_br(end_date)
+        )
+
+    return message
+
+rebuild_message_templates()
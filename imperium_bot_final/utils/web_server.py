@@ -0,0 +1,52 @@
+"""
+Servidor HTTP interno do Imperium™ Bot
+Hospeda webhooks em uma aplicação aiohttp que roda no mesmo event loop do bot
+"""
+
+from aiohttp import web
+from typing import Optional
+
+from config.settings import WEB_SERVER_HOST, WEB_SERVER_PORT
+from utils.logger import logger
+
+class WebServer:
+    """Aplicação aiohttp compartilhada pelos receptores de webhook"""
+
+    def __init__(self, host: str = WEB_SERVER_HOST, port: int = WEB_SERVER_PORT):
+        self.host = host
+        self.port = port
+        self.app = web.Application()
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def has_routes(self) -> bool:
+        """Indica se algum receptor registrou rotas"""
+        return len(self.app.router.routes()) > 0
+
+    @property
+    def is_running(self) -> bool:
+        """Indica se o servidor está aceitando conexões"""
+        return self._runner is not None
+
+    async def start(self):
+        """Inicia o servidor sem bloquear o event loop"""
+        if self.is_running:
+            return
+
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        logger.info(f"Servidor HTTP interno escutando em {self.host}:{self.port}")
+
+    async def stop(self):
+        """Encerra o servidor e libera a porta"""
+        if not self.is_running:
+            return
+
+        await self._runner.cleanup()
+        self._runner = None
+        logger.info("Servidor HTTP interno finalizado")
+
+# Instância global do servidor HTTP
+web_server = WebServer()